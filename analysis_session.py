@@ -0,0 +1,227 @@
+"""
+Analysis Session - Incremental re-analysis of a resume as it is edited
+"""
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from keyword_matcher import KeywordCounts
+from resume_analyzer import AnalysisContext, Issue, ResumeAnalyzer, is_too_short
+from scoring import ScoreCard
+from section_index import SectionIndex, classify_line
+
+
+@dataclass
+class IssueDiff:
+    """How the issues changed after an edit"""
+    added: List[Issue] = field(default_factory=list)
+    removed: List[Issue] = field(default_factory=list)
+    scorecard: Optional[ScoreCard] = None
+
+    def to_dict(self) -> Dict:
+        """JSON-serializable form"""
+        return {
+            'added': [issue.to_dict() for issue in self.added],
+            'removed': [issue.to_dict() for issue in self.removed],
+            'score': self.scorecard.score,
+            'summary': self.scorecard.summary(),
+        }
+
+
+class _LineFacts:
+    """Per-line inputs to the context, kept so an edit only rescans the lines it touches"""
+    __slots__ = ('info', 'terms')
+
+    def __init__(self, line: str, keyword_matcher):
+        line_lower = line.lower()
+        self.info = classify_line(line)
+        self.terms = keyword_matcher.find_terms(line_lower)
+
+
+class _SessionContext(AnalysisContext):
+    """AnalysisContext assembled from a session's per-line facts instead of a full scan"""
+
+    def __init__(self, session: 'AnalysisSession'):
+        self.text = session.text
+        self.faculty = session.faculty
+        self.job = None
+        self.job_match = None
+        self.text_lower = session.text.lower()
+        self.lines = session.lines
+        self.index = SectionIndex.from_line_infos(session.lines, [line_facts.info for line_facts in session.facts])
+        self.word_count = self.index.word_count
+        self.long_line_count = self.index.long_line_count
+        self.keywords = session.keywords
+        self._facts = session.facts
+        self._groups = session.analyzer.keyword_matcher.groups
+
+    def found_in_sections(self, kinds: Sequence[str], group: str) -> int:
+        members = self._groups.get(group, set())
+        found = set()
+        for section in self.index.sections_of(kinds):
+            for line_facts in self._facts[max(section.header_line, 0):section.end_line]:
+                found.update(term for term in line_facts.terms if term in members)
+        return len(found)
+
+
+def _issue_key(issue: Issue) -> Tuple:
+    return (issue.rule_id, tuple(sorted(issue.params.items())) if issue.params else ())
+
+
+class AnalysisSession:
+    """
+    Keeps a resume's analysis up to date as edits arrive.
+
+    Line lengths, word counts, heading and bullet classification and keyword
+    hits are stored per line; an edit rescans only the lines it touches, and
+    the section index is rebuilt from the stored facts. Patterns that can
+    span lines (emails, phone numbers, blank-line runs) are re-checked by
+    searching the whole text.
+    The issues always equal those of ResumeAnalyzer.analyze on the full text.
+
+    Offsets and lengths count characters (code points) of the current text.
+    """
+
+    def __init__(self, analyzer: ResumeAnalyzer, text: str, faculty: Optional[str] = None):
+        self.analyzer = analyzer
+        self.faculty = faculty
+        self.text = text
+        self.lines = text.split('\n')
+        self.facts = [_LineFacts(line, analyzer.keyword_matcher) for line in self.lines]
+        self.keywords = KeywordCounts(analyzer.keyword_matcher.groups)
+        self._count(self.facts, 1)
+        self.scorecard = self._evaluate()
+        self._lock = threading.Lock()
+
+    @property
+    def issues(self) -> List[Issue]:
+        return self.scorecard.issues
+
+    def _count(self, facts: Iterable[_LineFacts], sign: int):
+        """Add (sign=1) or remove (sign=-1) lines from the running totals"""
+        for line_facts in facts:
+            if sign > 0:
+                self.keywords.add(line_facts.terms)
+            else:
+                self.keywords.remove(line_facts.terms)
+
+    def _evaluate(self) -> ScoreCard:
+        if is_too_short(self.text):
+            return self.analyzer.evaluate(self.text, self.faculty)
+        return self.analyzer.evaluate_context(_SessionContext(self))
+
+    def apply_edit(self, offset: int, deleted: int, inserted: str) -> IssueDiff:
+        """
+        Replace deleted characters at offset with inserted text and re-analyze.
+
+        Returns:
+            IssueDiff of issues that appeared or disappeared, with the new ScoreCard
+        """
+        return self.apply_edits([(offset, deleted, inserted)])
+
+    def apply_edits(self, edits: Iterable[Tuple[int, int, str]]) -> IssueDiff:
+        """Apply edits in order (each against the text left by the previous one), then re-analyze once"""
+        with self._lock:
+            previous = self.scorecard.issues
+            try:
+                for offset, deleted, inserted in edits:
+                    self._splice(offset, deleted, inserted)
+            finally:
+                # Keep the issues in step with whatever edits were applied before a bad one
+                self.scorecard = self._evaluate()
+            return self._diff(previous, self.scorecard)
+
+    def _splice(self, offset: int, deleted: int, inserted: str):
+        text = self.text
+        if offset < 0 or deleted < 0 or offset + deleted > len(text):
+            raise ValueError(f'Edit ({offset}, {deleted}) is outside the text (length {len(text)})')
+
+        # Lines first..last (inclusive) contain the replaced range
+        first = text.count('\n', 0, offset)
+        last = first + text.count('\n', offset, offset + deleted)
+        line_start = text.rfind('\n', 0, offset) + 1
+        line_end = text.find('\n', offset + deleted)
+        if line_end == -1:
+            line_end = len(text)
+
+        self.text = text[:offset] + inserted + text[offset + deleted:]
+        new_lines = (text[line_start:offset] + inserted + text[offset + deleted:line_end]).split('\n')
+        new_facts = [_LineFacts(line, self.analyzer.keyword_matcher) for line in new_lines]
+
+        self._count(self.facts[first:last + 1], -1)
+        self._count(new_facts, 1)
+        self.lines[first:last + 1] = new_lines
+        self.facts[first:last + 1] = new_facts
+
+    @staticmethod
+    def _diff(previous: List[Issue], scorecard: ScoreCard) -> IssueDiff:
+        remaining: Dict[Tuple, int] = {}
+        for issue in previous:
+            key = _issue_key(issue)
+            remaining[key] = remaining.get(key, 0) + 1
+        added = []
+        for issue in scorecard.issues:
+            key = _issue_key(issue)
+            if remaining.get(key):
+                remaining[key] -= 1
+            else:
+                added.append(issue)
+        removed = []
+        for issue in previous:
+            key = _issue_key(issue)
+            if remaining.get(key):
+                remaining[key] -= 1
+                removed.append(issue)
+        return IssueDiff(added=added, removed=removed, scorecard=scorecard)
+
+
+class SessionStore:
+    """
+    Open editing sessions by id, for the web API.
+
+    Holds at most max_sessions (least recently used are dropped first) and
+    forgets sessions idle for longer than ttl seconds.
+    """
+
+    def __init__(self, max_sessions: int = 256, ttl: float = 1800):
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self._sessions: 'OrderedDict[str, Tuple[float, AnalysisSession]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def open(self, session: AnalysisSession) -> str:
+        """Store a session and return its id"""
+        session_id = uuid.uuid4().hex
+        with self._lock:
+            self._purge()
+            self._sessions[session_id] = (time.time(), session)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        return session_id
+
+    def get(self, session_id: str) -> Optional[AnalysisSession]:
+        """Look up a session and mark it as used"""
+        with self._lock:
+            self._purge()
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return None
+            self._sessions[session_id] = (time.time(), entry[1])
+            self._sessions.move_to_end(session_id)
+            return entry[1]
+
+    def close(self, session_id: str) -> bool:
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    def _purge(self):
+        """Drop idle sessions (caller holds the lock)"""
+        cutoff = time.time() - self.ttl
+        while self._sessions:
+            session_id, (last_used, _) = next(iter(self._sessions.items()))
+            if last_used >= cutoff:
+                break
+            del self._sessions[session_id]
@@ -0,0 +1,263 @@
+"""
+Analysis Store - Sqlite history of analyses, for cohort statistics
+"""
+import atexit
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from scoring import ScoreCard
+
+
+def parse_time(value: Optional[str]) -> Optional[float]:
+    """Epoch seconds from an ISO date/time ('2026-09-01', '2026-09-01T12:00') or a number; None passes through"""
+    if value is None or value == '':
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        raise ValueError(f'Invalid time: {value!r} (use an ISO date such as 2026-09-01 or epoch seconds)')
+
+
+class AnalysisStore:
+    """
+    Every analysis recorded in a sqlite file: content hash, faculty, score,
+    severity counts and the rule id of each issue, with aggregate queries.
+
+    record() only queues the row; a background thread writes queued rows in
+    one transaction every flush_interval seconds (sooner once batch_size are
+    waiting), so recording adds no sqlite work to the request path. At most
+    max_pending rows wait; beyond that new rows are dropped and counted.
+    """
+
+    def __init__(self, path: str, batch_size: int = 200, flush_interval: float = 1.0,
+                 max_pending: int = 10000):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.recorded = 0
+        self.dropped = 0
+        self._open()
+        self._db.executescript(
+            'CREATE TABLE IF NOT EXISTS analyses ('
+            ' id INTEGER PRIMARY KEY, content_hash TEXT NOT NULL, faculty TEXT, score INTEGER NOT NULL,'
+            ' critical INTEGER NOT NULL, warnings INTEGER NOT NULL, suggestions INTEGER NOT NULL,'
+            ' word_count INTEGER, source TEXT, ruleset_version TEXT, created_at REAL NOT NULL);'
+            'CREATE TABLE IF NOT EXISTS analysis_issues ('
+            ' analysis_id INTEGER NOT NULL REFERENCES analyses (id), rule_id TEXT NOT NULL,'
+            ' severity TEXT NOT NULL, category TEXT NOT NULL);'
+            'CREATE INDEX IF NOT EXISTS analyses_faculty ON analyses (faculty, created_at);'
+            'CREATE INDEX IF NOT EXISTS analyses_score ON analyses (score);'
+            'CREATE INDEX IF NOT EXISTS analyses_created_at ON analyses (created_at);'
+            'CREATE INDEX IF NOT EXISTS analyses_content_hash ON analyses (content_hash);'
+            'CREATE INDEX IF NOT EXISTS analysis_issues_rule ON analysis_issues (rule_id, analysis_id);'
+            'CREATE INDEX IF NOT EXISTS analysis_issues_analysis ON analysis_issues (analysis_id);'
+        )
+        self._db.commit()
+
+    def _open(self):
+        self._db = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._lock = threading.Lock()       # guards the pending rows
+        self._db_lock = threading.Lock()    # guards the connection
+        self._pending: List[Tuple] = []
+        self._wake = threading.Event()
+        self._writer: Optional[threading.Thread] = None
+
+    def reopen(self):
+        """
+        Give this process its own sqlite connection and writer thread (call in a forked child).
+
+        Rows the parent had not written yet are the parent's to write, so they are dropped here.
+        """
+        self._open()
+
+    def record(self, content_hash: str, scorecard: ScoreCard, word_count: Optional[int] = None,
+               source: Optional[str] = None, ruleset_version: Optional[str] = None):
+        """Queue one analysis for writing (returns at once)"""
+        issues = tuple((issue.rule_id, issue.severity, issue.category) for issue in scorecard.issues)
+        row = (content_hash, scorecard.faculty or None, scorecard.score, scorecard.critical,
+               scorecard.warnings, scorecard.suggestions, word_count, source, ruleset_version,
+               time.time(), issues)
+        with self._lock:
+            if len(self._pending) >= self.max_pending:
+                self.dropped += 1
+                return
+            self._pending.append(row)
+            full = len(self._pending) >= self.batch_size
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_loop, name='analysis-store', daemon=True)
+                self._writer.start()
+                atexit.register(self.flush)
+        if full:
+            self._wake.set()
+
+    def _write_loop(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except sqlite3.Error:
+                # Keep recording; the rows of a failed batch are lost rather than retried forever
+                pass
+
+    def flush(self) -> int:
+        """Write every queued analysis now; returns how many were written"""
+        with self._lock:
+            rows, self._pending = self._pending, []
+        if not rows:
+            return 0
+        with self._db_lock:
+            with self._db:
+                cursor = self._db.cursor()
+                for row in rows:
+                    cursor.execute(
+                        'INSERT INTO analyses (content_hash, faculty, score, critical, warnings, suggestions,'
+                        ' word_count, source, ruleset_version, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                        row[:-1]
+                    )
+                    analysis_id = cursor.lastrowid
+                    cursor.executemany(
+                        'INSERT INTO analysis_issues (analysis_id, rule_id, severity, category) VALUES (?, ?, ?, ?)',
+                        [(analysis_id,) + issue for issue in row[-1]]
+                    )
+        self.recorded += len(rows)
+        return len(rows)
+
+    def _query(self, sql: str, params: Sequence) -> List[Dict]:
+        with self._db_lock:
+            cursor = self._db.execute(sql, params)
+            columns = [description[0] for description in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    @staticmethod
+    def _where(faculty: Optional[str], since: Optional[float], until: Optional[float]) -> Tuple[str, List]:
+        clauses, params = [], []
+        if faculty:
+            clauses.append('a.faculty = ?')
+            params.append(faculty)
+        if since is not None:
+            clauses.append('a.created_at >= ?')
+            params.append(since)
+        if until is not None:
+            clauses.append('a.created_at < ?')
+            params.append(until)
+        return (' WHERE ' + ' AND '.join(clauses)) if clauses else '', params
+
+    def summary(self, faculty: Optional[str] = None, since: Optional[float] = None,
+                until: Optional[float] = None) -> Dict:
+        """Number of analyses and distinct resumes, and the score and issue averages"""
+        where, params = self._where(faculty, since, until)
+        return self._query(
+            'SELECT COUNT(*) AS analyses, COUNT(DISTINCT a.content_hash) AS resumes,'
+            ' ROUND(AVG(a.score), 1) AS average_score, MIN(a.score) AS min_score, MAX(a.score) AS max_score,'
+            ' ROUND(AVG(a.critical), 2) AS average_critical, ROUND(AVG(a.warnings), 2) AS average_warnings,'
+            ' ROUND(AVG(a.suggestions), 2) AS average_suggestions'
+            f' FROM analyses a{where}', params
+        )[0]
+
+    def by_faculty(self, since: Optional[float] = None, until: Optional[float] = None) -> List[Dict]:
+        """Analyses and average score per faculty (None for analyses without one)"""
+        where, params = self._where(None, since, until)
+        return self._query(
+            'SELECT a.faculty AS faculty, COUNT(*) AS analyses, ROUND(AVG(a.score), 1) AS average_score'
+            f' FROM analyses a{where} GROUP BY a.faculty ORDER BY analyses DESC', params
+        )
+
+    def top_rules(self, faculty: Optional[str] = None, severity: Optional[str] = None,
+                  since: Optional[float] = None, until: Optional[float] = None, limit: int = 10) -> List[Dict]:
+        """Most frequent issues: how often each rule fired and in how many distinct resumes"""
+        where, params = self._where(faculty, since, until)
+        if severity:
+            where += (' AND ' if where else ' WHERE ') + 'i.severity = ?'
+            params.append(severity)
+        return self._query(
+            'SELECT i.rule_id AS rule, i.severity AS severity, i.category AS category, COUNT(*) AS issues,'
+            ' COUNT(DISTINCT a.content_hash) AS resumes'
+            f' FROM analysis_issues i JOIN analyses a ON a.id = i.analysis_id{where}'
+            ' GROUP BY i.rule_id ORDER BY issues DESC, rule LIMIT ?', params + [limit]
+        )
+
+    def score_histogram(self, faculty: Optional[str] = None, since: Optional[float] = None,
+                        until: Optional[float] = None, bucket: int = 10) -> List[Dict]:
+        """Analyses per score band of width bucket (the band's lowest score as 'score')"""
+        where, params = self._where(faculty, since, until)
+        return self._query(
+            f'SELECT (a.score / ?) * ? AS score, COUNT(*) AS analyses FROM analyses a{where}'
+            ' GROUP BY 1 ORDER BY 1', [bucket, bucket] + params
+        )
+
+    def stats(self) -> Dict:
+        with self._lock:
+            pending = len(self._pending)
+        return {'recorded': self.recorded, 'pending': pending, 'dropped': self.dropped, 'path': self.path}
+
+
+def cli():
+    """Command-line entry point: python analysis_store.py {summary,rules,scores,faculties} --db FILE ..."""
+    import json
+    import click
+
+    def filters(command):
+        command = click.option('--since', help='Only analyses from this date/time on (ISO or epoch seconds)')(command)
+        command = click.option('--until', help='Only analyses before this date/time')(command)
+        return click.option('--db', 'db_path', required=True, type=click.Path(exists=True, dir_okay=False),
+                            help='Sqlite analysis store')(command)
+
+    def open_store(db_path, since, until):
+        try:
+            return AnalysisStore(db_path), parse_time(since), parse_time(until)
+        except ValueError as e:
+            raise click.BadParameter(str(e))
+
+    @click.group()
+    def commands():
+        """Query the analyses recorded by the web app and main.py --store."""
+
+    @commands.command()
+    @filters
+    @click.option('--faculty', '-f', help='Only this faculty')
+    def summary(db_path, since, until, faculty):
+        """Analysis count, distinct resumes and score/issue averages."""
+        store, since, until = open_store(db_path, since, until)
+        click.echo(json.dumps(store.summary(faculty, since, until), indent=2))
+
+    @commands.command()
+    @filters
+    @click.option('--faculty', '-f', help='Only this faculty')
+    @click.option('--severity', type=click.Choice(('critical', 'warning', 'suggestion')), help='Only this severity')
+    @click.option('--limit', type=int, default=10, show_default=True)
+    def rules(db_path, since, until, faculty, severity, limit):
+        """Most frequent issues, e.g. the most common critical issue among engineering resumes."""
+        store, since, until = open_store(db_path, since, until)
+        click.echo(json.dumps(store.top_rules(faculty, severity, since, until, limit), indent=2))
+
+    @commands.command()
+    @filters
+    @click.option('--faculty', '-f', help='Only this faculty')
+    @click.option('--bucket', type=click.IntRange(1, 100), default=10, show_default=True, help='Score band width')
+    def scores(db_path, since, until, faculty, bucket):
+        """Score distribution."""
+        store, since, until = open_store(db_path, since, until)
+        click.echo(json.dumps(store.score_histogram(faculty, since, until, bucket), indent=2))
+
+    @commands.command()
+    @filters
+    def faculties(db_path, since, until):
+        """Analyses and average score per faculty."""
+        store, since, until = open_store(db_path, since, until)
+        click.echo(json.dumps(store.by_faculty(since, until), indent=2))
+
+    commands()
+
+
+if __name__ == '__main__':
+    cli()
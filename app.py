@@ -1,17 +1,160 @@
 """
 Resume Checker Web Application - Flask backend
 """
+import io
+import json
 import os
-import tempfile
-from flask import Flask, render_template, request, jsonify, send_file, send_from_directory
-from werkzeug.utils import secure_filename
-from resume_parser import ResumeParser
-from resume_analyzer import ResumeAnalyzer
+import zipfile
+from flask import Flask, Request, Response, render_template, request, jsonify, send_file, send_from_directory, url_for
+from resume_parser import PARALLEL_PAGE_THRESHOLD, ResumeParser
+from resume_analyzer import VALID_FACULTIES, Issue, ResumeAnalyzer
+from analysis_session import AnalysisSession, SessionStore
+from analysis_store import AnalysisStore, parse_time
+from batch_analyzer import BatchResult, UploadPool
+from job_matcher import PostingStore
+from near_duplicates import NearDuplicateIndex, minhash_signature
 from feedback_generator import FeedbackGenerator
+from result_cache import ResultCache
+from scoring import ScoreCard
+from parse_cache import ParseCache
+from jobs import JobManager, JobQueueFull
+from metrics import NULL_TIMER, RULE_METRIC, STAGE_METRIC, MetricsRegistry, StageTimer
 
 app = Flask(__name__)
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
-app.config['UPLOAD_FOLDER'] = tempfile.gettempdir()
+# Extraction budgets: bytes say little about PDF decoding cost, so bound pages and text too
+app.config['PDF_MAX_PAGES'] = int(os.environ.get('PDF_MAX_PAGES', 40))
+app.config['MAX_TEXT_CHARS'] = int(os.environ.get('MAX_TEXT_CHARS', 200000))
+# PDF text extractor: 'auto' (fastest installed) or a name from pdf_backends.PDF_BACKENDS
+app.config['PDF_BACKEND'] = os.environ.get('PDF_BACKEND', 'auto')
+# PDFs longer than PDF_PARALLEL_PAGES pages are extracted on PDF_WORKERS processes (1 = never).
+# Every web worker has its own pool, so by default the CPUs are divided between WEB_CONCURRENCY workers.
+app.config['PDF_PARALLEL_PAGES'] = int(os.environ.get('PDF_PARALLEL_PAGES', PARALLEL_PAGE_THRESHOLD))
+app.config['PDF_WORKERS'] = int(os.environ.get('PDF_WORKERS') or
+                                max(1, (os.cpu_count() or 1) // int(os.environ.get('WEB_CONCURRENCY', 1))))
+
+# Cache of /analyze responses keyed on (file content hash, faculty, ruleset version).
+# Set RESULT_CACHE_PATH to a sqlite file to add a persistent tier shared by workers.
+app.config['RESULT_CACHE_SIZE'] = int(os.environ.get('RESULT_CACHE_SIZE', 512))
+app.config['RESULT_CACHE_TTL'] = float(os.environ.get('RESULT_CACHE_TTL', 3600))
+app.config['RESULT_CACHE_PATH'] = os.environ.get('RESULT_CACHE_PATH')
+result_cache = ResultCache(
+    max_entries=app.config['RESULT_CACHE_SIZE'],
+    ttl=app.config['RESULT_CACHE_TTL'],
+    path=app.config['RESULT_CACHE_PATH']
+)
+
+# Near-duplicate short-circuit for /analyze: an upload whose text is at least
+# NEAR_DUPLICATE_THRESHOLD similar (MinHash estimate of shared 3-word shingles) to an
+# already analyzed resume gets that resume's cached response. Unset = off.
+# NEAR_DUPLICATE_PATH keeps the signatures in a sqlite file shared by workers. At most
+# NEAR_DUPLICATE_SIZE signatures are kept, and like the responses they point to they
+# expire after NEAR_DUPLICATE_TTL seconds (default RESULT_CACHE_TTL).
+app.config['NEAR_DUPLICATE_THRESHOLD'] = float(os.environ.get('NEAR_DUPLICATE_THRESHOLD') or 0) or None
+app.config['NEAR_DUPLICATE_PATH'] = os.environ.get('NEAR_DUPLICATE_PATH')
+app.config['NEAR_DUPLICATE_SIZE'] = int(os.environ.get('NEAR_DUPLICATE_SIZE', 10000))
+app.config['NEAR_DUPLICATE_TTL'] = float(os.environ.get('NEAR_DUPLICATE_TTL', app.config['RESULT_CACHE_TTL']))
+near_duplicate_index = None
+if app.config['NEAR_DUPLICATE_THRESHOLD']:
+    near_duplicate_index = NearDuplicateIndex(
+        threshold=app.config['NEAR_DUPLICATE_THRESHOLD'],
+        path=app.config['NEAR_DUPLICATE_PATH'],
+        max_entries=app.config['NEAR_DUPLICATE_SIZE'],
+        ttl=app.config['NEAR_DUPLICATE_TTL']
+    )
+
+# Optional sqlite store of extracted text, shared with the CLI (see parse_cache.py)
+app.config['PARSE_CACHE_PATH'] = os.environ.get('PARSE_CACHE_PATH')
+parse_cache = ParseCache(app.config['PARSE_CACHE_PATH']) if app.config['PARSE_CACHE_PATH'] else None
+
+# History of every analysis (score, severity counts, rule ids) for the /stats queries.
+# Set ANALYSIS_STORE_PATH to a sqlite file to turn it on; rows are written in the background.
+app.config['ANALYSIS_STORE_PATH'] = os.environ.get('ANALYSIS_STORE_PATH')
+analysis_store = AnalysisStore(app.config['ANALYSIS_STORE_PATH']) if app.config['ANALYSIS_STORE_PATH'] else None
+
+# Background pool for POST /analyze?async=1 (429 once ANALYZE_JOB_QUEUE jobs are pending).
+# Set ANALYZE_JOB_STORE_PATH to a sqlite file so any worker can answer for any job.
+app.config['ANALYZE_JOB_WORKERS'] = int(os.environ.get('ANALYZE_JOB_WORKERS', 2))
+app.config['ANALYZE_JOB_QUEUE'] = int(os.environ.get('ANALYZE_JOB_QUEUE', 32))
+app.config['ANALYZE_JOB_TIMEOUT'] = float(os.environ.get('ANALYZE_JOB_TIMEOUT', 30))
+app.config['ANALYZE_JOB_STORE_PATH'] = os.environ.get('ANALYZE_JOB_STORE_PATH')
+job_manager = JobManager(
+    workers=app.config['ANALYZE_JOB_WORKERS'],
+    max_pending=app.config['ANALYZE_JOB_QUEUE'],
+    timeout=app.config['ANALYZE_JOB_TIMEOUT'],
+    path=app.config['ANALYZE_JOB_STORE_PATH']
+)
+
+# POST /analyze/batch: up to BATCH_MAX_FILES resumes (zips are expanded) in one request of up to
+# BATCH_MAX_CONTENT_LENGTH bytes, analyzed on BATCH_WORKERS processes started on first use
+app.config['BATCH_WORKERS'] = int(os.environ.get('BATCH_WORKERS', os.cpu_count() or 1))
+app.config['BATCH_MAX_FILES'] = int(os.environ.get('BATCH_MAX_FILES', 1000))
+app.config['BATCH_MAX_CONTENT_LENGTH'] = int(os.environ.get('BATCH_MAX_CONTENT_LENGTH', 256 * 1024 * 1024))
+
+
+class BatchAwareRequest(Request):
+    """Request whose size limits are raised for the bulk upload endpoint"""
+    
+    @property
+    def max_content_length(self):
+        if self.endpoint == 'analyze_batch':
+            return app.config['BATCH_MAX_CONTENT_LENGTH']
+        return super().max_content_length
+    
+    @property
+    def max_form_parts(self):
+        if self.endpoint == 'analyze_batch':
+            return app.config['BATCH_MAX_FILES'] + 16
+        return super().max_form_parts
+
+
+app.request_class = BatchAwareRequest
+
+# Editor sessions for /sessions: incremental re-analysis as a resume is edited.
+# Sessions live in the worker that opened them; idle ones expire after EDIT_SESSION_TTL seconds.
+app.config['EDIT_SESSIONS_MAX'] = int(os.environ.get('EDIT_SESSIONS_MAX', 256))
+app.config['EDIT_SESSION_TTL'] = float(os.environ.get('EDIT_SESSION_TTL', 1800))
+session_store = SessionStore(
+    max_sessions=app.config['EDIT_SESSIONS_MAX'],
+    ttl=app.config['EDIT_SESSION_TTL']
+)
+
+# Job postings for /postings; /analyze and /analyze/batch match resumes against one by posting_id.
+# Set POSTING_STORE_PATH to a sqlite file so every worker sees every posting.
+app.config['POSTING_STORE_PATH'] = os.environ.get('POSTING_STORE_PATH')
+posting_store = PostingStore(app.config['POSTING_STORE_PATH'])
+
+# Per-stage and per-rule latency histograms served at /metrics (METRICS_ENABLED=0 turns them off)
+app.config['METRICS_ENABLED'] = os.environ.get('METRICS_ENABLED', '1') not in ('0', 'false')
+metrics_registry = MetricsRegistry()
+metrics_registry.describe(STAGE_METRIC, 'Time spent in each /analyze stage')
+metrics_registry.describe(RULE_METRIC, 'Time spent in each ResumeAnalyzer rule')
+
+# Parser, analyzer and report generator keep no per-request state, so one of each
+# serves every request and thread; under gunicorn --preload they are built once in
+# the master and shared copy-on-write by the workers (see gunicorn.conf.py)
+parser = ResumeParser(
+    cache=parse_cache,
+    max_pages=app.config['PDF_MAX_PAGES'],
+    max_chars=app.config['MAX_TEXT_CHARS'],
+    pdf_backend=app.config['PDF_BACKEND'],
+    parallel_pages=app.config['PDF_PARALLEL_PAGES'],
+    pdf_workers=app.config['PDF_WORKERS']
+)
+analyzer = ResumeAnalyzer()
+generator = FeedbackGenerator()
+upload_pool = UploadPool(
+    workers=app.config['BATCH_WORKERS'],
+    parse_cache_path=app.config['PARSE_CACHE_PATH'],
+    parser_options={
+        'max_pages': app.config['PDF_MAX_PAGES'],
+        'max_chars': app.config['MAX_TEXT_CHARS'],
+        'pdf_backend': app.config['PDF_BACKEND'],
+    },
+    posting_store_path=app.config['POSTING_STORE_PATH']
+)
+
+SAMPLE_RESUME_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sample_resume.txt')
 
 # Path to the new React UI build (beach theme). If present, it's served at /.
 FRONTEND_DIST = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'frontend', 'dist')
@@ -22,7 +165,7 @@ FRONTEND_DIST = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fronte
 def add_cors_headers(response):
     origin = request.environ.get('HTTP_ORIGIN', '*')
     response.headers['Access-Control-Allow-Origin'] = origin
-    response.headers['Access-Control-Allow-Methods'] = 'GET, POST, OPTIONS'
+    response.headers['Access-Control-Allow-Methods'] = 'GET, POST, DELETE, OPTIONS'
     response.headers['Access-Control-Allow-Headers'] = 'Content-Type'
     return response
 
@@ -34,6 +177,11 @@ def analyze_options():
 # Allowed file extensions
 ALLOWED_EXTENSIONS = {'pdf', 'docx', 'doc', 'txt'}
 
+# Sections of the /analyze response a client can pick with ?fields=...
+RESPONSE_FIELDS = ('statistics', 'summary', 'issues', 'issues_by_category', 'report')
+# ?compact=1 without ?fields: no text report, issues sent once as columns
+COMPACT_FIELDS = ('statistics', 'summary', 'issues')
+
 
 def allowed_file(filename):
     """Check if file extension is allowed"""
@@ -67,6 +215,246 @@ def frontend_static(filename):
     return '', 404
 
 
+def make_timer():
+    """Stage timer for this request; a no-op unless metrics or ?timings=1 are on"""
+    keep = request.args.get('timings') in ('1', 'true')
+    registry = metrics_registry if app.config['METRICS_ENABLED'] else None
+    if not keep and registry is None:
+        return NULL_TIMER
+    return StageTimer(registry, keep=keep)
+
+
+def parse_response_profile(args):
+    """
+    Fields and layout requested via ?fields=a,b and/or ?compact=1.
+    
+    Returns:
+        Tuple of (fields, compact); raises ValueError for unknown field names
+    """
+    compact = args.get('compact') in ('1', 'true')
+    requested = args.get('fields')
+    if not requested:
+        return (COMPACT_FIELDS if compact else RESPONSE_FIELDS), compact
+    names = {name.strip() for name in requested.split(',') if name.strip()}
+    unknown = names - set(RESPONSE_FIELDS)
+    if unknown:
+        raise ValueError(f'Unknown fields: {", ".join(sorted(unknown))}. Allowed fields: {", ".join(RESPONSE_FIELDS)}')
+    return tuple(name for name in RESPONSE_FIELDS if name in names), compact
+
+
+def analyze_upload(content, filename, faculty, timer=NULL_TIMER, fields=RESPONSE_FIELDS, compact=False,
+                   posting=None):
+    """
+    Parse and analyze uploaded resume bytes.
+    
+    Args:
+        fields: Response sections to include (see RESPONSE_FIELDS)
+        compact: Send issues as columns instead of one object per issue
+        posting: Optional JobIndex the resume is matched against
+    Returns:
+        Tuple of (response data, HTTP status code)
+    """
+    response_data, status_code = _analyze_upload(content, filename, faculty, timer, fields, compact, posting)
+    if timer.stages is not None:
+        response_data = dict(response_data, timings=timer.to_dict())
+    return response_data, status_code
+
+
+def _analyze_upload(content, filename, faculty, timer, fields, compact, posting):
+    # Identical uploads analyzed by identical rules are served from the cache;
+    # each response profile (and posting) is cached separately
+    with timer.stage('cache_lookup'):
+        profile = ','.join(fields) + (':compact' if compact else '')
+        if posting is not None:
+            profile += f':{posting.posting_id}'
+        digest = ResultCache.digest(content)
+        cache_key = result_cache.key_for_digest(digest, faculty, analyzer.ruleset_version, namespace=f'analyze:{profile}')
+        cached = result_cache.get(cache_key)
+    if cached is not None:
+        response_data, record = _split_cached(cached)
+        _record_served(digest, record, faculty)
+        return response_data, 200
+    
+    # Parse resume straight from the uploaded bytes; nothing is written to disk
+    try:
+        with timer.stage('parse'):
+            resume_text = parser.parse_bytes(content, os.path.splitext(filename)[1])
+    except ValueError as e:
+        # Unsupported content, such as a legacy binary .doc
+        return {'error': str(e)}, 400
+    
+    if not resume_text or len(resume_text.strip()) < 50:
+        return {
+            'error': 'Could not extract meaningful content from resume file. Please ensure the file is readable.'
+        }, 400
+    
+    # A near-copy of a resume analyzed before (same faculty and profile) gets its cached response
+    signature = None
+    if near_duplicate_index is not None:
+        with timer.stage('near_duplicate'):
+            signature = minhash_signature(resume_text)
+            for doc_id, similarity in near_duplicate_index.find(signature, exclude=digest):
+                key = result_cache.key_for_digest(doc_id, faculty, analyzer.ruleset_version,
+                                                  namespace=f'analyze:{profile}')
+                cached = result_cache.get(key)
+                if cached is not None:
+                    response_data, record = _split_cached(cached)
+                    response_data['near_duplicate'] = {'of': doc_id, 'similarity': round(similarity, 3)}
+                    # The issues and score are the neighbour's, the size is this upload's
+                    word_count = len(resume_text.split())
+                    if 'statistics' in response_data:
+                        response_data['statistics'] = dict(response_data['statistics'], word_count=word_count,
+                                                           char_count=len(resume_text))
+                    if record is not None:
+                        record = dict(record, word_count=word_count)
+                    result_cache.set(cache_key, dict(response_data, _record=record))
+                    _record_served(digest, record, faculty)
+                    return response_data, 200
+    
+    # Analyze resume (with optional faculty for degree-based rating)
+    with timer.stage('analyze'):
+        scorecard = analyzer.evaluate(resume_text, faculty=faculty, rule_timings=timer.rule_timings, job=posting)
+    timer.record_rules()
+    if analysis_store is not None:
+        analysis_store.record(digest, scorecard, len(resume_text.split()), source='analyze',
+                              ruleset_version=analyzer.ruleset_version)
+    
+    # Generate feedback (the ANSI text report is only built when asked for)
+    report = None
+    if 'report' in fields:
+        with timer.stage('report'):
+            report = generator.generate_report(scorecard.issues, resume_text, scorecard)
+    
+    with timer.stage('build_response'):
+        response_data = _build_response(resume_text, scorecard, report, fields, compact)
+        if scorecard.job_match is not None and 'statistics' in response_data:
+            response_data['statistics']['job_match'] = scorecard.job_match.to_dict()
+    # Cached with what the history needs to record the analysis again when it is served from the cache
+    record = {'rules': [issue.rule_id for issue in scorecard.issues],
+              'faculty_adjustment': scorecard.faculty_adjustment, 'word_count': len(resume_text.split())}
+    result_cache.set(cache_key, dict(response_data, _record=record))
+    if signature is not None:
+        near_duplicate_index.add(digest, signature)
+    
+    return response_data, 200
+
+
+def _split_cached(cached):
+    """Split a cached entry into the response to send and its history record (None for older entries)"""
+    response_data = dict(cached)
+    return response_data, response_data.pop('_record', None)
+
+
+def _record_served(digest, record, faculty):
+    """Record an analysis served from the cache in the history, under the upload's digest"""
+    if analysis_store is None or record is None:
+        return
+    scorecard = ScoreCard.from_issues([Issue(rule_id) for rule_id in record['rules']], faculty,
+                                      record['faculty_adjustment'])
+    analysis_store.record(digest, scorecard, record['word_count'], source='analyze',
+                          ruleset_version=analyzer.ruleset_version)
+
+
+def _build_response(resume_text, scorecard, report, fields, compact):
+    """Assemble the JSON body for an analyzed resume from its ScoreCard"""
+    issues = scorecard.issues
+    response_data = {
+        'success': True,
+        'faculty': scorecard.faculty or None,
+        'statistics': {
+            'word_count': len(resume_text.split()),
+            'char_count': len(resume_text),
+            'score': scorecard.score,
+            'faculty_adjustment': scorecard.faculty_adjustment,
+            'score_breakdown': scorecard.breakdown()
+        },
+        'summary': scorecard.summary()
+    }
+    
+    if 'issues' in fields and compact:
+        # Columnar: each issue is sent once, as position i of every column
+        response_data['issues'] = {
+            'rule': [issue.rule_id for issue in issues],
+            'severity': [issue.severity for issue in issues],
+            'category': [issue.category for issue in issues],
+            'message': [issue.message for issue in issues],
+            'suggestion': [issue.suggestion for issue in issues]
+        }
+    elif 'issues' in fields:
+        response_data['issues'] = [issue.to_dict() for issue in issues]
+    
+    if 'issues_by_category' in fields:
+        # Group by category
+        issues_by_category = {}
+        for issue in issues:
+            data = issue.to_dict()
+            del data['category']
+            issues_by_category.setdefault(issue.category, []).append(data)
+        response_data['issues_by_category'] = issues_by_category
+    
+    if 'report' in fields:
+        response_data['report'] = report
+    
+    for name in ('statistics', 'summary'):
+        if name not in fields:
+            del response_data[name]
+    return response_data
+
+
+def warm_up():
+    """
+    Run the bundled sample resume through the whole pipeline before serving traffic.
+    
+    The text is parsed as TXT, DOCX and PDF so the document libraries are imported
+    and their first-use setup is done, then analyzed, reported and serialized.
+    Nothing is cached, timed or recorded in /metrics.
+    """
+    with open(SAMPLE_RESUME_PATH, 'rb') as f:
+        content = f.read()
+    resume_text = content.decode('utf-8')
+    samples = {'.txt': content}
+    try:
+        from docx import Document
+        document = Document()
+        for line in resume_text.split('\n'):
+            document.add_paragraph(line)
+        buffer = io.BytesIO()
+        document.save(buffer)
+        samples['.docx'] = buffer.getvalue()
+    except ImportError:
+        pass
+    # A PDF with real text, so the backend's font and text-extraction paths are warmed too
+    from pdf_fixture import pdf_bytes
+    samples['.pdf'] = pdf_bytes(resume_text)
+    
+    # Same budgets as requests, but without the parse cache
+    warm_parser = ResumeParser(max_pages=parser.max_pages, max_chars=parser.max_chars,
+                               pdf_backend=parser.pdf_backend)
+    for file_ext, data in samples.items():
+        try:
+            warm_parser.parse_bytes(data, file_ext)
+        except ImportError:
+            pass  # no PDF library installed; uploads report it
+    
+    for faculty in (None, 'engineering'):
+        scorecard = analyzer.evaluate(resume_text, faculty=faculty)
+        report = generator.generate_report(scorecard.issues, resume_text, scorecard)
+        json.dumps(_build_response(resume_text, scorecard, report, RESPONSE_FIELDS, False))
+
+
+def reopen_after_fork():
+    """Give a forked worker its own sqlite connections for the caches"""
+    result_cache.reopen()
+    posting_store.reopen()
+    job_manager.reopen()
+    if analysis_store is not None:
+        analysis_store.reopen()
+    if near_duplicate_index is not None:
+        near_duplicate_index.reopen()
+    if parse_cache is not None:
+        parse_cache.reopen()
+
+
 @app.route('/analyze', methods=['POST'])
 def analyze():
     """Analyze uploaded resume file"""
@@ -92,106 +480,425 @@ def analyze():
         if faculty and faculty not in ('sciences', 'engineering', 'arts', 'business'):
             faculty = None
         
-        # Save uploaded file temporarily
-        filename = secure_filename(file.filename)
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(filepath)
+        # Optional job posting (see POST /postings) to match the resume against
+        posting_id = request.form.get('posting_id') or request.args.get('posting_id')
+        posting = posting_store.get(posting_id) if posting_id else None
+        if posting_id and posting is None:
+            return jsonify({'error': 'Unknown posting'}), 404
         
+        # Response profile: which sections to build and send
         try:
-            # Parse resume
-            parser = ResumeParser()
-            resume_text = parser.parse(filepath)
-            
-            if not resume_text or len(resume_text.strip()) < 50:
-                return jsonify({
-                    'error': 'Could not extract meaningful content from resume file. Please ensure the file is readable.'
-                }), 400
-            
-            # Analyze resume (with optional faculty for degree-based rating)
-            analyzer = ResumeAnalyzer()
-            issues = analyzer.analyze(resume_text, faculty=faculty)
-            faculty_adjustment = analyzer.get_faculty_score_adjustment(resume_text, faculty)
-            
-            # Generate feedback
-            generator = FeedbackGenerator()
-            report = generator.generate_report(issues, resume_text)
-            
-            # Prepare response data
-            word_count = len(resume_text.split())
-            char_count = len(resume_text)
-            
-            critical_issues = [i for i in issues if i.severity == 'critical']
-            warning_issues = [i for i in issues if i.severity == 'warning']
-            suggestion_issues = [i for i in issues if i.severity == 'suggestion']
-            
-            # Calculate score (base minus issues, then faculty adjustment for degree field)
-            base_score = 100
-            for issue in issues:
-                if issue.severity == 'critical':
-                    base_score -= 10
-                elif issue.severity == 'warning':
-                    base_score -= 5
-                elif issue.severity == 'suggestion':
-                    base_score -= 2
-            score = max(0, min(100, base_score + faculty_adjustment))
-            
-            # Convert issues to dictionaries for JSON
-            issues_data = []
-            for issue in issues:
-                issues_data.append({
-                    'severity': issue.severity,
-                    'category': issue.category,
-                    'message': issue.message,
-                    'suggestion': issue.suggestion
-                })
-            
-            # Group by category
-            issues_by_category = {}
-            for issue in issues:
-                if issue.category not in issues_by_category:
-                    issues_by_category[issue.category] = []
-                issues_by_category[issue.category].append({
-                    'severity': issue.severity,
-                    'message': issue.message,
-                    'suggestion': issue.suggestion
-                })
-            
-            response_data = {
-                'success': True,
-                'faculty': faculty or None,
-                'statistics': {
-                    'word_count': word_count,
-                    'char_count': char_count,
-                    'score': score,
-                    'faculty_adjustment': faculty_adjustment
-                },
-                'summary': {
-                    'total_issues': len(issues),
-                    'critical': len(critical_issues),
-                    'warnings': len(warning_issues),
-                    'suggestions': len(suggestion_issues)
-                },
-                'issues': issues_data,
-                'issues_by_category': issues_by_category,
-                'report': report
-            }
-            
-            return jsonify(response_data)
-            
-        finally:
-            # Clean up temporary file
-            if os.path.exists(filepath):
-                os.remove(filepath)
-                
+            fields, compact = parse_response_profile(request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        # Read the upload once; the bytes serve both the cache key and the parser
+        timer = make_timer()
+        with timer.stage('read_upload'):
+            content = file.read()
+        
+        # Async mode: queue the analysis and return a job id straight away
+        if request.args.get('async') in ('1', 'true'):
+            try:
+                job = job_manager.submit(analyze_upload, content, file.filename, faculty, timer, fields, compact,
+                                         posting)
+            except JobQueueFull:
+                return jsonify({'error': 'Too many analyses in progress. Please retry shortly.'}), 429, {'Retry-After': '5'}
+            response = jsonify({
+                'job_id': job.id,
+                'status': job.status,
+                'status_url': url_for('job_status', job_id=job.id),
+                'events_url': url_for('job_events', job_id=job.id)
+            })
+            response.headers['Location'] = url_for('job_status', job_id=job.id)
+            return response, 202
+        
+        response_data, status_code = analyze_upload(content, file.filename, faculty, timer, fields, compact,
+                                                    posting)
+        with timer.stage('serialize'):
+            response = jsonify(response_data)
+        return response, status_code
+    
     except Exception as e:
         return jsonify({'error': f'An error occurred: {str(e)}'}), 500
 
 
+@app.route('/sessions', methods=['POST'])
+def open_session():
+    """Open an editing session on resume text (JSON: text, optional faculty)"""
+    data = request.get_json(silent=True)
+    text = data.get('text') if isinstance(data, dict) else None
+    if not isinstance(text, str):
+        return jsonify({'error': 'JSON body with a "text" string is required'}), 400
+    if len(text) > app.config['MAX_TEXT_CHARS']:
+        return jsonify({'error': f'Text is longer than {app.config["MAX_TEXT_CHARS"]} characters'}), 400
+    faculty = data.get('faculty')
+    if faculty is not None and not isinstance(faculty, str):
+        return jsonify({'error': '"faculty" must be a string'}), 400
+    faculty = (faculty or '').strip().lower()
+    if faculty not in VALID_FACULTIES:
+        faculty = None
+    
+    session = AnalysisSession(analyzer, text, faculty)
+    session_id = session_store.open(session)
+    scorecard = session.scorecard
+    return jsonify({
+        'session_id': session_id,
+        'issues': [issue.to_dict() for issue in scorecard.issues],
+        'score': scorecard.score,
+        'summary': scorecard.summary()
+    }), 201
+
+
+@app.route('/sessions/<session_id>/edits', methods=['POST'])
+def edit_session(session_id):
+    """
+    Apply edits and return the issues they added and removed.
+    
+    JSON: {"edits": [{"offset": int, "delete": int, "insert": str}, ...]}, applied
+    in order, each against the text left by the previous one
+    """
+    session = session_store.get(session_id)
+    if session is None:
+        return jsonify({'error': 'Unknown or expired session'}), 404
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({'error': 'JSON body with an "edits" list is required'}), 400
+    try:
+        edits = [(int(edit.get('offset', 0)), int(edit.get('delete', 0)), str(edit.get('insert', '')))
+                 for edit in data.get('edits', [])]
+    except (AttributeError, TypeError, ValueError):
+        return jsonify({'error': 'Each edit needs an integer "offset" and "delete" and a string "insert"'}), 400
+    
+    # Reject edits that would make the text too long before touching the session
+    length = len(session.text) + sum(len(inserted) - deleted for _, deleted, inserted in edits)
+    if length > app.config['MAX_TEXT_CHARS']:
+        return jsonify({'error': f'Text would be longer than {app.config["MAX_TEXT_CHARS"]} characters'}), 413
+    
+    try:
+        diff = session.apply_edits(edits)
+    except ValueError as e:
+        # Edits before the bad one stay applied; the client should resync
+        return jsonify({'error': str(e)}), 400
+    return jsonify(diff.to_dict())
+
+
+@app.route('/sessions/<session_id>', methods=['DELETE'])
+def close_session(session_id):
+    """Close an editing session"""
+    if not session_store.close(session_id):
+        return jsonify({'error': 'Unknown or expired session'}), 404
+    return '', 204
+
+
+def collect_batch_uploads(files, faculty, faculties):
+    """
+    Turn uploaded files and zip archives into the items of a batch, in upload order.
+    
+    Nothing is read yet: sizes come from the spooled uploads and the zip directories,
+    and each item's content is read when the batch gets to it. The upload streams are
+    taken over from the request, which would close them when the view returns; the
+    caller closes them once the batch is done.
+    
+    Args:
+        files: Uploaded FileStorage objects; .zip uploads are expanded
+        faculty: Faculty for every file without its own entry in faculties
+        faculties: Per-file faculties keyed by file name (or path inside a zip)
+    Returns:
+        Tuple of the items and the upload streams. Items are (name, read, faculty), where
+        read() returns the file's bytes, or BatchResult errors to report as-is; raises
+        ValueError when the batch is over the file or size limits
+    """
+    max_files = app.config['BATCH_MAX_FILES']
+    max_file_size = app.config['MAX_CONTENT_LENGTH']
+    budget = app.config['BATCH_MAX_CONTENT_LENGTH']
+    items = []
+    streams = []
+    
+    def add(name, size, read):
+        file_faculty = faculties.get(name, faculty)
+        if file_faculty not in VALID_FACULTIES:
+            file_faculty = None
+        if not allowed_file(name):
+            items.append(BatchResult(path=name, faculty=file_faculty,
+                                     error=f'Invalid file type. Allowed types: {", ".join(ALLOWED_EXTENSIONS)}'))
+        elif size > max_file_size:
+            items.append(BatchResult(path=name, faculty=file_faculty, error='File is too large'))
+        else:
+            items.append((name, read, file_faculty))
+        if len(items) > max_files:
+            raise ValueError(f'Too many files: at most {max_files} per batch')
+    
+    def read_upload(stream):
+        def read():
+            stream.seek(0)
+            return stream.read()
+        return read
+    
+    def read_member(archive, info):
+        def read():
+            # zipfile stops at the size in the directory and checks the CRC, so this is capped too
+            with archive.open(info) as member:
+                return member.read()
+        return read
+    
+    for file in files:
+        if not file.filename:
+            continue
+        stream, file.stream = file.stream, io.BytesIO()
+        streams.append(stream)
+        if not file.filename.lower().endswith('.zip'):
+            stream.seek(0, os.SEEK_END)
+            add(file.filename, stream.tell(), read_upload(stream))
+            continue
+        try:
+            archive = zipfile.ZipFile(stream)
+        except zipfile.BadZipFile:
+            items.append(BatchResult(path=file.filename, error='Not a valid zip archive'))
+            continue
+        for info in archive.infolist():
+            base_name = os.path.basename(info.filename)
+            if info.is_dir() or info.filename.startswith('__MACOSX/') or base_name.startswith('.'):
+                continue
+            if info.file_size <= max_file_size:
+                budget -= info.file_size
+                if budget < 0:
+                    raise ValueError('Zip contents exceed the batch size limit')
+            add(info.filename, info.file_size, read_member(archive, info))
+    return items, streams
+
+
+@app.route('/analyze/batch', methods=['POST'])
+def analyze_batch():
+    """
+    Analyze many resumes and stream one JSON line per resume as each finishes.
+    
+    Form fields: files (repeatable; .zip archives are expanded), faculty (applies to
+    every file), faculties (JSON object of per-file faculties, keyed by file name) and
+    posting_id (a stored job posting every file is matched against).
+    Each line is a batch result with the file's upload position as 'index';
+    files that cannot be analyzed get an 'error' line instead of failing the batch.
+    """
+    files = request.files.getlist('files') + request.files.getlist('file')
+    if not any(file.filename for file in files):
+        return jsonify({'error': 'No files uploaded'}), 400
+    
+    faculty = (request.form.get('faculty') or '').strip().lower() or None
+    try:
+        faculties = json.loads(request.form.get('faculties') or '{}')
+        if not isinstance(faculties, dict):
+            raise ValueError('faculties must be a JSON object')
+        faculties = {name: (value or '').strip().lower() or None for name, value in faculties.items()}
+    except (ValueError, AttributeError) as e:
+        return jsonify({'error': f'Invalid faculties: {e}'}), 400
+    
+    posting_id = request.form.get('posting_id') or request.args.get('posting_id')
+    posting = posting_store.get(posting_id) if posting_id else None
+    if posting_id and posting is None:
+        return jsonify({'error': 'Unknown posting'}), 404
+    
+    try:
+        items, streams = collect_batch_uploads(files, faculty, faculties)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 413
+    
+    def stream():
+        # Files are read only as the pool takes them, so a batch never sits in memory whole
+        errors = []
+        positions = []
+        digests = []
+        
+        def uploads():
+            for index, item in enumerate(items):
+                if isinstance(item, BatchResult):
+                    errors.append((index, item))
+                    continue
+                name, read, file_faculty = item
+                try:
+                    content = read()
+                except (OSError, zipfile.BadZipFile) as e:
+                    errors.append((index, BatchResult(path=name, faculty=file_faculty, error=str(e))))
+                    continue
+                positions.append(index)
+                digests.append(ResultCache.digest(content) if analysis_store is not None else None)
+                yield name, content, file_faculty
+        
+        def error_lines():
+            while errors:
+                index, result = errors.pop(0)
+                yield json.dumps(dict(index=index, **result.to_dict())) + '\n'
+        
+        try:
+            for upload_index, result in upload_pool.analyze(uploads(), cache=result_cache, job=posting):
+                yield from error_lines()
+                if analysis_store is not None and result.scorecard is not None:
+                    analysis_store.record(digests[upload_index], result.scorecard, result.word_count,
+                                          source='batch', ruleset_version=upload_pool.ruleset_version)
+                yield json.dumps(dict(index=positions[upload_index], **result.to_dict())) + '\n'
+            yield from error_lines()
+        finally:
+            for upload in streams:
+                upload.close()
+    
+    return Response(stream(), mimetype='application/x-ndjson',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+@app.route('/postings', methods=['POST'])
+def add_posting():
+    """
+    Index a job description for matching (JSON: text, optional title; or an uploaded file).
+    
+    Posting the same text and title again returns the same posting_id.
+    """
+    data = request.get_json(silent=True)
+    if data is not None:
+        text = data.get('text')
+        title = data.get('title') or ''
+    elif 'file' in request.files and request.files['file'].filename:
+        file = request.files['file']
+        if not allowed_file(file.filename):
+            return jsonify({
+                'error': f'Invalid file type. Allowed types: {", ".join(ALLOWED_EXTENSIONS)}'
+            }), 400
+        try:
+            text = parser.parse_bytes(file.read(), os.path.splitext(file.filename)[1])
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        title = request.form.get('title') or os.path.splitext(file.filename)[0]
+    else:
+        return jsonify({'error': 'JSON body with a "text" string or an uploaded file is required'}), 400
+    if not isinstance(text, str) or not isinstance(title, str) or not text.strip():
+        return jsonify({'error': 'Job description text is required'}), 400
+    if len(text) > app.config['MAX_TEXT_CHARS']:
+        return jsonify({'error': f'Text is longer than {app.config["MAX_TEXT_CHARS"]} characters'}), 400
+    
+    posting = posting_store.add(text, title)
+    response = jsonify(posting.to_dict())
+    response.headers['Location'] = url_for('get_posting', posting_id=posting.posting_id)
+    return response, 201
+
+
+@app.route('/postings')
+def list_postings():
+    """Postings indexed by this worker (all of them with POSTING_STORE_PATH set)"""
+    return jsonify({'postings': [{'posting_id': posting.posting_id, 'title': posting.title}
+                                 for posting in posting_store.all()]})
+
+
+@app.route('/postings/<posting_id>')
+def get_posting(posting_id):
+    """A posting's weighted terms"""
+    posting = posting_store.get(posting_id)
+    if posting is None:
+        return jsonify({'error': 'Unknown posting'}), 404
+    return jsonify(posting.to_dict())
+
+
+def stats_filters():
+    """faculty, since and until query parameters shared by the /stats endpoints"""
+    faculty = (request.args.get('faculty') or '').strip().lower() or None
+    return faculty, parse_time(request.args.get('since')), parse_time(request.args.get('until'))
+
+
+def stats_response(query):
+    """Run an analysis store query, answering 404 when the store is off and 400 for bad parameters"""
+    if analysis_store is None:
+        return jsonify({'error': 'Analysis history is not enabled (set ANALYSIS_STORE_PATH)'}), 404
+    try:
+        return jsonify(query())
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+
+@app.route('/stats/summary')
+def stats_summary():
+    """Analyses, distinct resumes and score/issue averages (?faculty=&since=&until=)"""
+    return stats_response(lambda: analysis_store.summary(*stats_filters()))
+
+
+@app.route('/stats/rules')
+def stats_rules():
+    """Most frequent issues (?faculty=&severity=&since=&until=&limit=)"""
+    def query():
+        faculty, since, until = stats_filters()
+        limit = int(request.args.get('limit', 10))
+        return {'rules': analysis_store.top_rules(faculty, request.args.get('severity') or None, since, until, limit)}
+    return stats_response(query)
+
+
+@app.route('/stats/scores')
+def stats_scores():
+    """Score distribution in bands of ?bucket= points (default 10)"""
+    def query():
+        bucket = int(request.args.get('bucket', 10))
+        if not 1 <= bucket <= 100:
+            raise ValueError('bucket must be between 1 and 100')
+        return {'scores': analysis_store.score_histogram(*stats_filters(), bucket=bucket)}
+    return stats_response(query)
+
+
+@app.route('/stats/faculties')
+def stats_faculties():
+    """Analyses and average score per faculty (?since=&until=)"""
+    def query():
+        _, since, until = stats_filters()
+        return {'faculties': analysis_store.by_faculty(since, until)}
+    return stats_response(query)
+
+
+@app.route('/jobs/<job_id>')
+def job_status(job_id):
+    """Poll an async analysis job"""
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown or expired job'}), 404
+    return jsonify(job.to_dict())
+
+
+@app.route('/jobs/<job_id>/events')
+def job_events(job_id):
+    """Server-sent events: keep-alive comments until the job finishes, then its result"""
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown or expired job'}), 404
+    
+    def stream():
+        while not job_manager.wait(job, timeout=5):
+            yield ': keep-alive\n\n'
+        yield f'event: {job.status}\ndata: {json.dumps(job.to_dict())}\n\n'
+    
+    return Response(stream(), mimetype='text/event-stream', headers={'Cache-Control': 'no-cache'})
+
+
+@app.route('/metrics')
+def metrics():
+    """Prometheus text exposition of stage/rule histograms and cache/queue gauges"""
+    cache = result_cache.stats()
+    jobs = job_manager.stats()
+    gauges = {
+        'resume_checker_result_cache_hits_total': cache['hits'],
+        'resume_checker_result_cache_misses_total': cache['misses'],
+        'resume_checker_result_cache_entries': cache['memory_entries'],
+        'resume_checker_jobs_pending': jobs['pending'],
+    }
+    return Response(metrics_registry.render(gauges), mimetype='text/plain; version=0.0.4')
+
+
 @app.route('/health')
 def health():
     """Health check endpoint"""
     return jsonify({'status': 'ok'})
 
 
+@app.route('/cache/stats')
+def cache_stats():
+    """Result cache hit/miss counters (and near-duplicate lookups when enabled)"""
+    stats = result_cache.stats()
+    if near_duplicate_index is not None:
+        stats['near_duplicates'] = near_duplicate_index.stats()
+    return jsonify(stats)
+
+
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=5000)
@@ -0,0 +1,383 @@
+"""
+Batch Analyzer - Parses and analyzes many resume files across a process pool
+"""
+import glob
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from multiprocessing import Pool
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from resume_parser import ResumeParser
+from resume_analyzer import Issue, ResumeAnalyzer, VALID_FACULTIES
+from job_matcher import JobIndex, PostingStore
+from scoring import ScoreCard
+from result_cache import ResultCache
+from parse_cache import ParseCache
+
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx', '.doc', '.txt')
+
+
+@dataclass
+class BatchResult:
+    """Outcome of parsing and analyzing one resume file"""
+    path: str
+    faculty: Optional[str] = None
+    scorecard: Optional[ScoreCard] = None
+    word_count: int = 0
+    error: Optional[str] = None
+    job_match: Optional[Dict] = None  # JobMatch.to_dict() when matched against a posting
+    cached: bool = False  # served from the result cache rather than analyzed now
+
+    @property
+    def issues(self) -> List[Issue]:
+        return self.scorecard.issues if self.scorecard else []
+
+    @property
+    def score(self) -> Optional[int]:
+        return self.scorecard.score if self.scorecard else None
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'BatchResult':
+        """Rebuild a result from to_dict() output"""
+        scorecard = None
+        if not data.get('error'):
+            issues = [Issue.from_dict(issue) for issue in data.get('issues', [])]
+            scorecard = ScoreCard.from_issues(issues, data.get('faculty'), data.get('faculty_adjustment', 0))
+        return cls(
+            path=data['path'],
+            faculty=data.get('faculty'),
+            scorecard=scorecard,
+            word_count=data.get('word_count', 0),
+            error=data.get('error'),
+            job_match=data.get('job_match'),
+        )
+
+    def to_dict(self) -> Dict:
+        """Convert to a JSON-serializable dictionary"""
+        if self.error:
+            return {'path': self.path, 'faculty': self.faculty, 'error': self.error}
+        data = {
+            'path': self.path,
+            'faculty': self.faculty,
+            'score': self.scorecard.score,
+            'faculty_adjustment': self.scorecard.faculty_adjustment,
+            'word_count': self.word_count,
+            'summary': self.scorecard.summary(),
+            'issues': [issue.to_dict() for issue in self.issues],
+        }
+        if self.job_match is not None:
+            data['job_match'] = self.job_match
+        return data
+
+
+def collect_resume_files(inputs: Iterable[str]) -> List[str]:
+    """
+    Expand a mix of file paths, directories and glob patterns into resume files.
+
+    Directories are searched recursively; only supported extensions are kept.
+    """
+    paths = []
+    seen = set()
+
+    def add(path):
+        if path not in seen and os.path.splitext(path)[1].lower() in SUPPORTED_EXTENSIONS:
+            seen.add(path)
+            paths.append(path)
+
+    for entry in inputs:
+        if os.path.isdir(entry):
+            for root, _, files in os.walk(entry):
+                for name in sorted(files):
+                    add(os.path.join(root, name))
+        elif os.path.isfile(entry):
+            add(entry)
+        else:
+            for match in sorted(glob.glob(entry, recursive=True)):
+                if os.path.isfile(match):
+                    add(match)
+    return paths
+
+
+# Parser and analyzer owned by a pool worker process, set by _init_worker, plus the
+# job posting sent to it up front and the posting store it looks other postings up in
+_worker_parser = None
+_worker_analyzer = None
+_worker_jobs: Dict[str, JobIndex] = {}
+_worker_postings: Optional[PostingStore] = None
+
+
+def _init_worker(parse_cache_path: Optional[str] = None, parser_options: Optional[Dict] = None,
+                 job: Optional[JobIndex] = None, posting_store_path: Optional[str] = None):
+    global _worker_parser, _worker_analyzer, _worker_jobs, _worker_postings
+    cache = ParseCache(parse_cache_path) if parse_cache_path else None
+    _worker_parser = ResumeParser(cache=cache, **(parser_options or {}))
+    _worker_analyzer = ResumeAnalyzer()
+    _worker_jobs = {job.posting_id: job} if job is not None else {}
+    _worker_postings = PostingStore(posting_store_path) if posting_store_path else None
+
+
+def _worker_job(posting_id: Optional[str], job: Optional[JobIndex] = None) -> Optional[JobIndex]:
+    """The posting a task refers to: sent along with the task, sent to the worker up front, or stored"""
+    if job is not None or posting_id is None:
+        return job
+    job = _worker_jobs.get(posting_id)
+    if job is None and _worker_postings is not None:
+        job = _worker_postings.get(posting_id)
+    if job is None:
+        raise ValueError(f'Unknown job posting: {posting_id}')
+    return job
+
+
+def _analyze_text(path: str, faculty: Optional[str], resume_text: Optional[str],
+                  job: Optional[JobIndex]) -> BatchResult:
+    if not resume_text or len(resume_text.strip()) < 50:
+        return BatchResult(path=path, faculty=faculty,
+                           error='Could not extract meaningful content from resume file.')
+
+    scorecard = _worker_analyzer.evaluate(resume_text, faculty=faculty, job=job)
+    job_match = scorecard.job_match.to_dict() if scorecard.job_match is not None else None
+    return BatchResult(path=path, faculty=faculty, scorecard=scorecard,
+                       word_count=len(resume_text.split()), job_match=job_match)
+
+
+def _process_file(task: Tuple[str, Optional[str], Optional[str]]) -> BatchResult:
+    """Parse and analyze one file inside a worker; errors are reported, not raised"""
+    path, faculty, posting_id = task
+    try:
+        return _analyze_text(path, faculty, _worker_parser.parse(path), _worker_job(posting_id))
+    except Exception as e:
+        return BatchResult(path=path, faculty=faculty, error=str(e))
+
+
+def _process_upload(task: Tuple[str, bytes, Optional[str], Optional[str], Optional[JobIndex]]) -> BatchResult:
+    """Parse and analyze one in-memory upload inside a worker; errors are reported, not raised"""
+    name, data, faculty, posting_id, job = task
+    try:
+        job = _worker_job(posting_id, job)
+        return _analyze_text(name, faculty, _worker_parser.parse_bytes(data, os.path.splitext(name)[1]), job)
+    except Exception as e:
+        return BatchResult(path=name, faculty=faculty, error=str(e))
+
+
+def _cache_namespace(job: Optional[JobIndex]) -> str:
+    return f'batch:{job.posting_id}' if job is not None else 'batch'
+
+
+def analyze_batch(paths: Iterable[str], faculty: Optional[str] = None,
+                  workers: Optional[int] = None, chunksize: int = 8,
+                  cache: Optional[ResultCache] = None,
+                  parse_cache_path: Optional[str] = None,
+                  parser_options: Optional[Dict] = None,
+                  job: Optional[JobIndex] = None) -> Iterator[BatchResult]:
+    """
+    Parse and analyze resume files in parallel, yielding results as they complete.
+
+    Args:
+        paths: Resume file paths (see collect_resume_files)
+        faculty: Optional field of degree applied to every resume
+        workers: Number of worker processes (None = CPU count, 1 = run in this process)
+        chunksize: Number of files sent to a worker at a time
+        cache: Optional result cache; hits are yielded first and skip the pool
+        parse_cache_path: Optional sqlite file of extracted text shared by the workers
+        parser_options: Extra ResumeParser arguments, e.g. max_pages and max_chars
+        job: Optional job posting index every resume is matched against
+    Returns:
+        Iterator of BatchResult objects, in completion order
+    """
+    if faculty not in VALID_FACULTIES:
+        faculty = None
+    # Reject bad parser options (e.g. a PDF backend that is not installed) here, not in every worker
+    ResumeParser(**(parser_options or {}))
+
+    cache_keys = {}
+    if cache is not None:
+        ruleset_version = ResumeAnalyzer().ruleset_version
+        pending = []
+        for path in paths:
+            try:
+                with open(path, 'rb') as f:
+                    key = cache.make_key(f.read(), faculty, ruleset_version, namespace=_cache_namespace(job))
+            except OSError:
+                pending.append(path)
+                continue
+            cached = cache.get(key)
+            if cached is not None:
+                result = BatchResult.from_dict(dict(cached, path=path))
+                result.cached = True
+                yield result
+                continue
+            cache_keys[path] = key
+            pending.append(path)
+        paths = pending
+
+    for result in _run_batch(paths, faculty, workers, chunksize, parse_cache_path, parser_options, job):
+        key = cache_keys.get(result.path)
+        if key and not result.error:
+            data = result.to_dict()
+            del data['path']
+            cache.set(key, data)
+        yield result
+
+
+def _run_batch(paths: Iterable[str], faculty: Optional[str], workers: Optional[int], chunksize: int,
+               parse_cache_path: Optional[str], parser_options: Optional[Dict],
+               job: Optional[JobIndex] = None) -> Iterator[BatchResult]:
+    """Fan files out to the pool, or process them inline for workers=1"""
+    # The posting goes to each worker once, through the initializer; tasks name it by id
+    posting_id = job.posting_id if job is not None else None
+    tasks = ((path, faculty, posting_id) for path in paths)
+
+    if workers == 1:
+        _init_worker(parse_cache_path, parser_options, job)
+        for task in tasks:
+            yield _process_file(task)
+        return
+
+    # Workers import the parser backends and build the analyzer once, then reuse them.
+    # Files already keep every core busy, so long PDFs are not split across pages too:
+    # a page pool inside each worker would only oversubscribe the CPUs.
+    if parse_cache_path:
+        ParseCache(parse_cache_path)  # create the schema before workers race to do it
+    worker_options = dict(parser_options or {}, parallel_pages=None)
+    with Pool(workers, initializer=_init_worker, initargs=(parse_cache_path, worker_options, job)) as pool:
+        yield from pool.imap_unordered(_process_file, tasks, chunksize)
+
+
+class UploadPool:
+    """
+    Long-lived worker processes that parse and analyze uploads held in memory (POST /analyze/batch).
+
+    The processes start on first use and serve every later batch, each building
+    its parser and analyzer once. Only a few uploads per worker are handed to the
+    pool at a time, so results stream out while the rest of a large batch waits.
+    With posting_store_path set, workers look postings up in that PostingStore
+    and tasks only name them by id; otherwise the posting travels with each task.
+    """
+
+    def __init__(self, workers: Optional[int] = None, parse_cache_path: Optional[str] = None,
+                 parser_options: Optional[Dict] = None, posting_store_path: Optional[str] = None):
+        self.workers = workers or os.cpu_count() or 1
+        self.parse_cache_path = parse_cache_path
+        self.posting_store_path = posting_store_path
+        # Uploads already keep every worker busy, so long PDFs are not split across pages too
+        self.parser_options = dict(parser_options or {}, parallel_pages=None)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._ruleset_version: Optional[str] = None
+
+    def _submit(self, task: Tuple[str, bytes, Optional[str], Optional[str], Optional[JobIndex]]
+                ) -> Tuple[Future, ProcessPoolExecutor]:
+        pool = self._pool()
+        try:
+            return pool.submit(_process_upload, task), pool
+        except BrokenProcessPool:
+            self._discard_pool(pool)
+            pool = self._pool()
+            return pool.submit(_process_upload, task), pool
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                if self.parse_cache_path:
+                    ParseCache(self.parse_cache_path)  # create the schema before workers race to do it
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, initializer=_init_worker,
+                    initargs=(self.parse_cache_path, self.parser_options, None, self.posting_store_path))
+            return self._executor
+
+    def analyze(self, uploads: Iterable[Tuple[str, bytes, Optional[str]]],
+                cache: Optional[ResultCache] = None,
+                job: Optional[JobIndex] = None) -> Iterator[Tuple[int, BatchResult]]:
+        """
+        Analyze (name, content, faculty) uploads, yielding (position in uploads, result) as each finishes.
+
+        Args:
+            uploads: File name (its extension picks the parser), raw bytes and optional faculty
+            cache: Optional result cache (shared with analyze_batch); hits are yielded without the pool
+            job: Optional job posting index every upload is matched against
+        Returns:
+            Iterator of (index, BatchResult), in completion order; per-file failures are
+            reported in BatchResult.error
+        """
+        pending: Dict[Future, Tuple[int, str, Optional[str], Optional[str], ProcessPoolExecutor]] = {}
+        max_in_flight = self.workers * 4
+        posting_id = job.posting_id if job is not None else None
+        # Workers with the posting store find the posting by id
+        task_job = None if self.posting_store_path else job
+        try:
+            for index, (name, data, faculty) in enumerate(uploads):
+                if faculty not in VALID_FACULTIES:
+                    faculty = None
+                key = None
+                if cache is not None:
+                    key = cache.make_key(data, faculty, self.ruleset_version, namespace=_cache_namespace(job))
+                    cached = cache.get(key)
+                    if cached is not None:
+                        result = BatchResult.from_dict(dict(cached, path=name))
+                        result.cached = True
+                        yield index, result
+                        continue
+                if self.workers == 1:
+                    yield index, self._analyze_inline((name, data, faculty, posting_id, job), cache, key)
+                    continue
+                future, pool = self._submit((name, data, faculty, posting_id, task_job))
+                pending[future] = (index, name, faculty, key, pool)
+                while len(pending) >= max_in_flight:
+                    yield from self._collect(pending, cache)
+            while pending:
+                yield from self._collect(pending, cache)
+        finally:
+            # The client went away (or something failed): drop work that has not started
+            for future in pending:
+                future.cancel()
+
+    def _collect(self, pending: Dict, cache: Optional[ResultCache]) -> Iterator[Tuple[int, BatchResult]]:
+        """Wait for at least one pending upload and yield everything that has finished"""
+        for future in wait(pending, return_when=FIRST_COMPLETED).done:
+            index, name, faculty, key, pool = pending.pop(future)
+            try:
+                result = future.result()
+            except BrokenProcessPool:
+                # A worker died (e.g. killed for memory); later uploads get a fresh pool
+                self._discard_pool(pool)
+                result = BatchResult(path=name, faculty=faculty, error='Worker process failed')
+            except Exception as e:
+                result = BatchResult(path=name, faculty=faculty, error=str(e))
+            self._store(cache, key, result)
+            yield index, result
+
+    def _analyze_inline(self, task, cache, key) -> BatchResult:
+        if _worker_analyzer is None:
+            _init_worker(self.parse_cache_path, self.parser_options)
+        result = _process_upload(task)
+        self._store(cache, key, result)
+        return result
+
+    @staticmethod
+    def _store(cache: Optional[ResultCache], key: Optional[str], result: BatchResult):
+        if key and not result.error:
+            data = result.to_dict()
+            del data['path']
+            cache.set(key, data)
+
+    @property
+    def ruleset_version(self) -> str:
+        if self._ruleset_version is None:
+            self._ruleset_version = ResumeAnalyzer().ruleset_version
+        return self._ruleset_version
+
+    def _discard_pool(self, pool: Optional[ProcessPoolExecutor] = None):
+        """Shut down the current pool (only if it is still the given one)"""
+        with self._lock:
+            executor = self._executor
+            if executor is None or (pool is not None and executor is not pool):
+                return
+            self._executor = None
+        executor.shutdown(wait=False)
+
+    def shutdown(self):
+        """Stop the worker processes; the next batch starts new ones"""
+        self._discard_pool()
@@ -0,0 +1,306 @@
+"""
+Benchmark - Times parsing, each analyzer rule and report generation on synthetic resumes
+
+Usage:
+    python benchmark.py --sizes 300,1000,5000 --formats txt,docx,pdf --output bench.json
+    python benchmark.py --output new.json --compare bench.json --threshold 0.2
+    python benchmark.py --startup-budget 120
+    python benchmark.py --formats pdf --sizes 300,5000   # includes the PDF backend conformance check
+"""
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+
+import click
+
+from pdf_backends import available_backends
+from pdf_fixture import pdf_bytes
+from resume_parser import ResumeParser
+from resume_analyzer import AnalysisContext, ResumeAnalyzer
+from feedback_generator import FeedbackGenerator
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+TEMPLATE_PATH = os.path.join(REPO_DIR, 'sample_resume.txt')
+
+# Phrases mixed into synthetic experience bullets so rules see realistic vocabulary
+BULLET_VERBS = ['Developed', 'Managed', 'Helped', 'Designed', 'Assisted with', 'Led', 'Built',
+                'Implemented', 'Worked on', 'Improved', 'Tried to', 'Collaborated on']
+BULLET_OBJECTS = ['the data analysis pipeline', 'client onboarding', 'a research methodology',
+                  'the marketing budget', 'software tooling', 'lab experiments', 'a portfolio review',
+                  'system design documents', 'revenue growth strategy', 'technical programming tasks']
+BULLET_RESULTS = ['increasing throughput by {n}%', 'for {n} months', 'saving ${n}k per year',
+                  'with a team of {n}', 'reducing errors', 'across {n}+ projects']
+
+
+def synthesize_resume(target_words: int, seed: int = 0) -> str:
+    """Build a resume of roughly target_words words from the sample template"""
+    rng = random.Random(seed)
+    with open(TEMPLATE_PATH, 'r', encoding='utf-8') as f:
+        lines = f.read().split('\n')
+    experience_at = next(i for i, line in enumerate(lines) if line.strip() == 'EXPERIENCE') + 1
+    head, tail = lines[:experience_at], lines[experience_at:]
+
+    body = []
+    words = sum(len(line.split()) for line in lines)
+    while words < target_words:
+        if rng.random() < 0.15:
+            entry = f"{rng.choice(['Analyst', 'Engineer', 'Researcher', 'Coordinator'])} | Company {rng.randint(1, 99)} | 20{rng.randint(10, 23)}"
+        else:
+            entry = '- ' + ' '.join([
+                rng.choice(BULLET_VERBS), rng.choice(BULLET_OBJECTS),
+                rng.choice(BULLET_RESULTS).format(n=rng.randint(2, 60))
+            ])
+        body.append(entry)
+        words += len(entry.split())
+    return '\n'.join(head + body + tail)
+
+
+def write_pdf(text: str, path: str, lines_per_page: int = 55):
+    """Write text as a minimal multi-page PDF (see pdf_fixture.pdf_bytes)"""
+    with open(path, 'wb') as f:
+        f.write(pdf_bytes(text, lines_per_page))
+
+
+def write_resume(text: str, file_format: str, directory: str, name: str = 'resume') -> str:
+    """Write text in the given format ('txt', 'docx' or 'pdf') and return the path"""
+    path = os.path.join(directory, f'{name}.{file_format}')
+    if file_format == 'txt':
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+    elif file_format == 'docx':
+        from docx import Document
+        doc = Document()
+        for line in text.split('\n'):
+            doc.add_paragraph(line)
+        doc.save(path)
+    elif file_format == 'pdf':
+        write_pdf(text, path)
+    else:
+        raise ValueError(f'Unsupported benchmark format: {file_format}')
+    return path
+
+
+def measure(fn: Callable, repeat: int, warmup: int = 2) -> List[float]:
+    """Wall-clock seconds for each of repeat calls of fn"""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def summarize(samples: List[float]) -> Dict:
+    """Latency percentiles (milliseconds) and throughput (calls per second)"""
+    ordered = sorted(samples)
+
+    def percentile(p):
+        return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))] * 1000
+
+    total = sum(ordered)
+    return {
+        'runs': len(ordered),
+        'mean_ms': round(total / len(ordered) * 1000, 4),
+        'p50_ms': round(percentile(50), 4),
+        'p99_ms': round(percentile(99), 4),
+        'throughput_per_s': round(len(ordered) / total, 2) if total else None,
+    }
+
+
+def import_seconds(module: str) -> float:
+    """Cumulative time to import module in a fresh interpreter, as reported by python -X importtime"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            capture_output=True, text=True, cwd=REPO_DIR, check=True)
+    for line in result.stderr.splitlines():
+        # 'import time: self [us] | cumulative | imported package'; top-level imports are indented once
+        parts = line.split('|')
+        if len(parts) == 3 and parts[2] == f' {module}':
+            return int(parts[1]) / 1e6
+    raise RuntimeError(f'No importtime entry for {module}')
+
+
+def run_startup_benchmarks(formats: List[str], repeat: int) -> Dict:
+    """Cold-start cost of the CLI: importing main, and one full run per file format in a new process"""
+    results = {'startup.import.main': summarize([import_seconds('main') for _ in range(repeat)])}
+    with tempfile.TemporaryDirectory() as directory:
+        text = synthesize_resume(300)
+        report_path = os.path.join(directory, 'report.txt')
+        for file_format in formats:
+            path = write_resume(text, file_format, directory)
+            command = [sys.executable, os.path.join(REPO_DIR, 'main.py'), path, '-o', report_path]
+            results[f'startup.cli.{file_format}'] = summarize(measure(
+                lambda: subprocess.run(command, capture_output=True, cwd=REPO_DIR), repeat, warmup=1))
+    return results
+
+
+def run_benchmarks(sizes: List[int], formats: List[str], repeat: int,
+                   faculty: str = 'engineering') -> Dict:
+    """Time every pipeline stage for each synthetic resume size and file format"""
+    parser = ResumeParser()
+    serial_parser = ResumeParser(parallel_pages=None)
+    analyzer = ResumeAnalyzer()
+    generator = FeedbackGenerator()
+    results = {}
+
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            text = synthesize_resume(size, seed=size)
+            for file_format in formats:
+                path = write_resume(text, file_format, directory, name=f'resume_{size}')
+                results[f'parse.{file_format}.{size}'] = summarize(measure(lambda: parser.parse(path), repeat))
+                if file_format == 'pdf':
+                    # Baseline for parallel page extraction, which the default parser uses on long PDFs
+                    results[f'parse.pdf.serial.{size}'] = summarize(measure(lambda: serial_parser.parse(path), repeat))
+
+            context = AnalysisContext(text, faculty, analyzer.keyword_matcher)
+            stages = {
+                'analyzer.context': lambda: AnalysisContext(text, faculty, analyzer.keyword_matcher),
+                'analyzer.analyze': lambda: analyzer.analyze(text, faculty=faculty),
+                'analyzer.get_faculty_score_adjustment': lambda: analyzer.get_faculty_score_adjustment(text, faculty),
+            }
+            for rule in analyzer.rules:
+                stages[f'analyzer.{rule.__name__}'] = lambda rule=rule: rule(context)
+            scorecard = analyzer.evaluate(text, faculty=faculty)
+            stages['feedback.generate_report'] = lambda: generator.generate_report(scorecard.issues, text, scorecard)
+
+            for name, fn in stages.items():
+                results[f'{name}.{size}'] = summarize(measure(fn, repeat))
+
+    return results
+
+
+def run_pdf_backend_checks(sizes: List[int], repeat: int) -> Dict:
+    """
+    Conformance and throughput of every installed PDF backend.
+
+    A backend conforms when ResumeAnalyzer raises the same issues on its
+    extracted text as on the text written into each PDF (the sample resume
+    and one synthetic resume per size). Throughput is pages per second at p50
+    on the largest document.
+    """
+    analyzer = ResumeAnalyzer()
+    checks = {}
+    with tempfile.TemporaryDirectory() as directory:
+        corpus = []
+        with open(TEMPLATE_PATH, 'r', encoding='utf-8') as f:
+            texts = {'sample': f.read()}
+        texts.update((f'{size} words', synthesize_resume(size, seed=size)) for size in sizes)
+        for label, text in texts.items():
+            path = write_resume(text, 'pdf', directory, name=label.replace(' ', '_'))
+            # The minimal PDF writer only has Latin-1 glyphs
+            written = text.encode('latin-1', 'replace').decode('latin-1')
+            pages = -(-len(text.split('\n')) // 55)
+            corpus.append((label, path, pages, [issue.rule_id for issue in analyzer.analyze(written)]))
+        largest = max(corpus, key=lambda entry: entry[2])
+
+        for backend in available_backends():
+            parser = ResumeParser(pdf_backend=backend)
+            mismatches = []
+            for label, path, _, expected in corpus:
+                found = [issue.rule_id for issue in analyzer.analyze(parser.parse(path))]
+                if found != expected:
+                    mismatches.append(f'{label}: expected {expected}, got {found}')
+            p50_ms = summarize(measure(lambda: parser.parse(largest[1]), repeat))['p50_ms']
+            checks[backend] = {
+                'conforms': not mismatches,
+                'mismatches': mismatches,
+                'pages': largest[2],
+                'pages_per_s': round(largest[2] / (p50_ms / 1000), 1),
+            }
+    return checks
+
+
+def environment() -> Dict:
+    """Where the numbers came from, so runs can be compared across commits"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, cwd=REPO_DIR).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+
+def compare(current: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """List benchmarks whose p50 latency grew by more than threshold (a fraction)"""
+    regressions = []
+    for name, stats in current.items():
+        before = baseline.get(name)
+        if not before or not before.get('p50_ms'):
+            continue
+        change = stats['p50_ms'] / before['p50_ms'] - 1
+        if change > threshold:
+            regressions.append(f"{name}: p50 {before['p50_ms']:.3f}ms -> {stats['p50_ms']:.3f}ms (+{change:.0%})")
+    return regressions
+
+
+@click.command()
+@click.option('--sizes', default='300,1000,5000', show_default=True, help='Comma-separated target word counts')
+@click.option('--formats', default='txt,docx,pdf', show_default=True, help='Comma-separated file formats to parse')
+@click.option('--repeat', type=int, default=50, show_default=True, help='Timed runs per benchmark')
+@click.option('--output', '-o', type=click.Path(), help='Write results as JSON')
+@click.option('--compare', 'baseline_path', type=click.Path(exists=True), help='Baseline JSON to compare against')
+@click.option('--threshold', type=float, default=0.2, show_default=True, help='Allowed p50 slowdown before failing')
+@click.option('--startup-repeat', type=int, default=10, show_default=True, help='Fresh processes per startup benchmark')
+@click.option('--startup-budget', type=float, default=None, help='Fail if importing main.py takes longer (p50 ms)')
+def main(sizes, formats, repeat, output, baseline_path, threshold, startup_repeat, startup_budget):
+    """Benchmark CLI startup, the parser, each analyzer rule and report generation."""
+    size_list = [int(size) for size in sizes.split(',')]
+    format_list = [fmt.strip() for fmt in formats.split(',') if fmt.strip()]
+    results = run_startup_benchmarks(format_list, startup_repeat)
+    results.update(run_benchmarks(size_list, format_list, repeat))
+    pdf_backends = run_pdf_backend_checks(size_list, repeat) if 'pdf' in format_list else {}
+
+    click.echo(f"{'benchmark':<55}{'p50 ms':>10}{'p99 ms':>10}{'per s':>12}")
+    for name, stats in results.items():
+        click.echo(f"{name:<55}{stats['p50_ms']:>10.3f}{stats['p99_ms']:>10.3f}{stats['throughput_per_s']:>12.1f}")
+
+    if pdf_backends:
+        click.echo(f"\n{'pdf backend':<20}{'conforms':>10}{'pages/s':>12}")
+        for backend, check in pdf_backends.items():
+            click.echo(f"{backend:<20}{'yes' if check['conforms'] else 'NO':>10}{check['pages_per_s']:>12.1f}")
+            for mismatch in check['mismatches']:
+                click.echo(f"  {mismatch}", err=True)
+
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump({'environment': environment(), 'results': results, 'pdf_backends': pdf_backends}, f, indent=2)
+        click.echo(f"\nResults saved to: {output}")
+
+    if any(not check['conforms'] for check in pdf_backends.values()):
+        click.echo("\nA PDF backend's text changes the analysis; see mismatches above", err=True)
+        sys.exit(1)
+
+    if baseline_path:
+        with open(baseline_path, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, threshold)
+        if regressions:
+            click.echo(f"\n{len(regressions)} regression(s) above {threshold:.0%}:", err=True)
+            for line in regressions:
+                click.echo(f"  {line}", err=True)
+            sys.exit(1)
+        click.echo(f"\nNo regressions above {threshold:.0%} against {baseline_path}")
+
+    if startup_budget is not None:
+        import_ms = results['startup.import.main']['p50_ms']
+        if import_ms > startup_budget:
+            click.echo(f"\nStartup over budget: importing main takes {import_ms:.1f}ms (budget {startup_budget:g}ms)", err=True)
+            sys.exit(1)
+        click.echo(f"\nStartup within budget: importing main takes {import_ms:.1f}ms (budget {startup_budget:g}ms)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,368 @@
+"""
+Cohort Ranker - Ranks a pool of resumes against many job postings in one pass
+"""
+import heapq
+import importlib.util
+import json
+import os
+from dataclasses import dataclass, field
+from itertools import chain
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from job_matcher import STOP_WORDS, TOKEN_PATTERN, JobIndex
+from resume_analyzer import ResumeAnalyzer
+
+RANKING_BACKENDS = ('scipy', 'python')
+
+# Resumes and postings listed per posting and per resume
+DEFAULT_TOP_K = 10
+
+
+def resolve_backend(name: Optional[str] = 'auto') -> str:
+    """
+    Turn a configured backend name into the one to use.
+
+    'auto' (or None) picks 'scipy' (a sparse matrix product) when NumPy and
+    SciPy are installed and the pure Python inverted index otherwise.
+    """
+    name = (name or 'auto').lower()
+    scipy_installed = all(importlib.util.find_spec(module) is not None for module in ('numpy', 'scipy'))
+    if name == 'auto':
+        return 'scipy' if scipy_installed else 'python'
+    if name not in RANKING_BACKENDS:
+        raise ValueError(f"Unknown ranking backend: {name}. Choose from: auto, {', '.join(RANKING_BACKENDS)}")
+    if name == 'scipy' and not scipy_installed:
+        raise ImportError("NumPy and SciPy are required for the 'scipy' ranking backend. "
+                          "Install them with: pip install numpy scipy")
+    return name
+
+
+def faculty_postings(analyzer: Optional[ResumeAnalyzer] = None) -> List[JobIndex]:
+    """The analyzer's faculty keyword lists as built-in postings (ids 'faculty:<name>'), equally weighted"""
+    analyzer = analyzer or ResumeAnalyzer()
+    postings = []
+    for faculty, keywords in analyzer.faculty_keywords.items():
+        terms = list(dict.fromkeys(keyword.lower() for keyword in keywords))
+        postings.append(JobIndex(f'faculty:{faculty}', f'{faculty.title()} faculty keywords',
+                                 {term: 1 / len(terms) for term in terms}))
+    return postings
+
+
+@dataclass
+class CohortRanking:
+    """Best resumes for each posting and best postings for each resume, by weighted coverage"""
+    top_k: int
+    # posting_id -> [(resume_id, coverage percent)], best first; resumes covering nothing are left out
+    by_posting: Dict[str, List[Tuple[str, int]]] = field(default_factory=dict)
+    # resume_id -> [(posting_id, coverage percent)], best first
+    by_resume: Dict[str, List[Tuple[str, int]]] = field(default_factory=dict)
+    # resume_id -> error, for resumes that could not be read
+    errors: Dict[str, str] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict:
+        return {
+            'top_k': self.top_k,
+            'postings': {posting_id: [{'resume': resume_id, 'coverage': coverage} for resume_id, coverage in ranked]
+                         for posting_id, ranked in self.by_posting.items()},
+            'resumes': {resume_id: [{'posting': posting_id, 'coverage': coverage} for posting_id, coverage in ranked]
+                        for resume_id, ranked in self.by_resume.items()},
+            'errors': self.errors,
+        }
+
+
+class CohortRanker:
+    """
+    Scores every resume against every posting as one resume x term by term x posting product.
+
+    The columns are the union of the postings' weighted terms. Each resume is
+    tokenized once into the columns it contains (a sparse row), so a pool of N
+    resumes costs N tokenizations, not N x M scans, and the scores are one
+    sparse matrix product. A resume's score for a posting is the posting's
+    term weight it covers, the same coverage JobIndex.match reports.
+    """
+
+    def __init__(self, postings: Sequence[JobIndex], backend: Optional[str] = 'auto'):
+        if not postings:
+            raise ValueError('At least one posting is required')
+        self.postings = list(postings)
+        self.backend = resolve_backend(backend)
+        self.vocabulary: Dict[str, int] = {}
+        for posting in self.postings:
+            for term in posting.weights:
+                self.vocabulary.setdefault(term, len(self.vocabulary))
+        # Inverted index: column -> [(posting position, weight)]
+        self._postings_of: List[List[Tuple[int, float]]] = [[] for _ in self.vocabulary]
+        for position, posting in enumerate(self.postings):
+            for term, weight in posting.weights.items():
+                self._postings_of[self.vocabulary[term]].append((position, weight))
+        # First words of two-word terms: only pairs starting with one are looked up
+        self._phrase_starts = {term.split(' ', 1)[0] for term in self.vocabulary if ' ' in term}
+
+    def columns(self, resume_text: str) -> List[int]:
+        """
+        Sorted columns of the posting terms found in a resume: its row of the matrix.
+
+        Finds the terms job_matcher.term_set would, but only builds the
+        two-word phrases that start with the first word of a posting phrase.
+        """
+        vocabulary = self.vocabulary
+        tokens = TOKEN_PATTERN.findall(resume_text.lower())
+        found = {vocabulary[token] for token in set(tokens).intersection(vocabulary) if _is_content(token)}
+        phrase_starts = self._phrase_starts
+        if phrase_starts and not phrase_starts.isdisjoint(tokens):
+            pairs = {pair for pair in zip(tokens, tokens[1:]) if pair[0] in phrase_starts}
+            for first, second in pairs:
+                phrase = f'{first} {second}'
+                if phrase in vocabulary and _is_content(first) and _is_content(second):
+                    found.add(vocabulary[phrase])
+        return sorted(found)
+
+    def rank_texts(self, resume_texts: Dict[str, str], top_k: int = DEFAULT_TOP_K) -> CohortRanking:
+        """Rank resume texts keyed by resume id"""
+        return self.rank(((resume_id, self.columns(text)) for resume_id, text in resume_texts.items()), top_k)
+
+    def rank(self, rows: Iterable[Tuple[str, List[int]]], top_k: int = DEFAULT_TOP_K) -> CohortRanking:
+        """Rank resumes given as (resume_id, columns) rows (see columns)"""
+        if top_k < 1:
+            raise ValueError('top_k must be at least 1')
+        resume_ids = []
+        row_columns = []
+        for resume_id, columns in rows:
+            resume_ids.append(resume_id)
+            row_columns.append(columns)
+        if self.backend == 'scipy':
+            by_posting, by_resume = self._rank_scipy(row_columns, top_k)
+        else:
+            by_posting, by_resume = self._rank_python(row_columns, top_k)
+
+        posting_ids = [posting.posting_id for posting in self.postings]
+        ranking = CohortRanking(top_k)
+        for position, ranked in enumerate(by_posting):
+            ranking.by_posting[posting_ids[position]] = [(resume_ids[row], coverage) for row, coverage in ranked]
+        for row, ranked in enumerate(by_resume):
+            ranking.by_resume[resume_ids[row]] = [(posting_ids[position], coverage) for position, coverage in ranked]
+        return ranking
+
+    def _rank_python(self, row_columns: List[List[int]], top_k: int):
+        """Accumulate each resume's scores through the inverted index; keep a bounded heap per posting"""
+        posting_count = len(self.postings)
+        postings_of = self._postings_of
+        heaps: List[List[Tuple[float, int]]] = [[] for _ in range(posting_count)]
+        by_resume = []
+        for row, columns in enumerate(row_columns):
+            scores: Dict[int, float] = {}
+            for column in columns:
+                for position, weight in postings_of[column]:
+                    scores[position] = scores.get(position, 0.0) + weight
+            for position, score in scores.items():
+                # Ties keep the earlier resume: -row ranks it higher
+                entry = (score, -row)
+                heap = heaps[position]
+                if len(heap) < top_k:
+                    heapq.heappush(heap, entry)
+                elif entry > heap[0]:
+                    heapq.heapreplace(heap, entry)
+            best = heapq.nsmallest(top_k, scores.items(), key=lambda item: (-item[1], item[0]))
+            by_resume.append([(position, _percent(score)) for position, score in best])
+        by_posting = [[(-negative_row, _percent(score)) for score, negative_row in sorted(heap, reverse=True)]
+                      for heap in heaps]
+        return by_posting, by_resume
+
+    def _rank_scipy(self, row_columns: List[List[int]], top_k: int):
+        """One CSR (resumes x terms) times dense (terms x postings) product, then top-k along each axis"""
+        import numpy as np
+        from scipy.sparse import csr_matrix
+
+        row_lengths = np.fromiter(map(len, row_columns), dtype=np.int64, count=len(row_columns))
+        indptr = np.zeros(len(row_columns) + 1, dtype=np.int64)
+        np.cumsum(row_lengths, out=indptr[1:])
+        indices = np.fromiter(chain.from_iterable(row_columns), dtype=np.int64, count=int(indptr[-1]))
+        matrix = csr_matrix((np.ones(len(indices)), indices, indptr),
+                            shape=(len(row_columns), len(self.vocabulary)))
+
+        weights = np.zeros((len(self.vocabulary), len(self.postings)))
+        for column, entries in enumerate(self._postings_of):
+            for position, weight in entries:
+                weights[column, position] = weight
+        scores = np.asarray(matrix @ weights)
+
+        return _top_k(scores.T, top_k), _top_k(scores, top_k)
+
+
+def _top_k(scores, top_k: int) -> List[List[Tuple[int, int]]]:
+    """
+    For each row of a score matrix, the columns of its top_k non-zero scores
+    as (column, coverage percent), best first, ties to the lower column.
+
+    A partition finds each row's k-th best score; only scores at or above it
+    are sorted, so the cost stays linear in the matrix size.
+    """
+    import numpy as np
+
+    row_count, column_count = scores.shape
+    if not row_count or not column_count:
+        return [[] for _ in range(row_count)]
+    if top_k < column_count:
+        threshold = np.partition(scores, column_count - top_k, axis=1)[:, column_count - top_k]
+        keep = (scores >= threshold[:, None]) & (scores > 0)
+    else:
+        keep = scores > 0
+    rows, columns = np.nonzero(keep)
+    values = scores[rows, columns]
+    # Row-major: by row, then best score, then lower column
+    order = np.lexsort((columns, -values, rows))
+    rows, columns, values = rows[order], columns[order], values[order]
+    # Ties at the threshold can leave more than top_k per row; keep each row's first top_k
+    row_starts = np.searchsorted(rows, np.arange(row_count))
+    first = np.arange(len(rows)) - row_starts[rows] < top_k
+    rows, columns = rows[first], columns[first]
+    percents = np.rint(values[first] * 100).astype(np.int64)
+
+    ranked = [[] for _ in range(row_count)]
+    for row, column, percent in zip(rows.tolist(), columns.tolist(), percents.tolist()):
+        ranked[row].append((column, percent))
+    return ranked
+
+
+def _is_content(token: str) -> bool:
+    """Whether job_matcher.tokenize keeps a token as a term rather than a phrase break"""
+    return token not in STOP_WORDS and not token.isdigit()
+
+
+def _percent(score: float) -> int:
+    return round(score * 100)
+
+
+# Parser and vocabulary owned by a pool worker process, set by _init_worker
+_worker_parser = None
+_worker_ranker = None
+
+
+def _init_worker(ranker: CohortRanker, parse_cache_path: Optional[str] = None,
+                 parser_options: Optional[Dict] = None):
+    global _worker_parser, _worker_ranker
+    from parse_cache import ParseCache
+    from resume_parser import ResumeParser
+    cache = ParseCache(parse_cache_path) if parse_cache_path else None
+    _worker_parser = ResumeParser(cache=cache, **(parser_options or {}))
+    _worker_ranker = ranker
+
+
+def _read_row(path: str) -> Tuple[str, Optional[List[int]], Optional[str]]:
+    """Parse one file and return its row; errors are reported, not raised"""
+    try:
+        text = _worker_parser.parse(path)
+    except Exception as e:
+        return path, None, str(e)
+    if not text or not text.strip():
+        return path, None, 'Could not extract meaningful content from resume file.'
+    return path, _worker_ranker.columns(text), None
+
+
+def read_rows(ranker: CohortRanker, paths: Sequence[str], workers: Optional[int] = None, chunksize: int = 32,
+              parse_cache_path: Optional[str] = None,
+              parser_options: Optional[Dict] = None) -> Iterator[Tuple[str, Optional[List[int]], Optional[str]]]:
+    """
+    Parse resume files across a process pool into (path, columns, error) rows, in input order.
+
+    Workers send back only the columns of each resume, not its text. With
+    parse_cache_path, text already extracted (e.g. by parse_cache.py warm or
+    an earlier batch) is reused instead of decoding the files again.
+    """
+    # Files already keep every core busy, so long PDFs are not split across pages too
+    parser_options = dict(parser_options or {}, parallel_pages=None)
+    if workers == 1:
+        _init_worker(ranker, parse_cache_path, parser_options)
+        yield from map(_read_row, paths)
+        return
+
+    from multiprocessing import Pool
+    if parse_cache_path:
+        from parse_cache import ParseCache
+        ParseCache(parse_cache_path)  # create the schema before workers race to do it
+    with Pool(workers, initializer=_init_worker, initargs=(ranker, parse_cache_path, parser_options)) as pool:
+        yield from pool.imap(_read_row, paths, chunksize)
+
+
+def rank_files(postings: Sequence[JobIndex], paths: Sequence[str], top_k: int = DEFAULT_TOP_K,
+               workers: Optional[int] = None, parse_cache_path: Optional[str] = None,
+               parser_options: Optional[Dict] = None, backend: Optional[str] = 'auto') -> CohortRanking:
+    """Rank resume files against postings; unreadable files are listed in CohortRanking.errors"""
+    ranker = CohortRanker(postings, backend)
+    errors = {}
+    rows = []
+    for path, columns, error in read_rows(ranker, paths, workers, parse_cache_path=parse_cache_path,
+                                          parser_options=parser_options):
+        if error:
+            errors[path] = error
+        else:
+            rows.append((path, columns))
+    ranking = ranker.rank(rows, top_k)
+    ranking.errors = errors
+    return ranking
+
+
+def cli():
+    """Command-line entry point: python cohort_ranker.py RESUMES... --job FILE ... [--faculties]"""
+    import click
+
+    @click.command()
+    @click.argument('inputs', nargs=-1, required=True)
+    @click.option('--job', 'job_paths', multiple=True, type=click.Path(exists=True, dir_okay=False),
+                  help='Job description file (repeatable)')
+    @click.option('--faculties', is_flag=True, help='Also rank against the built-in faculty keyword postings')
+    @click.option('--top', 'top_k', type=int, default=DEFAULT_TOP_K, show_default=True,
+                  help='Resumes listed per posting and postings per resume')
+    @click.option('--output', '-o', type=click.Path(), help='Save the ranking (JSON) to file')
+    @click.option('--workers', '-w', type=int, default=None, help='Worker processes (default: CPU count)')
+    @click.option('--parse-cache', 'parse_cache_path', type=click.Path(dir_okay=False),
+                  help='Reuse extracted text from this sqlite file')
+    @click.option('--backend', type=click.Choice(('auto',) + RANKING_BACKENDS), default='auto', show_default=True,
+                  help='Scoring backend; auto uses SciPy when installed')
+    def rank(inputs, job_paths, faculties, top_k, output, workers, parse_cache_path, backend):
+        """Rank the resumes in INPUTS (files, directories or globs) against job postings."""
+        from batch_analyzer import collect_resume_files
+        from job_matcher import PostingStore
+        from resume_parser import ResumeParser
+
+        if not job_paths and not faculties:
+            raise click.UsageError('Give at least one --job file or --faculties')
+        # Indexed together, so terms common to every posting weigh less
+        store = PostingStore()
+        parser = ResumeParser()
+        postings = []
+        for job_path in job_paths:
+            try:
+                text = parser.parse(job_path)
+            except ValueError as e:
+                raise click.ClickException(f'{job_path}: {e}')
+            postings.append(store.add(text, title=os.path.basename(job_path)))
+        if faculties:
+            postings.extend(faculty_postings())
+
+        paths = collect_resume_files(inputs)
+        if not paths:
+            raise click.ClickException('No resume files found.')
+        try:
+            ranker_backend = resolve_backend(backend)
+        except ImportError as e:
+            raise click.ClickException(str(e))
+        click.echo(f"Ranking {len(paths)} resume(s) against {len(postings)} posting(s)...", err=True)
+        ranking = rank_files(postings, paths, top_k, workers, parse_cache_path, backend=ranker_backend)
+
+        result = ranking.to_dict()
+        result['titles'] = {posting.posting_id: posting.title for posting in postings}
+        if output:
+            with open(output, 'w', encoding='utf-8') as f:
+                json.dump(result, f, indent=2)
+            click.echo(f"Ranking saved to: {output}", err=True)
+        else:
+            click.echo(json.dumps(result, indent=2))
+        for path, error in ranking.errors.items():
+            click.echo(f"Error: {path}: {error}", err=True)
+
+    rank()
+
+
+if __name__ == '__main__':
+    cli()
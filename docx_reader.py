@@ -0,0 +1,106 @@
+"""
+DOCX Reader - Streams paragraph text straight from a .docx package
+"""
+import re
+import zipfile
+from typing import BinaryIO, Iterator, List
+from xml.etree.ElementTree import iterparse
+
+# Transitional and Strict OOXML namespaces for WordprocessingML
+_WORD_NAMESPACES = (
+    'http://schemas.openxmlformats.org/wordprocessingml/2006/main',
+    'http://purl.oclc.org/ooxml/wordprocessingml/main',
+)
+_MC_FALLBACK = '{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback'
+
+
+def _tags(name: str) -> frozenset:
+    return frozenset(f'{{{namespace}}}{name}' for namespace in _WORD_NAMESPACES)
+
+
+_PARAGRAPH = _tags('p')
+_RUN = _tags('r')
+_TEXT = _tags('t')
+_TAB = _tags('tab')
+_BREAK = _tags('br') | _tags('cr')
+_TABLE = _tags('tbl')
+_HYPHEN = _tags('noBreakHyphen')
+_BREAK_TYPE = {f'{{{namespace}}}type' for namespace in _WORD_NAMESPACES}
+
+_HEADER_PART = re.compile(r'word/header\d*\.xml$')
+_FOOTER_PART = re.compile(r'word/footer\d*\.xml$')
+
+
+def iter_docx_paragraphs(fileobj: BinaryIO) -> Iterator[str]:
+    """
+    Yield the text of every paragraph in reading order.
+
+    Headers come first (contact details often live there), then the body,
+    including table cells row by row and text boxes, then footers. A header
+    part identical to an earlier header part (the copy each section carries)
+    is skipped, and likewise for footers; within a part every paragraph,
+    repeated or empty, is kept.
+    """
+    with zipfile.ZipFile(fileobj) as package:
+        names = package.namelist()
+        seen_headers, seen_footers = set(), set()
+        for name in sorted(n for n in names if _HEADER_PART.match(n)):
+            yield from _unique_part(package, name, seen_headers)
+        yield from _iter_part(package, 'word/document.xml')
+        for name in sorted(n for n in names if _FOOTER_PART.match(n)):
+            yield from _unique_part(package, name, seen_footers)
+
+
+def _unique_part(package: zipfile.ZipFile, name: str, seen: set) -> List[str]:
+    """The paragraphs of a header or footer part, or none if an identical part came before"""
+    paragraphs = tuple(_iter_part(package, name))
+    if paragraphs in seen:
+        return []
+    seen.add(paragraphs)
+    return list(paragraphs)
+
+
+def _iter_part(package: zipfile.ZipFile, name: str) -> Iterator[str]:
+    """Incrementally parse one XML part, yielding each paragraph as it closes"""
+    # One buffer per open paragraph; text boxes nest paragraphs inside paragraphs
+    buffers: List[List[str]] = []
+    run_depth = 0
+    fallback_depth = 0
+    with package.open(name) as part:
+        for event, element in iterparse(part, events=('start', 'end')):
+            tag = element.tag
+            if event == 'start':
+                if tag in _PARAGRAPH:
+                    buffers.append([])
+                elif tag in _RUN:
+                    run_depth += 1
+                elif tag == _MC_FALLBACK:
+                    # Legacy copy of content already read from mc:Choice
+                    fallback_depth += 1
+                continue
+
+            if tag == _MC_FALLBACK:
+                fallback_depth -= 1
+            elif fallback_depth or not buffers:
+                pass
+            elif tag in _TEXT:
+                buffers[-1].append(element.text or '')
+            elif tag in _TAB and run_depth:
+                buffers[-1].append('\t')
+            elif tag in _BREAK and run_depth:
+                break_type = next((element.get(key) for key in _BREAK_TYPE if element.get(key)), None)
+                if break_type not in ('page', 'column'):
+                    buffers[-1].append('\n')
+            elif tag in _HYPHEN:
+                buffers[-1].append('-')
+
+            if tag in _RUN:
+                run_depth -= 1
+            elif tag in _PARAGRAPH:
+                text = ''.join(buffers.pop())
+                if not fallback_depth:
+                    yield text
+                if not buffers:
+                    element.clear()
+            elif tag in _TABLE and not buffers:
+                element.clear()
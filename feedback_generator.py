@@ -1,31 +1,55 @@
 """
 Feedback Generator - Creates formatted feedback reports
 """
-from typing import List
+from typing import List, Optional
 from resume_analyzer import Issue
-from colorama import Fore, Style, init
+from scoring import ScoreCard
 
-# Initialize colorama for Windows
-init(autoreset=True)
+# Escape codes for a report without colour
+NO_COLORS = {'critical': '', 'warning': '', 'suggestion': '', 'success': '', 'reset': ''}
+
+_colorama_initialized = False
+
+
+def _ansi_colors():
+    """ANSI codes from colorama, initialized (stdout wrapped for Windows) on first use"""
+    global _colorama_initialized
+    from colorama import Fore, Style, init
+    if not _colorama_initialized:
+        init(autoreset=True)
+        _colorama_initialized = True
+    return {
+        'critical': Fore.RED,
+        'warning': Fore.YELLOW,
+        'suggestion': Fore.CYAN,
+        'success': Fore.GREEN,
+        'reset': Style.RESET_ALL
+    }
 
 
 class FeedbackGenerator:
     """Generates formatted feedback reports from analysis issues"""
     
-    def __init__(self):
+    def __init__(self, color: bool = True):
+        """
+        Args:
+            color: Add ANSI colours to reports. When False colorama is never imported.
+        """
+        self.colors = _ansi_colors() if color else NO_COLORS
         self.severity_colors = {
-            'critical': Fore.RED,
-            'warning': Fore.YELLOW,
-            'suggestion': Fore.CYAN
+            severity: self.colors[severity] for severity in ('critical', 'warning', 'suggestion')
         }
     
-    def generate_report(self, issues: List[Issue], resume_text: str = None) -> str:
+    def generate_report(self, issues: List[Issue], resume_text: Optional[str],
+                        scorecard: ScoreCard) -> str:
         """
         Generate a formatted feedback report
         
         Args:
             issues: List of Issue objects from analysis
             resume_text: Optional resume text for statistics
+            scorecard: ScoreCard from ResumeAnalyzer.evaluate, so the report shows
+                       the same score as the JSON API, faculty adjustment included
             
         Returns:
             Formatted report string
@@ -34,9 +58,12 @@ class FeedbackGenerator:
             return self._generate_success_report()
         
         # Group issues by severity
-        critical_issues = [i for i in issues if i.severity == 'critical']
-        warning_issues = [i for i in issues if i.severity == 'warning']
-        suggestion_issues = [i for i in issues if i.severity == 'suggestion']
+        by_severity = {'critical': [], 'warning': [], 'suggestion': []}
+        for issue in issues:
+            by_severity.setdefault(issue.severity, []).append(issue)
+        critical_issues = by_severity['critical']
+        warning_issues = by_severity['warning']
+        suggestion_issues = by_severity['suggestion']
         
         report = []
         report.append("\n" + "=" * 70)
@@ -54,9 +81,9 @@ class FeedbackGenerator:
         
         # Issue summary
         report.append("Issue Summary:")
-        report.append(f"  {Fore.RED}• Critical issues: {len(critical_issues)}")
-        report.append(f"  {Fore.YELLOW}• Warnings: {len(warning_issues)}")
-        report.append(f"  {Fore.CYAN}• Suggestions: {len(suggestion_issues)}")
+        report.append(f"  {self.colors['critical']}• Critical issues: {scorecard.critical}")
+        report.append(f"  {self.colors['warning']}• Warnings: {scorecard.warnings}")
+        report.append(f"  {self.colors['suggestion']}• Suggestions: {scorecard.suggestions}")
         report.append("")
         
         # Critical issues
@@ -86,13 +113,12 @@ class FeedbackGenerator:
             report.append(f"\n{category.upper()}:")
             for issue in category_issues:
                 color = self.severity_colors.get(issue.severity, '')
-                report.append(f"  {color}[{issue.severity.upper()}]{Style.RESET_ALL} {issue.message}")
+                report.append(f"  {color}[{issue.severity.upper()}]{self.colors['reset']} {issue.message}")
                 report.append(f"    → {issue.suggestion}")
         
         # Overall score
         report.append("\n" + "=" * 70)
-        score = self._calculate_score(issues)
-        report.append(f"OVERALL SCORE: {score}/100")
+        report.append(f"OVERALL SCORE: {scorecard.score}/100")
         report.append("=" * 70 + "\n")
         
         return "\n".join(report)
@@ -101,7 +127,7 @@ class FeedbackGenerator:
         """Format a section of issues"""
         section = []
         color = self.severity_colors.get(severity, '')
-        section.append(f"\n{color}{title}{Style.RESET_ALL}")
+        section.append(f"\n{color}{title}{self.colors['reset']}")
         section.append("-" * 70)
         
         for idx, issue in enumerate(issues, 1):
@@ -111,41 +137,27 @@ class FeedbackGenerator:
         
         return "\n".join(section)
     
-    def _calculate_score(self, issues: List[Issue]) -> int:
-        """Calculate an overall score out of 100"""
-        base_score = 100
-        
-        # Deduct points based on severity
-        for issue in issues:
-            if issue.severity == 'critical':
-                base_score -= 10
-            elif issue.severity == 'warning':
-                base_score -= 5
-            elif issue.severity == 'suggestion':
-                base_score -= 2
-        
-        # Ensure score doesn't go below 0
-        return max(0, base_score)
-    
     def _generate_success_report(self) -> str:
         """Generate a report when no issues are found"""
         report = []
         report.append("\n" + "=" * 70)
         report.append("RESUME ANALYSIS REPORT")
         report.append("=" * 70 + "\n")
-        report.append(f"{Fore.GREEN}✓ Excellent! No major issues found.{Style.RESET_ALL}\n")
+        report.append(f"{self.colors['success']}✓ Excellent! No major issues found.{self.colors['reset']}\n")
         report.append("Your resume looks good! Keep up the great work.")
         report.append("=" * 70 + "\n")
         return "\n".join(report)
     
-    def generate_summary(self, issues: List[Issue]) -> str:
+    def generate_summary(self, issues: List[Issue], scorecard: Optional[ScoreCard] = None) -> str:
         """Generate a brief summary of issues"""
         if not issues:
             return "No issues found. Resume looks good!"
         
-        critical = len([i for i in issues if i.severity == 'critical'])
-        warnings = len([i for i in issues if i.severity == 'warning'])
-        suggestions = len([i for i in issues if i.severity == 'suggestion'])
+        if scorecard is None:
+            scorecard = ScoreCard.from_issues(issues)
+        critical = scorecard.critical
+        warnings = scorecard.warnings
+        suggestions = scorecard.suggestions
         
         summary = f"Found {len(issues)} issue(s): "
         parts = []
@@ -0,0 +1,40 @@
+"""
+Gunicorn settings - run with: gunicorn app:app
+
+With preload (the default) the app module, the document libraries, compiled
+patterns, keyword automaton and analyzer/generator singletons are loaded and
+warmed once in the master; forked workers share them copy-on-write. Set
+GUNICORN_PRELOAD=0 to load and warm the app in each worker instead.
+"""
+import gc
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+# The app divides its PDF page workers between the web workers
+os.environ.setdefault('WEB_CONCURRENCY', str(workers))
+preload_app = os.environ.get('GUNICORN_PRELOAD', '1') not in ('0', 'false')
+# Seconds a request may run; POST /analyze/batch streams for as long as its batch takes
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+
+
+def on_starting(server):
+    if server.cfg.preload_app:
+        import app
+        app.warm_up()
+        # Move everything built so far out of the collector's reach, so garbage
+        # collection in the workers does not write to (and copy) the shared pages
+        gc.freeze()
+
+
+def post_fork(server, worker):
+    if server.cfg.preload_app:
+        import app
+        app.reopen_after_fork()
+
+
+def post_worker_init(worker):
+    # Without preload each worker has just imported the app; warm it before it accepts requests
+    if not worker.cfg.preload_app:
+        import app
+        app.warm_up()
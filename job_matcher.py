@@ -0,0 +1,262 @@
+"""
+Job Matcher - Weighted term index of a job description, matched against resumes
+"""
+import hashlib
+import json
+import math
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from resume_analyzer import Issue
+
+# Bump when tokenization or weighting changes; it is part of every posting id,
+# so results cached against an older index are not reused
+MATCHER_VERSION = '2'
+
+# Words, keeping tech spellings whole: c++, c#, node.js, ci/cd, scikit-learn
+TOKEN_PATTERN = re.compile(r'[a-z0-9][a-z0-9+#]*(?:[./\-][a-z0-9+#]+)*')
+
+# Function words and contraction pieces (you'll, team's), plus job-ad boilerplate that says nothing about the role
+STOP_WORDS = frozenset('''
+a about above after all also an and any are as at be been being both but by can could did do does
+each etc for from had has have having he her here his how i if in into is it its may me more most
+must my no nor not of on or other our out over own per she should so some such than that the their
+them then there these they this those through to too under until up us very was we were what when
+where which while who whom why will with within would you your
+d ll m re s t ve
+ability able across apply benefits bonus candidate candidates company day deliver demonstrated desired
+duties ensure environment equal excellent experience familiarity good great help highly hire hiring ideal
+ideally include includes including job join knowledge least looking minimum need needed needs new nice
+opportunity plus position preferably preferred proven qualifications related required requirements
+responsibilities responsible role seek seeking skills strong successful team teams understanding using
+want wants well work working year years
+'''.split())
+
+# Terms kept per posting, and how many missing ones an issue lists
+MAX_TERMS = 20
+MAX_LISTED = 8
+# Weighted coverage (percent) below which a resume is a poor match, and below which terms are suggested
+LOW_MATCH = 50
+GOOD_MATCH = 80
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased content words of a text, in order, with stop words kept as phrase breaks (None)"""
+    tokens = []
+    for token in TOKEN_PATTERN.findall(text.lower()):
+        if token in STOP_WORDS or token.isdigit():
+            tokens.append(None)
+        else:
+            tokens.append(token)
+    return tokens
+
+
+def count_terms(text: str) -> Tuple[Counter, Counter]:
+    """Occurrences of each word and of each two-word phrase not broken by a stop word"""
+    tokens = tokenize(text)
+    words = Counter(token for token in tokens if token)
+    phrases = Counter(f'{first} {second}' for first, second in zip(tokens, tokens[1:]) if first and second)
+    return words, phrases
+
+
+def term_set(text: str) -> Set[str]:
+    """Every word and two-word phrase of a text, for matching against a posting's terms"""
+    words, phrases = count_terms(text)
+    return set(words) | set(phrases)
+
+
+@dataclass
+class JobMatch:
+    """How well one resume covers a posting's weighted terms"""
+    posting_id: str
+    coverage: int  # percent of the posting's term weight found in the resume
+    matched: List[str] = field(default_factory=list)  # heaviest first
+    missing: List[str] = field(default_factory=list)  # heaviest first
+
+    def issues(self) -> List[Issue]:
+        """Keyword issues for missing posting terms (none when the resume covers the posting well)"""
+        if self.coverage >= GOOD_MATCH or not self.missing:
+            return []
+        params = {
+            'coverage': self.coverage,
+            'missing': ', '.join(self.missing[:MAX_LISTED]),
+            'matched': ', '.join(self.matched[:MAX_LISTED]),
+        }
+        rule_id = 'job_low_match' if self.coverage < LOW_MATCH else 'job_missing_terms'
+        return [Issue(rule_id, params)]
+
+    def to_dict(self) -> Dict:
+        return {'posting_id': self.posting_id, 'coverage': self.coverage,
+                'matched': self.matched, 'missing': self.missing}
+
+
+@dataclass
+class JobIndex:
+    """The weighted terms of one job posting, built once and matched against any number of resumes"""
+    posting_id: str
+    title: str
+    weights: Dict[str, float]  # term -> weight, heaviest first, summing to 1
+
+    def match(self, resume_terms: Set[str]) -> JobMatch:
+        """Match a resume given as its term_set()"""
+        matched = [term for term in self.weights if term in resume_terms]
+        missing = [term for term in self.weights if term not in resume_terms]
+        covered = sum(self.weights[term] for term in matched)
+        return JobMatch(self.posting_id, round(covered * 100), matched, missing)
+
+    def match_text(self, resume_text: str) -> JobMatch:
+        return self.match(term_set(resume_text))
+
+    def match_many(self, resume_texts: Iterable[str]) -> List[JobMatch]:
+        """
+        Match many resumes, one at a time: each costs one tokenization plus a lookup per posting term.
+
+        Not vectorized; cohort_ranker scores many resumes against many postings as one sparse product.
+        """
+        return [self.match(term_set(text)) for text in resume_texts]
+
+    def to_dict(self) -> Dict:
+        return {'posting_id': self.posting_id, 'title': self.title,
+                'terms': [{'term': term, 'weight': weight} for term, weight in self.weights.items()]}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'JobIndex':
+        return cls(data['posting_id'], data.get('title', ''),
+                   {entry['term']: entry['weight'] for entry in data['terms']})
+
+
+def posting_id_for(text: str, title: str = '') -> str:
+    """Stable id of a posting: the same text and title always get the same id"""
+    digest = hashlib.sha256(f'{MATCHER_VERSION}\0{title}\0{text}'.encode('utf-8')).hexdigest()
+    return digest[:16]
+
+
+def build_job_index(text: str, title: str = '', document_frequencies: Optional[Counter] = None,
+                    posting_count: int = 0, max_terms: int = MAX_TERMS) -> JobIndex:
+    """
+    Weight a posting's words and repeated phrases TF-IDF style and keep the heaviest.
+
+    Term frequency is damped (1 + log tf). Inverse document frequency comes from
+    the other postings seen so far (document_frequencies over posting_count
+    postings), so terms every posting uses count for less; with no other
+    postings every term has the same IDF. Phrases count only when they occur
+    at least twice.
+    """
+    words, phrases = count_terms(text)
+    counts = dict(words)
+    counts.update((phrase, count) for phrase, count in phrases.items() if count >= 2)
+    document_frequencies = document_frequencies or Counter()
+
+    scored = []
+    for position, (term, count) in enumerate(counts.items()):
+        idf = math.log((1 + posting_count + 1) / (1 + document_frequencies.get(term, 0) + 1)) + 1
+        scored.append((-(1 + math.log(count)) * idf, position, term))
+    scored.sort()
+    kept = [(term, -score) for score, _, term in scored[:max_terms]]
+    total = sum(weight for _, weight in kept) or 1
+    weights = {term: weight / total for term, weight in kept}
+    return JobIndex(posting_id_for(text, title), title, weights)
+
+
+class PostingStore:
+    """
+    Job postings indexed once and kept by id, in memory and optionally in a sqlite file.
+
+    Document frequencies over every stored posting feed the IDF of postings
+    added later. With a sqlite file, a posting's weights are computed once,
+    against every posting stored before it, and every process reads those
+    stored weights; postings added by one process are found by the others on
+    lookup.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._postings: Dict[str, JobIndex] = {}
+        self._document_frequencies: Counter = Counter()
+        self._db = None
+        self._last_rowid = 0  # stored postings up to this row are in _postings
+        if path:
+            self._connect()
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS postings ('
+                'posting_id TEXT PRIMARY KEY, title TEXT NOT NULL, text TEXT NOT NULL, '
+                'job_index TEXT NOT NULL, created_at REAL NOT NULL)'
+            )
+            self._db.commit()
+            self._sync()
+
+    def _connect(self):
+        self._db = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self._db.execute('PRAGMA journal_mode=WAL')
+
+    def reopen(self):
+        """Give this process its own sqlite connection (call in a forked child)"""
+        self._lock = threading.Lock()
+        if self.path:
+            self._connect()
+
+    def _remember(self, job_index: JobIndex, text: str):
+        if job_index.posting_id not in self._postings:
+            self._postings[job_index.posting_id] = job_index
+            self._document_frequencies.update(term_set(text))
+
+    def _sync(self):
+        """Load the postings other processes stored since the last sync (hold the lock)"""
+        rows = self._db.execute(
+            'SELECT rowid, text, job_index FROM postings WHERE rowid > ? ORDER BY rowid', (self._last_rowid,)
+        ).fetchall()
+        for rowid, text, job_index in rows:
+            self._remember(JobIndex.from_dict(json.loads(job_index)), text)
+            self._last_rowid = rowid
+
+    def add(self, text: str, title: str = '') -> JobIndex:
+        """Index a posting, or return the existing index of an identical one"""
+        posting_id = posting_id_for(text, title)
+        with self._lock:
+            if self._db is None:
+                job_index = self._postings.get(posting_id)
+                if job_index is None:
+                    job_index = build_job_index(text, title, self._document_frequencies, len(self._postings))
+                    self._remember(job_index, text)
+                return job_index
+            # Take the write lock first, so no other process stores a posting in between
+            # and the IDF covers exactly the postings stored before this one
+            self._db.execute('BEGIN IMMEDIATE')
+            try:
+                self._sync()
+                job_index = self._postings.get(posting_id)
+                if job_index is None:
+                    job_index = build_job_index(text, title, self._document_frequencies, len(self._postings))
+                    self._db.execute(
+                        'INSERT INTO postings (posting_id, title, text, job_index, created_at) '
+                        'VALUES (?, ?, ?, ?, ?)',
+                        (posting_id, title, text, json.dumps(job_index.to_dict()), time.time())
+                    )
+                    self._db.commit()
+                    self._sync()
+                    job_index = self._postings[posting_id]
+                else:
+                    self._db.rollback()
+            except BaseException:
+                self._db.rollback()
+                raise
+            return job_index
+
+    def get(self, posting_id: str) -> Optional[JobIndex]:
+        """Look up a posting by id, including ones another process stored"""
+        with self._lock:
+            job_index = self._postings.get(posting_id)
+            if job_index is None and self._db is not None:
+                self._sync()
+                job_index = self._postings.get(posting_id)
+            return job_index
+
+    def all(self) -> List[JobIndex]:
+        with self._lock:
+            return list(self._postings.values())
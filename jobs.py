@@ -0,0 +1,217 @@
+"""
+Jobs - Bounded background pool for offloaded resume analysis
+"""
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+
+class JobQueueFull(Exception):
+    """Raised when the job queue is at capacity; callers should retry later"""
+
+
+class Job:
+    """State of one offloaded analysis"""
+
+    def __init__(self, job_id: Optional[str] = None):
+        self.id = job_id or uuid.uuid4().hex
+        self.status = 'queued'  # 'queued', 'running', 'done', 'failed', 'timeout'
+        self.result: Optional[Dict] = None
+        self.status_code: Optional[int] = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.finished = threading.Event()
+
+    def to_dict(self) -> Dict:
+        """JSON-serializable job status"""
+        data = {'job_id': self.id, 'status': self.status}
+        if self.status == 'done':
+            data['status_code'] = self.status_code
+            data['result'] = self.result
+        elif self.error:
+            data['error'] = self.error
+        return data
+
+
+class JobManager:
+    """
+    Runs analysis jobs on a fixed number of worker threads.
+
+    At most max_pending jobs may be queued or running; beyond that submit()
+    raises JobQueueFull so the web layer can answer 429. A job still running
+    after timeout seconds is reported as 'timeout' and stops counting against
+    max_pending. Python cannot interrupt a thread, so the analysis itself
+    runs on in its worker thread and its late result is dropped; the parser's
+    page and character budgets are what bound that work. Finished jobs are
+    forgotten after ttl seconds.
+
+    With a sqlite file, every state change is also written there, so a job
+    submitted to one process can be polled through any other; capacity and
+    the worker threads stay per process.
+    """
+
+    def __init__(self, workers: int = 2, max_pending: int = 32,
+                 timeout: float = 30, ttl: float = 600, path: Optional[str] = None,
+                 poll_interval: float = 0.5):
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.ttl = ttl
+        self.path = path
+        self.poll_interval = poll_interval
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='analyze-job')
+        self._jobs: Dict[str, Job] = {}
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            self._connect()
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS jobs ('
+                'job_id TEXT PRIMARY KEY, status TEXT NOT NULL, status_code INTEGER, result TEXT, error TEXT, '
+                'created_at REAL NOT NULL, started_at REAL, finished_at REAL)'
+            )
+            self._db.commit()
+
+    def _connect(self):
+        self._db = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self._db.execute('PRAGMA journal_mode=WAL')
+
+    def reopen(self):
+        """Give this process its own sqlite connection (call in a forked child)"""
+        self._lock = threading.Lock()
+        if self.path:
+            self._connect()
+
+    def _save(self, job: Job):
+        """Write the job's state to the sqlite file, if any (caller holds the lock)"""
+        if self._db is None:
+            return
+        self._db.execute(
+            'INSERT OR REPLACE INTO jobs (job_id, status, status_code, result, error, created_at, started_at, '
+            'finished_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            (job.id, job.status, job.status_code, json.dumps(job.result) if job.result is not None else None,
+             job.error, job.created_at, job.started_at, job.finished_at)
+        )
+        self._db.commit()
+
+    def _load(self, job_id: str) -> Optional[Job]:
+        """Snapshot of a job another process runs, from the sqlite file (caller holds the lock)"""
+        row = self._db.execute(
+            'SELECT status, status_code, result, error, created_at, started_at, finished_at FROM jobs '
+            'WHERE job_id = ?', (job_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        job = Job(job_id)
+        job.status, job.status_code, result, job.error, job.created_at, job.started_at, job.finished_at = row
+        job.result = json.loads(result) if result is not None else None
+        if job.status not in ('queued', 'running'):
+            job.finished.set()
+        return job
+
+    def submit(self, fn: Callable, *args) -> Job:
+        """Queue fn(*args), which must return (result dict, HTTP status code)"""
+        with self._lock:
+            self._purge()
+            for running in self._jobs.values():
+                self._expire(running)
+            if self._pending >= self.max_pending:
+                raise JobQueueFull(f'{self._pending} jobs already queued or running')
+            job = Job()
+            self._jobs[job.id] = job
+            self._pending += 1
+            self._save(job)
+        self._executor.submit(self._run, job, fn, args)
+        return job
+
+    def _run(self, job: Job, fn: Callable, args: tuple):
+        with self._lock:
+            job.started_at = time.time()
+            job.status = 'running'
+            self._save(job)
+        try:
+            result, status_code = fn(*args)
+        except Exception as e:
+            result, status_code, error = None, None, f'An error occurred: {str(e)}'
+        else:
+            error = None
+        with self._lock:
+            self._expire(job)
+            if job.status != 'running':
+                return  # timed out: the slot was released and the late result is dropped
+            if error is None:
+                job.result, job.status_code, job.status = result, status_code, 'done'
+            else:
+                job.error, job.status = error, 'failed'
+            job.finished_at = time.time()
+            self._pending -= 1
+            self._save(job)
+        job.finished.set()
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Look up a job, including one another process runs, marking it as timed out if it has overrun"""
+        job = self._jobs.get(job_id)
+        if job is None and self._db is not None:
+            with self._lock:
+                job = self._load(job_id)
+        if job is not None:
+            self._check_timeout(job)
+        return job
+
+    def wait(self, job: Job, timeout: float) -> bool:
+        """Block up to timeout seconds for the job to finish; True once it has"""
+        if job.id in self._jobs or self._db is None:
+            job.finished.wait(timeout)
+        else:
+            # Another process runs it: poll the sqlite file for its state
+            deadline = time.time() + timeout
+            while job.status in ('queued', 'running'):
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                time.sleep(min(self.poll_interval, remaining))
+                with self._lock:
+                    latest = self._load(job.id)
+                if latest is None:
+                    break
+                job.status, job.status_code, job.result, job.error = (
+                    latest.status, latest.status_code, latest.result, latest.error)
+                job.started_at, job.finished_at = latest.started_at, latest.finished_at
+        self._check_timeout(job)
+        return job.status not in ('queued', 'running')
+
+    def _check_timeout(self, job: Job):
+        with self._lock:
+            self._expire(job)
+
+    def _expire(self, job: Job):
+        """Mark an overrunning job as timed out and release its slot (caller holds the lock)"""
+        if job.status != 'running' or time.time() - job.started_at <= self.timeout:
+            return
+        job.status = 'timeout'
+        job.error = f'Analysis did not finish within {self.timeout:g} seconds'
+        job.finished_at = time.time()
+        if self._jobs.get(job.id) is job:
+            self._pending -= 1
+            self._save(job)
+        job.finished.set()
+
+    def _purge(self):
+        """Forget finished jobs older than ttl (caller holds the lock)"""
+        cutoff = time.time() - self.ttl
+        for job_id in [j.id for j in self._jobs.values() if j.finished_at and j.finished_at < cutoff]:
+            del self._jobs[job_id]
+        if self._db is not None:
+            self._db.execute('DELETE FROM jobs WHERE finished_at < ?', (cutoff,))
+            self._db.commit()
+
+    def stats(self) -> Dict:
+        """Queue depth and capacity"""
+        with self._lock:
+            return {'pending': self._pending, 'max_pending': self.max_pending, 'jobs': len(self._jobs)}
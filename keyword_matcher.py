@@ -0,0 +1,170 @@
+"""
+Keyword Matcher - Aho-Corasick automaton for whole-word vocabulary matching
+"""
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+
+def _is_word_char(char: str) -> bool:
+    """Same notion of a word character as the regex \\b boundary"""
+    return char.isalnum() or char == '_'
+
+
+class KeywordMatches:
+    """Whole-word keyword hits from one scan of a text"""
+
+    def __init__(self, groups: Dict[str, Set[str]]):
+        self._groups = groups
+        self.positions: Dict[str, List[int]] = {}
+
+    def add(self, term: str, start: int):
+        self.positions.setdefault(term, []).append(start)
+
+    def count(self, term: str) -> int:
+        """Number of occurrences of a single term"""
+        return len(self.positions.get(term, ()))
+
+    def terms(self, group: str) -> List[str]:
+        """Distinct terms of a vocabulary group that were found, in first-seen order"""
+        members = self._groups.get(group, set())
+        return [term for term in self.positions if term in members]
+
+    def found(self, group: str) -> int:
+        """Number of distinct terms of a vocabulary group that were found"""
+        return len(self.terms(group))
+
+    def found_within(self, group: str, spans: Iterable[Tuple[int, int]]) -> int:
+        """Number of distinct terms of a group with an occurrence starting inside one of the (start, end) spans"""
+        spans = list(spans)
+        members = self._groups.get(group, set())
+        return sum(
+            1 for term, starts in self.positions.items()
+            if term in members and any(start <= position < end for position in starts for start, end in spans)
+        )
+
+
+class KeywordCounts:
+    """Occurrence counts per term, updated as pieces of text (e.g. lines) come and go"""
+
+    def __init__(self, groups: Dict[str, Set[str]]):
+        self._groups = groups
+        self.counts: Dict[str, int] = {}
+
+    def add(self, terms: Iterable[str]):
+        for term in terms:
+            self.counts[term] = self.counts.get(term, 0) + 1
+
+    def remove(self, terms: Iterable[str]):
+        for term in terms:
+            remaining = self.counts[term] - 1
+            if remaining:
+                self.counts[term] = remaining
+            else:
+                del self.counts[term]
+
+    def count(self, term: str) -> int:
+        """Number of occurrences of a single term"""
+        return self.counts.get(term, 0)
+
+    def terms(self, group: str) -> List[str]:
+        """Distinct terms of a vocabulary group that are present"""
+        members = self._groups.get(group, set())
+        return [term for term in self.counts if term in members]
+
+    def found(self, group: str) -> int:
+        """Number of distinct terms of a vocabulary group that are present"""
+        return len(self.terms(group))
+
+
+class KeywordMatcher:
+    """
+    Finds every whole-word occurrence of a set of vocabularies in one linear pass.
+
+    The automaton is built once; matching cost depends on the text length and
+    the number of hits, not on how many terms the vocabularies contain.
+    """
+
+    def __init__(self, vocabularies: Dict[str, Iterable[str]]):
+        # vocabulary name -> its terms, and term -> names of the vocabularies it belongs to
+        self.groups: Dict[str, Set[str]] = {}
+        self._term_groups: Dict[str, Set[str]] = {}
+        for group, terms in vocabularies.items():
+            members = self.groups.setdefault(group, set())
+            for term in terms:
+                term = term.lower()
+                if not term:
+                    continue
+                members.add(term)
+                self._term_groups.setdefault(term, set()).add(group)
+
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Tuple[str, ...]] = [()]
+        for term in self._term_groups:
+            self._insert(term)
+        self._build_failure_links()
+
+    def _insert(self, term: str):
+        """Add a term to the trie"""
+        state = 0
+        for char in term:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+            state = next_state
+        self._output[state] = self._output[state] + (term,)
+
+    def _build_failure_links(self):
+        """Breadth-first construction of failure links and merged outputs"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, str]]:
+        """
+        Yield (start, term) for every whole-word occurrence in text.
+
+        Text is expected to be lowercased already.
+        """
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        text_length = len(text)
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if not output[state]:
+                continue
+            end = index + 1
+            if end < text_length and _is_word_char(text[end]):
+                continue
+            for term in output[state]:
+                start = end - len(term)
+                if start > 0 and _is_word_char(text[start - 1]):
+                    continue
+                yield start, term
+
+    def find_terms(self, text: str) -> Tuple[str, ...]:
+        """Every whole-word occurrence in a lowercased text, as terms in order"""
+        return tuple(term for _, term in self.iter_matches(text))
+
+    def match(self, text: str) -> KeywordMatches:
+        """Collect all whole-word matches of a lowercased text"""
+        matches = KeywordMatches(self.groups)
+        for start, term in self.iter_matches(text):
+            matches.add(term, start)
+        return matches
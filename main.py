@@ -1,26 +1,89 @@
 """
 Resume Checker - Main CLI application
 """
+import os
 import sys
 import click
-from resume_parser import ResumeParser
-from resume_analyzer import ResumeAnalyzer
+from resume_parser import PARALLEL_PAGE_THRESHOLD, ResumeParser
+from resume_analyzer import ResumeAnalyzer, VALID_FACULTIES
 from feedback_generator import FeedbackGenerator
+from pdf_backends import PDF_BACKENDS, resolve_backend
 
 
 @click.command()
-@click.argument('resume_file', type=click.Path(exists=True))
-@click.option('--output', '-o', type=click.Path(), help='Save report to file')
-def main(resume_file, output):
+@click.argument('resume_files', nargs=-1, required=True)
+@click.option('--output', '-o', type=click.Path(), help='Save report (or batch results) to file')
+@click.option('--faculty', '-f', type=click.Choice(VALID_FACULTIES), help='Field of degree used to tailor checks')
+@click.option('--workers', '-w', type=int, default=None, help='Batch mode: worker processes (default: CPU count)')
+@click.option('--chunk-size', type=int, default=8, show_default=True, help='Batch mode: files sent to a worker at a time')
+@click.option('--cache', 'cache_path', type=click.Path(dir_okay=False), help='Reuse results from this sqlite cache file')
+@click.option('--parse-cache', 'parse_cache_path', type=click.Path(dir_okay=False), help='Reuse extracted text from this sqlite file')
+@click.option('--max-pages', type=int, default=None, help='Stop PDF extraction after this many pages')
+@click.option('--max-chars', type=int, default=None, help='Stop extraction after this many characters')
+@click.option('--pdf-backend', type=click.Choice(('auto',) + PDF_BACKENDS), default='auto', show_default=True,
+              help='PDF text extractor; auto picks the fastest installed')
+@click.option('--pdf-workers', type=int, default=None,
+              help=f'Processes for PDFs over {PARALLEL_PAGE_THRESHOLD} pages (default: CPU count, 1 = serial)')
+@click.option('--store', 'store_path', type=click.Path(dir_okay=False),
+              help='Record each analysis in this sqlite history (query with analysis_store.py)')
+@click.option('--job', 'job_path', type=click.Path(exists=True, dir_okay=False),
+              help='Job description file (PDF, DOCX or TXT) to match resumes against')
+def main(resume_files, output, faculty, workers, chunk_size, cache_path, parse_cache_path, max_pages, max_chars,
+         pdf_backend, pdf_workers, store_path, job_path):
     """
     Analyze a resume file and provide feedback.
     
-    RESUME_FILE: Path to the resume file (PDF, DOCX, or TXT)
+    RESUME_FILES: Path to the resume file (PDF, DOCX, or TXT). Passing several
+    files, a directory or a glob pattern analyzes them all in batch mode and
+    writes one JSON result per line as each resume completes.
     """
+    # Batch mode and the caches are imported only when used, keeping one-off runs quick to start
+    cache = None
+    if cache_path:
+        from result_cache import ResultCache
+        cache = ResultCache(ttl=None, path=cache_path)
     try:
+        pdf_backend = resolve_backend(pdf_backend)
+    except ImportError as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+    parser_options = {'max_pages': max_pages, 'max_chars': max_chars, 'pdf_backend': pdf_backend,
+                      'pdf_workers': pdf_workers}
+    job = None
+    if job_path:
+        job = load_job(job_path, parser_options)
+    store = None
+    if store_path:
+        from analysis_store import AnalysisStore
+        store = AnalysisStore(store_path)
+    if len(resume_files) > 1 or not os.path.isfile(resume_files[0]):
+        run_batch(resume_files, output, faculty, workers, chunk_size, cache, parse_cache_path, parser_options, job,
+                  store)
+    
+    resume_file = resume_files[0]
+    # Colour only for a terminal; saved or piped reports stay plain (and colorama is not loaded)
+    color = not output and sys.stdout.isatty()
+    try:
+        # Serve an identical file analyzed by identical rules from the cache
+        cache_key = None
+        if cache is not None:
+            with open(resume_file, 'rb') as f:
+                namespace = 'report:color' if color else 'report'
+                if job is not None:
+                    namespace += f':{job.posting_id}'
+                cache_key = cache.make_key(f.read(), faculty, ResumeAnalyzer().ruleset_version, namespace=namespace)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                write_report(cached['report'], output)
+                sys.exit(1 if cached['critical'] else 0)
+        
         # Parse resume
         click.echo(f"Parsing resume: {resume_file}")
-        parser = ResumeParser()
+        parse_cache = None
+        if parse_cache_path:
+            from parse_cache import ParseCache
+            parse_cache = ParseCache(parse_cache_path)
+        parser = ResumeParser(cache=parse_cache, **parser_options)
         resume_text = parser.parse(resume_file)
         
         if not resume_text or len(resume_text.strip()) < 50:
@@ -32,24 +95,24 @@ def main(resume_file, output):
         # Analyze resume
         click.echo("Analyzing resume...")
         analyzer = ResumeAnalyzer()
-        issues = analyzer.analyze(resume_text)
+        scorecard = analyzer.evaluate(resume_text, faculty=faculty, job=job)
+        if store is not None:
+            store.record(file_digest(resume_file), scorecard, len(resume_text.split()), source='cli',
+                         ruleset_version=analyzer.ruleset_version)
+            store.flush()
         
         # Generate feedback
         click.echo("Generating feedback report...")
-        generator = FeedbackGenerator()
-        report = generator.generate_report(issues, resume_text)
+        generator = FeedbackGenerator(color=color)
+        report = generator.generate_report(scorecard.issues, resume_text, scorecard)
         
         # Output report
-        if output:
-            with open(output, 'w', encoding='utf-8') as f:
-                f.write(report)
-            click.echo(f"\nReport saved to: {output}")
-        else:
-            click.echo(report)
+        write_report(report, output)
         
         # Exit code based on critical issues
-        critical_issues = [i for i in issues if i.severity == 'critical']
-        if critical_issues:
+        if cache is not None:
+            cache.set(cache_key, {'report': report, 'critical': scorecard.critical})
+        if scorecard.critical:
             sys.exit(1)
         else:
             sys.exit(0)
@@ -65,5 +128,82 @@ def main(resume_file, output):
         sys.exit(1)
 
 
+def load_job(job_path, parser_options):
+    """Parse a job description file and index its key terms"""
+    from job_matcher import build_job_index
+    
+    try:
+        text = ResumeParser(**parser_options).parse(job_path)
+    except (FileNotFoundError, ValueError) as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+    if not text or not text.strip():
+        click.echo("Error: Could not extract text from the job description.", err=True)
+        sys.exit(1)
+    return build_job_index(text, title=os.path.basename(job_path))
+
+
+def file_digest(path):
+    """Content hash of a file, as used for cache keys and the analysis history"""
+    import hashlib
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def write_report(report, output):
+    """Print the report or save it to the output file"""
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            f.write(report)
+        click.echo(f"\nReport saved to: {output}")
+    else:
+        click.echo(report)
+
+
+def run_batch(inputs, output, faculty, workers, chunk_size, cache=None, parse_cache_path=None, parser_options=None,
+              job=None, store=None):
+    """Analyze every resume matched by inputs, streaming one JSON line per resume"""
+    import json
+    from batch_analyzer import analyze_batch, collect_resume_files
+    
+    paths = collect_resume_files(inputs)
+    if not paths:
+        click.echo("Error: No resume files found.", err=True)
+        sys.exit(1)
+
+    click.echo(f"Analyzing {len(paths)} resume(s)...", err=True)
+    out = open(output, 'w', encoding='utf-8') if output else None
+    failed = 0
+    analyzer_version = ResumeAnalyzer().ruleset_version if store is not None else None
+    try:
+        results = analyze_batch(paths, faculty=faculty, workers=workers, chunksize=chunk_size,
+                                cache=cache, parse_cache_path=parse_cache_path, parser_options=parser_options,
+                                job=job)
+        for result in results:
+            if result.error:
+                failed += 1
+            elif store is not None and not result.cached:
+                store.record(file_digest(result.path), result.scorecard, result.word_count, source='cli',
+                             ruleset_version=analyzer_version)
+            line = json.dumps(result.to_dict())
+            if out:
+                out.write(line + '\n')
+            else:
+                click.echo(line)
+    finally:
+        if out:
+            out.close()
+        if store is not None:
+            store.flush()
+
+    click.echo(f"Done: {len(paths) - failed} analyzed, {failed} failed", err=True)
+    if cache is not None:
+        stats = cache.stats()
+        click.echo(f"Cache: {stats['hits']} hit(s), {stats['misses']} miss(es)", err=True)
+    if output:
+        click.echo(f"Results saved to: {output}", err=True)
+    sys.exit(1 if failed else 0)
+
+
 if __name__ == '__main__':
     main()
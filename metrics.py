@@ -0,0 +1,143 @@
+"""
+Metrics - Lightweight stage timing and Prometheus-style histograms
+"""
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Iterable, Optional, Tuple
+
+# Upper bounds in seconds; resume stages range from microseconds (rules) to seconds (large PDFs)
+DEFAULT_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram"""
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.count += 1
+        self.sum += value
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+
+
+class MetricsRegistry:
+    """Histograms keyed by metric name and one label, rendered in Prometheus text format"""
+
+    def __init__(self):
+        self._histograms: Dict[Tuple[str, str, str], Histogram] = {}
+        self._help: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def describe(self, name: str, help_text: str):
+        self._help[name] = help_text
+
+    def observe(self, name: str, label: str, value: str, seconds: float):
+        key = (name, label, value)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(seconds)
+
+    def render(self, gauges: Optional[Dict[str, float]] = None) -> str:
+        """Prometheus exposition format; gauges are appended as untyped samples"""
+        lines = []
+        with self._lock:
+            by_name: Dict[str, list] = {}
+            for (name, label, value), histogram in sorted(self._histograms.items()):
+                by_name.setdefault(name, []).append((label, value, histogram))
+            for name, series in by_name.items():
+                if name in self._help:
+                    lines.append(f'# HELP {name} {self._help[name]}')
+                lines.append(f'# TYPE {name} histogram')
+                for label, value, histogram in series:
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        cumulative += count
+                        lines.append(f'{name}_bucket{{{label}="{value}",le="{bound:g}"}} {cumulative}')
+                    lines.append(f'{name}_bucket{{{label}="{value}",le="+Inf"}} {histogram.count}')
+                    lines.append(f'{name}_sum{{{label}="{value}"}} {histogram.sum:.6f}')
+                    lines.append(f'{name}_count{{{label}="{value}"}} {histogram.count}')
+        for name, value in (gauges or {}).items():
+            lines.append(f'{name} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+STAGE_METRIC = 'resume_checker_stage_seconds'
+RULE_METRIC = 'resume_checker_rule_seconds'
+
+
+class StageTimer:
+    """
+    Collects per-stage wall-clock timings for one request.
+
+    Timings are kept for the response when keep is True and recorded in the
+    registry when one is given. With neither, use NULL_TIMER instead: its
+    stage() is a shared no-op context, so disabled timing costs one call.
+    """
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None, keep: bool = False):
+        self.registry = registry
+        self.stages: Optional[Dict[str, float]] = {} if keep else None
+        self.rules: Optional[Dict[str, float]] = {} if keep else None
+        # Dict that ResumeAnalyzer.analyze fills with per-rule seconds
+        self.rule_timings: Optional[Dict[str, float]] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name: str, seconds: float):
+        if self.stages is not None:
+            self.stages[name] = self.stages.get(name, 0.0) + seconds
+        if self.registry is not None:
+            self.registry.observe(STAGE_METRIC, 'stage', name, seconds)
+
+    def record_rules(self):
+        """Move the analyzer's per-rule timings into the registry and response"""
+        for name, seconds in self.rule_timings.items():
+            if self.rules is not None:
+                self.rules[name] = seconds
+            if self.registry is not None:
+                self.registry.observe(RULE_METRIC, 'rule', name, seconds)
+        self.rule_timings.clear()
+
+    def to_dict(self) -> Dict:
+        """Timings in milliseconds for the optional response block"""
+        return {
+            'stages_ms': {name: round(seconds * 1000, 3) for name, seconds in self.stages.items()},
+            'rules_ms': {name: round(seconds * 1000, 3) for name, seconds in self.rules.items()},
+        }
+
+
+class _NullTimer:
+    """Stand-in when timing is disabled"""
+    stages = None
+    rules = None
+    rule_timings = None
+    _context = nullcontext()
+
+    def stage(self, name: str):
+        return self._context
+
+    def record(self, name: str, seconds: float):
+        pass
+
+    def record_rules(self):
+        pass
+
+
+NULL_TIMER = _NullTimer()
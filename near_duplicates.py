@@ -0,0 +1,380 @@
+"""
+Near Duplicates - MinHash signatures and an LSH index for finding near-identical resumes
+"""
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Shingles are runs of three words of the lowercased text
+SHINGLE_WORDS = 3
+# Signature length, split into BANDS bands of NUM_HASHES // BANDS values for LSH.
+# Two resumes of similarity s share a band with probability 1 - (1 - s^8)^16:
+# about 0.98 at s = 0.8 and under 0.1 at s = 0.5.
+NUM_HASHES = 128
+BANDS = 16
+ROWS = NUM_HASHES // BANDS
+
+WORD_PATTERN = re.compile(r'\w+')
+
+_BUCKET_BITS = NUM_HASHES.bit_length() - 1
+_VALUE_LIMIT = 1 << (64 - _BUCKET_BITS)
+_MASK = (1 << 64) - 1
+
+
+def shingle_hashes(text: str) -> List[int]:
+    """
+    64-bit hashes of the text's word shingles (one shingle for texts shorter than SHINGLE_WORDS).
+
+    Each distinct word is hashed once (BLAKE2b, so signatures are stable across
+    processes and restarts); a shingle's hash mixes its words' hashes.
+    """
+    words = WORD_PATTERN.findall(text.lower())
+    if not words:
+        return []
+    word_hashes = {}
+    hashes = []
+    for word in words:
+        value = word_hashes.get(word)
+        if value is None:
+            value = word_hashes[word] = int.from_bytes(
+                hashlib.blake2b(word.encode('utf-8'), digest_size=8).digest(), 'little')
+        hashes.append(value)
+    if len(hashes) < SHINGLE_WORDS:
+        hashes += [0] * (SHINGLE_WORDS - len(hashes))
+    # Word hashes are already uniform, so one multiply-xorshift round mixes a triple well enough
+    mixed = [((first * 0x9E3779B97F4A7C15 + second * 0xC2B2AE3D27D4EB4F + third) & _MASK)
+             for first, second, third in zip(hashes, hashes[1:], hashes[2:])]
+    return [value ^ ((value >> 29) * 0xBF58476D1CE4E5B9 & _MASK) for value in mixed]
+
+
+def minhash_signature(text: str) -> Optional[array]:
+    """
+    MinHash signature of a text's shingles, or None for a text without words.
+
+    One-permutation MinHash: each shingle is hashed once, the low bits pick
+    one of NUM_HASHES buckets and each bucket keeps its smallest value. Empty
+    buckets borrow from the next filled one (offset by the distance, so they
+    only match buckets that borrowed alike). The fraction of equal positions
+    of two signatures estimates the Jaccard similarity of their shingle sets.
+    """
+    hashes = shingle_hashes(text)
+    if not hashes:
+        return None
+    mask = NUM_HASHES - 1
+    signature = [_VALUE_LIMIT] * NUM_HASHES
+    for value in hashes:
+        bucket = value & mask
+        value >>= _BUCKET_BITS
+        if value < signature[bucket]:
+            signature[bucket] = value
+    empty = {bucket for bucket in range(NUM_HASHES) if signature[bucket] == _VALUE_LIMIT}
+    for bucket in empty:
+        distance = 1
+        while (bucket + distance) % NUM_HASHES in empty:
+            distance += 1
+        signature[bucket] = signature[(bucket + distance) % NUM_HASHES] + distance * _VALUE_LIMIT
+    return array('Q', signature)
+
+
+def similarity(first: array, second: array) -> float:
+    """Estimated Jaccard similarity of two signatures"""
+    return sum(a == b for a, b in zip(first, second)) / NUM_HASHES
+
+
+def _band_keys(signature: array) -> List[bytes]:
+    data = signature.tobytes()
+    size = ROWS * signature.itemsize
+    return [bytes([band]) + data[band * size:(band + 1) * size] for band in range(BANDS)]
+
+
+class NearDuplicateIndex:
+    """
+    LSH index of MinHash signatures by document id.
+
+    A signature is filed under each of its BANDS band values; a lookup only
+    compares against documents sharing a band, so its cost depends on the
+    number of near matches, not on the size of the index. With a sqlite
+    file, signatures survive restarts and each lookup first picks up those
+    other processes added since the last one.
+
+    At most max_entries signatures are kept (the oldest are dropped first)
+    and signatures older than ttl seconds expire; None means no limit.
+    """
+
+    def __init__(self, threshold: float = 0.9, path: Optional[str] = None,
+                 max_entries: Optional[int] = None, ttl: Optional[float] = None):
+        self.threshold = threshold
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._signatures: Dict[str, array] = {}
+        self._added_at: Dict[str, float] = {}  # oldest first
+        self._buckets: Dict[bytes, List[str]] = {}
+        self._last_rowid = 0
+        self._db = None
+        self._disk_writes = 0
+        self.lookups = 0
+        self.matches = 0
+        self.evictions = 0
+        if path:
+            self._connect()
+            self._db.executescript(
+                'CREATE TABLE IF NOT EXISTS signatures ('
+                'doc_id TEXT PRIMARY KEY, signature BLOB NOT NULL, created_at REAL NOT NULL);'
+                'CREATE INDEX IF NOT EXISTS signatures_created_at ON signatures (created_at);'
+            )
+            self._db.commit()
+            self.prune()
+            self._sync()
+
+    def _connect(self):
+        self._db = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self._db.execute('PRAGMA journal_mode=WAL')
+
+    def reopen(self):
+        """Give this process its own sqlite connection (call in a forked child)"""
+        self._lock = threading.Lock()
+        if self.path:
+            self._connect()
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def _sync(self):
+        """Load signatures stored since the last sync (caller holds the lock, or is __init__)"""
+        rows = self._db.execute(
+            'SELECT rowid, doc_id, signature, created_at FROM signatures WHERE rowid > ? ORDER BY rowid',
+            (self._last_rowid,)
+        ).fetchall()
+        now = time.time()
+        for rowid, doc_id, data, created_at in rows:
+            self._last_rowid = rowid
+            if self._expired(created_at, now):
+                continue
+            signature = array('Q')
+            signature.frombytes(data)
+            self._remember(doc_id, signature, created_at)
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return self.ttl is not None and now - created_at > self.ttl
+
+    def _remember(self, doc_id: str, signature: array, created_at: float):
+        """File a signature in memory, dropping the oldest beyond max_entries (caller holds the lock)"""
+        if doc_id in self._signatures:
+            return
+        if (self.max_entries is not None and self._added_at and len(self._signatures) >= self.max_entries
+                and created_at < next(iter(self._added_at.values()))):
+            return  # older than everything a full index keeps, e.g. a row this process already evicted
+        self._signatures[doc_id] = signature
+        self._added_at[doc_id] = created_at
+        for key in _band_keys(signature):
+            self._buckets.setdefault(key, []).append(doc_id)
+        while self.max_entries is not None and len(self._signatures) > self.max_entries:
+            self._forget(next(iter(self._added_at)))
+
+    def _forget(self, doc_id: str):
+        signature = self._signatures.pop(doc_id)
+        del self._added_at[doc_id]
+        for key in _band_keys(signature):
+            bucket = self._buckets[key]
+            bucket.remove(doc_id)
+            if not bucket:
+                del self._buckets[key]
+        self.evictions += 1
+
+    def _expire(self, now: float):
+        """Drop expired signatures from memory, oldest first (caller holds the lock)"""
+        if self.ttl is None:
+            return
+        while self._added_at:
+            doc_id, created_at = next(iter(self._added_at.items()))
+            if not self._expired(created_at, now):
+                break
+            self._forget(doc_id)
+
+    def add(self, doc_id: str, signature: array):
+        """File a document's signature (a document already in the index is left as it is)"""
+        now = time.time()
+        with self._lock:
+            if doc_id in self._signatures:
+                return
+            self._expire(now)
+            self._remember(doc_id, signature, now)
+            if self._db is not None:
+                self._db.execute(
+                    'INSERT OR REPLACE INTO signatures (doc_id, signature, created_at) VALUES (?, ?, ?)',
+                    (doc_id, signature.tobytes(), now)
+                )
+                self._db.commit()
+                self._disk_writes += 1
+                trim_disk = self._disk_writes % 1000 == 0
+            else:
+                trim_disk = False
+        # Keep the file bounded without paying for a trim on every write
+        if trim_disk:
+            self.prune()
+
+    def prune(self) -> int:
+        """Drop expired signatures and trim the sqlite file to max_entries; returns rows removed"""
+        now = time.time()
+        removed = 0
+        with self._lock:
+            self._expire(now)
+            if self._db is not None:
+                if self.ttl is not None:
+                    removed += self._db.execute(
+                        'DELETE FROM signatures WHERE created_at < ?', (now - self.ttl,)
+                    ).rowcount
+                if self.max_entries is not None:
+                    removed += self._db.execute(
+                        'DELETE FROM signatures WHERE doc_id IN ('
+                        'SELECT doc_id FROM signatures ORDER BY created_at DESC LIMIT -1 OFFSET ?)',
+                        (self.max_entries,)
+                    ).rowcount
+                self._db.commit()
+        return removed
+
+    def find(self, signature: array, threshold: Optional[float] = None,
+             exclude: Optional[str] = None) -> List[Tuple[str, float]]:
+        """Documents at least threshold similar to the signature, as (doc_id, similarity), most similar first"""
+        threshold = self.threshold if threshold is None else threshold
+        with self._lock:
+            if self._db is not None:
+                self._sync()
+            self._expire(time.time())
+            candidates = set()
+            for key in _band_keys(signature):
+                candidates.update(self._buckets.get(key, ()))
+            candidates.discard(exclude)
+            found = []
+            for doc_id in candidates:
+                score = similarity(signature, self._signatures[doc_id])
+                if score >= threshold:
+                    found.append((doc_id, score))
+            self.lookups += 1
+            if found:
+                self.matches += 1
+        found.sort(key=lambda item: (-item[1], item[0]))
+        return found
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {'entries': len(self._signatures), 'lookups': self.lookups, 'matches': self.matches,
+                    'evictions': self.evictions, 'threshold': self.threshold, 'max_entries': self.max_entries,
+                    'ttl': self.ttl, 'disk_path': self.path}
+
+
+def find_clusters(signatures: Iterable[Tuple[str, array]], threshold: float = 0.9) -> List[List[str]]:
+    """
+    Group documents into clusters of near duplicates (connected by pairs at least threshold similar).
+
+    Returns clusters of two or more document ids, largest first, each in input order.
+    """
+    index = NearDuplicateIndex(threshold)
+    order: Dict[str, int] = {}
+    parent: Dict[str, str] = {}
+
+    def root(doc_id):
+        while parent[doc_id] != doc_id:
+            parent[doc_id] = parent[parent[doc_id]]
+            doc_id = parent[doc_id]
+        return doc_id
+
+    for doc_id, signature in signatures:
+        if doc_id in order:
+            continue
+        order[doc_id] = len(order)
+        parent[doc_id] = doc_id
+        for other, _ in index.find(signature):
+            first, second = root(doc_id), root(other)
+            if first != second:
+                parent[max(first, second, key=order.get)] = min(first, second, key=order.get)
+        index.add(doc_id, signature)
+
+    clusters: Dict[str, List[str]] = {}
+    for doc_id in order:
+        clusters.setdefault(root(doc_id), []).append(doc_id)
+    return sorted((members for members in clusters.values() if len(members) > 1),
+                  key=lambda members: (-len(members), order[members[0]]))
+
+
+# Parser owned by a signature worker process, set by _init_worker
+_worker_parser = None
+
+
+def _init_worker(parse_cache_path: Optional[str] = None):
+    global _worker_parser
+    from parse_cache import ParseCache
+    from resume_parser import ResumeParser
+    _worker_parser = ResumeParser(cache=ParseCache(parse_cache_path) if parse_cache_path else None,
+                                  parallel_pages=None)
+
+
+def _signature_of_file(path: str) -> Tuple[str, Optional[bytes], Optional[str]]:
+    """Parse one file and return its signature bytes; errors are reported, not raised"""
+    try:
+        signature = minhash_signature(_worker_parser.parse(path) or '')
+    except Exception as e:
+        return path, None, str(e)
+    if signature is None:
+        return path, None, 'No text could be extracted'
+    return path, signature.tobytes(), None
+
+
+def cli():
+    """Command-line entry point: python near_duplicates.py clusters RESUMES... [--threshold 0.9]"""
+    import json
+    import click
+    from multiprocessing import Pool
+
+    @click.group()
+    def commands():
+        """Find near-duplicate resumes with MinHash/LSH."""
+
+    @commands.command()
+    @click.argument('inputs', nargs=-1, required=True)
+    @click.option('--threshold', type=click.FloatRange(0, 1), default=0.9, show_default=True,
+                  help='Estimated Jaccard similarity of word shingles at which two resumes are duplicates')
+    @click.option('--output', '-o', type=click.Path(), help='Save the clusters (JSON) to file')
+    @click.option('--workers', '-w', type=int, default=None, help='Worker processes (default: CPU count)')
+    @click.option('--parse-cache', 'parse_cache_path', type=click.Path(dir_okay=False),
+                  help='Reuse extracted text from this sqlite file')
+    def clusters(inputs, threshold, output, workers, parse_cache_path):
+        """Report clusters of near-identical resumes in INPUTS (files, directories or globs)."""
+        from batch_analyzer import collect_resume_files
+        paths = collect_resume_files(inputs)
+        if parse_cache_path:
+            from parse_cache import ParseCache
+            ParseCache(parse_cache_path)  # create the schema before workers race to do it
+
+        signatures = []
+        with Pool(workers, initializer=_init_worker, initargs=(parse_cache_path,)) as pool:
+            for path, data, error in pool.imap(_signature_of_file, paths, 16):
+                if error:
+                    click.echo(f"Error: {path}: {error}", err=True)
+                    continue
+                signature = array('Q')
+                signature.frombytes(data)
+                signatures.append((path, signature))
+
+        found = find_clusters(signatures, threshold)
+        result = {'threshold': threshold, 'resumes': len(signatures),
+                  'duplicates': sum(len(members) - 1 for members in found), 'clusters': found}
+        if output:
+            with open(output, 'w', encoding='utf-8') as f:
+                json.dump(result, f, indent=2)
+        else:
+            click.echo(json.dumps(result, indent=2))
+        click.echo(f"{len(found)} cluster(s) covering {sum(map(len, found))} of {len(signatures)} resume(s)",
+                   err=True)
+
+    commands()
+
+
+if __name__ == '__main__':
+    cli()
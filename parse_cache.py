@@ -0,0 +1,180 @@
+"""
+Parse Cache - Persistent store of extracted resume text keyed by file digest
+"""
+import hashlib
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+
+class ParseCache:
+    """
+    Sqlite store of text extracted by ResumeParser.
+
+    Entries are keyed on the SHA-256 of the file content plus the parser
+    version, so analyzer or keyword changes can be re-run over an archive
+    without decoding a single PDF again, while parser changes invalidate
+    old text automatically.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        # WAL lets batch workers read while another process writes
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS extracted_text ('
+            'digest TEXT NOT NULL, parser_version TEXT NOT NULL, text TEXT NOT NULL, '
+            'created_at REAL NOT NULL, PRIMARY KEY (digest, parser_version))'
+        )
+        self._db.commit()
+        self.hits = 0
+        self.misses = 0
+
+    def reopen(self):
+        """Give this process its own sqlite connection (call in a forked child)"""
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+
+    @staticmethod
+    def digest(content: bytes) -> str:
+        """Content hash used as the cache key"""
+        return hashlib.sha256(content).hexdigest()
+
+    def get(self, digest: str, parser_version: str) -> Optional[str]:
+        """Return cached text, or None on a miss"""
+        with self._lock:
+            row = self._db.execute(
+                'SELECT text FROM extracted_text WHERE digest = ? AND parser_version = ?',
+                (digest, parser_version)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return row[0]
+
+    def set(self, digest: str, parser_version: str, text: str):
+        """Store extracted text"""
+        with self._lock:
+            self._db.execute(
+                'INSERT OR REPLACE INTO extracted_text (digest, parser_version, text, created_at) '
+                'VALUES (?, ?, ?, ?)',
+                (digest, parser_version, text, time.time())
+            )
+            self._db.commit()
+
+    def prune(self, current_version: Optional[str] = None, max_age: Optional[float] = None) -> int:
+        """
+        Remove stale entries and return how many were deleted.
+
+        Args:
+            current_version: Drop text produced by any other parser version
+                             (entries are stored as '<version>:<extension>')
+            max_age: Drop entries older than this many seconds
+        """
+        removed = 0
+        with self._lock:
+            if current_version is not None:
+                removed += self._db.execute(
+                    'DELETE FROM extracted_text WHERE parser_version NOT LIKE ?',
+                    (f'{current_version}:%',)
+                ).rowcount
+            if max_age is not None:
+                removed += self._db.execute(
+                    'DELETE FROM extracted_text WHERE created_at < ?', (time.time() - max_age,)
+                ).rowcount
+            self._db.commit()
+        if removed:
+            self._db.execute('VACUUM')
+        return removed
+
+    def stats(self) -> Dict:
+        """Entry count and hit/miss counters"""
+        with self._lock:
+            entries = self._db.execute('SELECT COUNT(*) FROM extracted_text').fetchone()[0]
+            return {'entries': entries, 'hits': self.hits, 'misses': self.misses, 'path': self.path}
+
+
+# Parser owned by a cache-warming worker process, set by _init_warm_worker
+_warm_parser = None
+
+
+def _init_warm_worker(path: str, max_pages: Optional[int], max_chars: Optional[int], pdf_backend: str):
+    global _warm_parser
+    from resume_parser import ResumeParser
+    _warm_parser = ResumeParser(cache=ParseCache(path), max_pages=max_pages, max_chars=max_chars,
+                                pdf_backend=pdf_backend, parallel_pages=None)
+
+
+def _warm_file(file_path: str) -> Optional[str]:
+    """Extract one file into the cache; returns an error message on failure"""
+    try:
+        _warm_parser.parse(file_path)
+        return None
+    except Exception as e:
+        return f'{file_path}: {e}'
+
+
+def cli():
+    """Command-line entry point: python parse_cache.py {warm,prune,stats} ..."""
+    import click
+    from multiprocessing import Pool
+    from pdf_backends import PDF_BACKENDS
+
+    @click.group()
+    def commands():
+        """Manage the extracted-text cache used by ResumeParser."""
+
+    @commands.command()
+    @click.argument('inputs', nargs=-1, required=True)
+    @click.option('--cache', 'cache_path', required=True, type=click.Path(dir_okay=False), help='Sqlite cache file')
+    @click.option('--workers', '-w', type=int, default=None, help='Worker processes (default: CPU count)')
+    @click.option('--max-pages', type=int, default=40, show_default=True,
+                  help="Page budget; match the app's PDF_MAX_PAGES (0 = no limit)")
+    @click.option('--max-chars', type=int, default=200000, show_default=True,
+                  help="Character budget; match the app's MAX_TEXT_CHARS (0 = no limit)")
+    @click.option('--pdf-backend', type=click.Choice(('auto',) + PDF_BACKENDS), default='auto', show_default=True,
+                  help="PDF text extractor; match the app's PDF_BACKEND")
+    def warm(inputs, cache_path, workers, max_pages, max_chars, pdf_backend):
+        """
+        Extract text from every resume in INPUTS (files, directories or globs) into the cache.
+
+        Entries are keyed on the budgets and PDF backend, so only a warm run with the
+        same settings as the reader (the web app by default) saves it any work.
+        """
+        from batch_analyzer import collect_resume_files
+        paths = collect_resume_files(inputs)
+        ParseCache(cache_path)  # create the schema before workers race to do it
+        failed = 0
+        options = (max_pages or None, max_chars or None, pdf_backend)
+        with Pool(workers, initializer=_init_warm_worker, initargs=(cache_path,) + options) as pool:
+            for error in pool.imap_unordered(_warm_file, paths, 8):
+                if error:
+                    failed += 1
+                    click.echo(f"Error: {error}", err=True)
+        click.echo(f"Warmed {len(paths) - failed} of {len(paths)} file(s) into {cache_path}")
+
+    @commands.command()
+    @click.option('--cache', 'cache_path', required=True, type=click.Path(exists=True, dir_okay=False), help='Sqlite cache file')
+    @click.option('--older-than', type=float, default=None, help='Also remove entries older than this many days')
+    def prune(cache_path, older_than):
+        """Remove text extracted by other parser versions (and optionally old entries)."""
+        from resume_parser import PARSER_VERSION
+        max_age = older_than * 86400 if older_than is not None else None
+        removed = ParseCache(cache_path).prune(current_version=PARSER_VERSION, max_age=max_age)
+        click.echo(f"Removed {removed} entr{'y' if removed == 1 else 'ies'} from {cache_path}")
+
+    @commands.command()
+    @click.option('--cache', 'cache_path', required=True, type=click.Path(exists=True, dir_okay=False), help='Sqlite cache file')
+    def stats(cache_path):
+        """Show how many extracted texts the cache holds."""
+        click.echo(f"{ParseCache(cache_path).stats()['entries']} cached text(s) in {cache_path}")
+
+    commands()
+
+
+if __name__ == '__main__':
+    cli()
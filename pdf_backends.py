@@ -0,0 +1,188 @@
+"""
+PDF Backends - Interchangeable page-text extractors for ResumeParser
+"""
+import importlib.util
+import io
+import threading
+from typing import TYPE_CHECKING, BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+PDF_BACKENDS = ('pypdfium2', 'pymupdf', 'pypdf2', 'pypdf')
+
+# Preference order for 'auto': native extractors first, then PyPDF2. pypdf is only
+# used when asked for by name; on resume-sized documents it is slower than PyPDF2.
+AUTO_BACKENDS = ('pypdfium2', 'pymupdf', 'pypdf2')
+
+# Modules that provide each backend (any one will do), and the package to install for it
+_REQUIREMENTS = {
+    'pypdfium2': (('pypdfium2',), 'pypdfium2'),
+    'pymupdf': (('pymupdf', 'fitz'), 'PyMuPDF'),
+    'pypdf2': (('PyPDF2',), 'PyPDF2'),
+    'pypdf': (('pypdf',), 'pypdf'),
+}
+
+
+def is_available(backend: str) -> bool:
+    """Whether the backend's library is installed (checked without importing it)"""
+    return any(importlib.util.find_spec(module) is not None for module in _REQUIREMENTS[backend][0])
+
+
+def missing_message(backend: str) -> str:
+    """Error message for a backend whose library is not installed"""
+    package = _REQUIREMENTS[backend][1]
+    return f"{package} is required for the '{backend}' PDF backend. Install it with: pip install {package}"
+
+
+def available_backends() -> List[str]:
+    """Every installed backend"""
+    return [backend for backend in PDF_BACKENDS if is_available(backend)]
+
+
+def resolve_backend(name: Optional[str] = 'auto') -> str:
+    """
+    Turn a configured backend name into the one to use.
+
+    'auto' (or None) picks the fastest installed backend, falling back to
+    PyPDF2. Raises ValueError for unknown names and ImportError when a named
+    backend is not installed.
+    """
+    name = (name or 'auto').lower()
+    if name == 'auto':
+        return next((backend for backend in AUTO_BACKENDS if is_available(backend)), 'pypdf2')
+    if name not in _REQUIREMENTS:
+        raise ValueError(f"Unknown PDF backend: {name}. Choose from: auto, {', '.join(PDF_BACKENDS)}")
+    if not is_available(name):
+        raise ImportError(missing_message(name))
+    return name
+
+
+def open_pdf(fileobj: BinaryIO, backend: str):
+    """Open a PDF with the given backend; the document supports len(), page_text(index) and close()"""
+    return _DOCUMENTS[backend](fileobj)
+
+
+def iter_pdf_pages(fileobj: BinaryIO, backend: str, max_pages: Optional[int] = None) -> Iterator[str]:
+    """Yield the text of each page in order, stopping after max_pages"""
+    document = open_pdf(fileobj, backend)
+    try:
+        page_count = len(document) if max_pages is None else min(len(document), max_pages)
+        for index in range(page_count):
+            yield document.page_text(index)
+    finally:
+        document.close()
+
+
+def iter_pdf_pages_parallel(data: bytes, backend: str, page_count: int,
+                            workers: int) -> Iterator[str]:
+    """
+    Yield the text of the first page_count pages, extracted by a process pool.
+
+    Pages are split into contiguous ranges, a couple per worker so a slow
+    range does not hold up the rest; each worker opens the document itself.
+    Pages come back in document order.
+    """
+    range_count = min(page_count, workers * 2)
+    bounds = [page_count * i // range_count for i in range(range_count + 1)]
+    tasks = [(data, backend, start, stop) for start, stop in zip(bounds, bounds[1:])]
+    for texts in _page_pool(workers).map(_extract_page_range, tasks):
+        yield from texts
+
+
+# Process pools for parallel page extraction, created on first use and kept per worker count
+_page_pools: Dict[int, 'ProcessPoolExecutor'] = {}
+_page_pools_lock = threading.Lock()
+
+
+def _page_pool(workers: int) -> 'ProcessPoolExecutor':
+    with _page_pools_lock:
+        pool = _page_pools.get(workers)
+        if pool is None:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            # The pool starts from a request thread of a process that runs other threads
+            # (job pool, analysis store writer); forking it could copy a lock another
+            # thread holds, so workers come from a fork server (or are spawned)
+            method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            pool = _page_pools[workers] = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context(method))
+        return pool
+
+
+def _extract_page_range(task: Tuple[bytes, str, int, int]) -> List[str]:
+    data, backend, start, stop = task
+    document = open_pdf(io.BytesIO(data), backend)
+    try:
+        return [document.page_text(index) for index in range(start, stop)]
+    finally:
+        document.close()
+
+
+class _PyPDF2Document:
+    def __init__(self, fileobj: BinaryIO):
+        import PyPDF2
+        self._pages = PyPDF2.PdfReader(fileobj).pages
+
+    def __len__(self) -> int:
+        return len(self._pages)
+
+    def page_text(self, index: int) -> str:
+        return self._pages[index].extract_text()
+
+    def close(self):
+        pass
+
+
+class _PypdfDocument(_PyPDF2Document):
+    def __init__(self, fileobj: BinaryIO):
+        import pypdf
+        self._pages = pypdf.PdfReader(fileobj).pages
+
+
+class _PyMuPDFDocument:
+    def __init__(self, fileobj: BinaryIO):
+        try:
+            import pymupdf
+        except ImportError:
+            import fitz as pymupdf  # PyMuPDF before 1.24
+        self._document = pymupdf.open(stream=fileobj.read(), filetype='pdf')
+
+    def __len__(self) -> int:
+        return self._document.page_count
+
+    def page_text(self, index: int) -> str:
+        # PyMuPDF ends every line, including the last, with a newline
+        return self._document[index].get_text().rstrip('\n')
+
+    def close(self):
+        self._document.close()
+
+
+class _PdfiumDocument:
+    def __init__(self, fileobj: BinaryIO):
+        import pypdfium2
+        self._document = pypdfium2.PdfDocument(fileobj.read())
+
+    def __len__(self) -> int:
+        return len(self._document)
+
+    def page_text(self, index: int) -> str:
+        page = self._document[index]
+        text_page = page.get_textpage()
+        text = text_page.get_text_range()
+        text_page.close()
+        page.close()
+        # PDFium separates lines with CRLF
+        return text.replace('\r\n', '\n').replace('\r', '\n')
+
+    def close(self):
+        self._document.close()
+
+
+_DOCUMENTS = {
+    'pypdfium2': _PdfiumDocument,
+    'pymupdf': _PyMuPDFDocument,
+    'pypdf2': _PyPDF2Document,
+    'pypdf': _PypdfDocument,
+}
@@ -0,0 +1,39 @@
+"""
+PDF Fixture - Writes text as a minimal PDF, for warm-up and benchmarks
+"""
+
+
+def _pdf_escape(line: str) -> str:
+    return line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def pdf_bytes(text: str, lines_per_page: int = 55) -> bytes:
+    """Text as a minimal multi-page PDF using only the standard Helvetica font"""
+    lines = text.split('\n')
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+    objects = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        ('<< /Type /Pages /Kids [%s] /Count %d >>' % (
+            ' '.join(f'{4 + 2 * i} 0 R' for i in range(len(pages))), len(pages))).encode(),
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>',
+    ]
+    for index, page_lines in enumerate(pages):
+        content = 'BT /F1 10 Tf 12 TL 50 750 Td ' + ' '.join(
+            f'({_pdf_escape(line)}) Tj T*' for line in page_lines) + ' ET'
+        data = content.encode('latin-1', 'replace')
+        objects.append((
+            '<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+            f'/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * index} 0 R >>').encode())
+        objects.append(b'<< /Length %d >>\nstream\n' % len(data) + data + b'\nendstream')
+
+    output = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, obj in enumerate(objects, 1):
+        offsets.append(len(output))
+        output += b'%d 0 obj\n' % number + obj + b'\nendobj\n'
+    xref_at = len(output)
+    output += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    for offset in offsets:
+        output += b'%010d 00000 n \n' % offset
+    output += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref_at)
+    return bytes(output)
@@ -0,0 +1,175 @@
+"""
+Result Cache - Content-addressed cache of analysis results
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+
+class ResultCache:
+    """
+    Two-tier cache of JSON-serializable analysis results.
+
+    Keys are built from the uploaded file's content hash, the faculty and the
+    analyzer ruleset version, so a result is reused only for an identical file
+    analyzed by identical rules. The in-memory tier is a bounded LRU; the
+    optional sqlite tier survives restarts and is shared between processes.
+    Both tiers expire entries after ttl seconds.
+    """
+
+    def __init__(self, max_entries: int = 512, ttl: Optional[float] = 3600,
+                 path: Optional[str] = None, max_disk_entries: int = 100000):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.path = path
+        self.max_disk_entries = max_disk_entries
+        self._memory: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._disk_writes = 0
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS results ('
+                'key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)'
+            )
+            self._db.execute('CREATE INDEX IF NOT EXISTS results_created_at ON results (created_at)')
+            self._db.commit()
+
+    def reopen(self):
+        """
+        Give this process its own sqlite connection.
+
+        Call in a forked child (e.g. a gunicorn worker of a preloaded app):
+        a connection must not be shared across fork. The memory tier is kept.
+        """
+        self._lock = threading.Lock()
+        if self.path:
+            self._db = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+
+    @staticmethod
+    def make_key(content: bytes, faculty: Optional[str], ruleset_version: str,
+                 namespace: str = 'analyze') -> str:
+        """Build a cache key from file content, faculty and ruleset version"""
+        return ResultCache.key_for_digest(ResultCache.digest(content), faculty, ruleset_version, namespace)
+
+    @staticmethod
+    def digest(content: bytes) -> str:
+        """Content hash used in keys (also identifies an upload in the near-duplicate index)"""
+        return hashlib.sha256(content).hexdigest()
+
+    @staticmethod
+    def key_for_digest(digest: str, faculty: Optional[str], ruleset_version: str,
+                       namespace: str = 'analyze') -> str:
+        """make_key for content known only by its digest"""
+        return f'{namespace}:{ruleset_version}:{faculty or "-"}:{digest}'
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return self.ttl is not None and now - created_at > self.ttl
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the cached value for key, or None on a miss"""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                created_at, value = entry
+                if not self._expired(created_at, now):
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._memory[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    'SELECT value, created_at FROM results WHERE key = ?', (key,)
+                ).fetchone()
+                if row is not None and not self._expired(row[1], now):
+                    value = json.loads(row[0])
+                    self._remember(key, row[1], value)
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return value
+
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value: Dict):
+        """Store a JSON-serializable value in every tier"""
+        now = time.time()
+        with self._lock:
+            self._remember(key, now, value)
+            if self._db is not None:
+                self._db.execute(
+                    'INSERT OR REPLACE INTO results (key, value, created_at) VALUES (?, ?, ?)',
+                    (key, json.dumps(value), now)
+                )
+                self._db.commit()
+                self._disk_writes += 1
+                trim_disk = self._disk_writes % 1000 == 0
+            else:
+                trim_disk = False
+        # Keep the disk tier bounded without paying for a trim on every write
+        if trim_disk:
+            self.prune()
+
+    def _remember(self, key: str, created_at: float, value: Dict):
+        """Insert into the memory tier, evicting least recently used entries"""
+        self._memory[key] = (created_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def prune(self) -> int:
+        """Drop expired entries and trim the disk tier to max_disk_entries; returns rows removed"""
+        now = time.time()
+        removed = 0
+        with self._lock:
+            for key in [k for k, (created_at, _) in self._memory.items() if self._expired(created_at, now)]:
+                del self._memory[key]
+            if self._db is not None:
+                if self.ttl is not None:
+                    removed += self._db.execute(
+                        'DELETE FROM results WHERE created_at < ?', (now - self.ttl,)
+                    ).rowcount
+                removed += self._db.execute(
+                    'DELETE FROM results WHERE key IN ('
+                    'SELECT key FROM results ORDER BY created_at DESC LIMIT -1 OFFSET ?)',
+                    (self.max_disk_entries,)
+                ).rowcount
+                self._db.commit()
+        self.evictions += removed
+        return removed
+
+    def clear(self):
+        """Remove every entry from both tiers"""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute('DELETE FROM results')
+                self._db.commit()
+
+    def stats(self) -> Dict:
+        """Hit/miss counters and tier sizes"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'memory_entries': len(self._memory),
+                'max_entries': self.max_entries,
+                'ttl': self.ttl,
+                'disk_path': self.path,
+            }
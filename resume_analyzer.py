@@ -1,21 +1,143 @@
 """
 Resume Analyzer - Core analysis logic for evaluating resumes
 """
+import hashlib
+import json
 import re
-from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from keyword_matcher import KeywordMatcher, KeywordMatches
+from rule_catalogue import RULE_CATALOGUE
+from section_index import SectionIndex
+from scoring import ScoreCard, faculty_adjustment_for
 
 # Faculty options for degree-based rating
 VALID_FACULTIES = ('sciences', 'engineering', 'arts', 'business')
 
+# Bump whenever rule logic changes so results cached under older rules are not reused.
+# Vocabulary changes are picked up automatically by ResumeAnalyzer.ruleset_version.
+RULESET_VERSION = '5'
+
+# Patterns are compiled once at import time and shared by every analysis
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+PHONE_PATTERN = re.compile(r'[\d\s\-\(\)\+]{10,}')
+# Three blank lines in a row; found with a substring test, which is much faster than a regex
+BLANK_LINES = '\n' * 4
+QUANTIFIED_PATTERN = re.compile(r'\d+%|\d+\s*(years?|months?)|[$]\d+|\d+\+')
+
+# Sections where achievements are described; action verbs are counted there when present
+ACHIEVEMENT_SECTIONS = ('experience', 'projects')
+
 
-@dataclass
 class Issue:
-    """Represents an issue found in the resume"""
-    severity: str  # 'critical', 'warning', 'suggestion'
-    category: str  # 'formatting', 'content', 'keywords', 'structure'
-    message: str
-    suggestion: str
+    """
+    Represents an issue found in the resume.
+    
+    Only the catalogue rule id and the values its templates need are stored;
+    severity and category are shared from the catalogue, and message and
+    suggestion are rendered when read.
+    """
+    __slots__ = ('rule_id', 'params')
+    
+    def __init__(self, rule_id: str, params: Optional[Dict] = None):
+        self.rule_id = rule_id
+        self.params = params
+    
+    @property
+    def severity(self) -> str:
+        return RULE_CATALOGUE[self.rule_id].severity
+    
+    @property
+    def category(self) -> str:
+        return RULE_CATALOGUE[self.rule_id].category
+    
+    @property
+    def message(self) -> str:
+        return self._render(RULE_CATALOGUE[self.rule_id].message)
+    
+    @property
+    def suggestion(self) -> str:
+        return self._render(RULE_CATALOGUE[self.rule_id].suggestion)
+    
+    def _render(self, template: str) -> str:
+        return template.format_map(self.params) if self.params else template
+    
+    def to_dict(self) -> Dict:
+        """JSON-serializable form; 'params' is present only for templated rules"""
+        spec = RULE_CATALOGUE[self.rule_id]
+        data = {
+            'rule': self.rule_id,
+            'severity': spec.severity,
+            'category': spec.category,
+            'message': self._render(spec.message),
+            'suggestion': self._render(spec.suggestion)
+        }
+        if self.params:
+            data['params'] = self.params
+        return data
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Issue':
+        """Rebuild an issue from to_dict() output"""
+        return cls(data['rule'], data.get('params'))
+    
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Issue):
+            return NotImplemented
+        return self.rule_id == other.rule_id and self.params == other.params
+    
+    def __repr__(self) -> str:
+        if self.params:
+            return f'Issue({self.rule_id!r}, {self.params!r})'
+        return f'Issue({self.rule_id!r})'
+
+
+def is_too_short(resume_text: str) -> bool:
+    """Too little text for the rules to say anything useful"""
+    return not resume_text or len(resume_text.strip()) < 100
+
+
+class AnalysisContext:
+    """Lowercased text, lines, section index and keyword hits derived once and shared by every rule"""
+    
+    def __init__(self, text: str, faculty: Optional[str] = None,
+                 keyword_matcher: Optional[KeywordMatcher] = None, job=None):
+        self.text = text
+        self.faculty = faculty
+        self.job = job  # Optional job_matcher.JobIndex to match against
+        self.job_match = None  # its JobMatch, set by the job match rule
+        self.text_lower = text.lower()
+        self.lines = text.split('\n')
+        
+        # Headings, sections, bullets, word and long-line counts, shared by the rules
+        self.index = SectionIndex.from_text(text, self.lines)
+        self.word_count = self.index.word_count
+        self.long_line_count = self.index.long_line_count
+        
+        # Whole-word hits for every keyword vocabulary, from one automaton pass
+        if keyword_matcher is not None:
+            self.keywords = keyword_matcher.match(self.text_lower)
+        else:
+            self.keywords = KeywordMatches({})
+    
+    def found_in_sections(self, kinds: Sequence[str], group: str) -> int:
+        """Number of distinct terms of a vocabulary group found inside sections of the given kinds"""
+        spans = [self.index.span(section) for section in self.index.sections_of(kinds)]
+        return self.keywords.found_within(group, spans)
+
+
+# Analyzer owned by a pool worker process, set by _init_worker
+_worker_analyzer = None
+
+
+def _init_worker(analyzer: 'ResumeAnalyzer'):
+    global _worker_analyzer
+    _worker_analyzer = analyzer
+
+
+def _analyze_in_worker(task: Tuple[str, Optional[str]]) -> List[Issue]:
+    resume_text, faculty = task
+    return _worker_analyzer.analyze(resume_text, faculty=faculty)
 
 
 class ResumeAnalyzer:
@@ -38,6 +160,8 @@ class ResumeAnalyzer:
             'maybe', 'somewhat', 'kind of', 'sort of'
         ]
         
+        self.personal_pronouns = ['i', 'me', 'my', 'we', 'our']
+        
         # Faculty-specific keywords that strengthen the resume for that field
         self.faculty_keywords = {
             'sciences': ['research', 'publication', 'lab', 'methodology', 'data analysis', 'experiment', 'journal', 'hypothesis', 'peer-reviewed'],
@@ -45,8 +169,34 @@ class ResumeAnalyzer:
             'arts': ['portfolio', 'creative', 'exhibition', 'design', 'curation', 'visual', 'installation', 'commission', 'collaboration'],
             'business': ['revenue', 'growth', 'strategy', 'management', 'leadership', 'budget', 'client', 'sales', 'marketing', 'analytics', 'roi', 'kpi'],
         }
+        
+        # One automaton over every vocabulary; each list is a named group
+        vocabularies = {'action_verbs': self.action_verbs, 'weak_words': self.weak_words,
+                        'pronouns': self.personal_pronouns}
+        for faculty, keywords in self.faculty_keywords.items():
+            vocabularies[f'faculty:{faculty}'] = keywords
+        self.keyword_matcher = KeywordMatcher(vocabularies)
+        
+        # Identifies the rules and vocabularies that produced a result (used as a cache key)
+        vocabulary_digest = hashlib.sha1(
+            json.dumps(vocabularies, sort_keys=True).encode('utf-8')
+        ).hexdigest()[:12]
+        self.ruleset_version = f'{RULESET_VERSION}-{vocabulary_digest}'
+        
+        # Rules run in this order against a shared AnalysisContext
+        self.rules = [
+            self._check_essential_sections,
+            self._check_formatting,
+            self._check_content_quality,
+            self._check_keywords,
+            self._check_structure,
+            self._check_common_mistakes,
+            self._check_faculty_fit,
+            self._check_job_match,
+        ]
     
-    def analyze(self, resume_text: str, faculty: Optional[str] = None) -> List[Issue]:
+    def analyze(self, resume_text: str, faculty: Optional[str] = None,
+                rule_timings: Optional[Dict[str, float]] = None, job=None) -> List[Issue]:
         """
         Analyze resume text and return list of issues.
         
@@ -54,82 +204,103 @@ class ResumeAnalyzer:
             resume_text: The extracted text from the resume
             faculty: Optional field of degree - 'sciences', 'engineering', 'arts', or 'business'
                      Used to tailor checks and rating.
+            rule_timings: Optional dict that receives the seconds spent in each rule
+            job: Optional job_matcher.JobIndex; missing posting terms are reported as keyword issues
         Returns:
             List of Issue objects
         """
-        issues = []
-        
-        if not resume_text or len(resume_text.strip()) < 100:
-            issues.append(Issue(
-                severity='critical',
-                category='content',
-                message='Resume appears to be too short or empty',
-                suggestion='Ensure your resume contains substantial content (at least 100 words)'
-            ))
-            return issues
-        
-        # Check for essential sections
-        issues.extend(self._check_essential_sections(resume_text))
-        
-        # Check formatting
-        issues.extend(self._check_formatting(resume_text))
-        
-        # Check content quality
-        issues.extend(self._check_content_quality(resume_text))
+        return self.evaluate(resume_text, faculty, rule_timings, job).issues
+    
+    def evaluate(self, resume_text: str, faculty: Optional[str] = None,
+                 rule_timings: Optional[Dict[str, float]] = None, job=None) -> ScoreCard:
+        """
+        Analyze resume text and score it in the same pass.
         
-        # Check for keywords and action verbs
-        issues.extend(self._check_keywords(resume_text))
+        Args:
+            resume_text: The extracted text from the resume
+            faculty: Optional field of degree used to tailor checks and rating
+            rule_timings: Optional dict that receives the seconds spent in each rule
+            job: Optional job_matcher.JobIndex to match the resume against
+        Returns:
+            ScoreCard with the issues, severity/category counts, deductions,
+            faculty adjustment and final score
+        """
+        if is_too_short(resume_text):
+            return ScoreCard.from_issues([Issue('too_short')], faculty,
+                                         self.get_faculty_score_adjustment(resume_text, faculty))
         
-        # Check structure
-        issues.extend(self._check_structure(resume_text))
+        # Tokenize once, then evaluate every rule against the shared context
+        context = AnalysisContext(resume_text, faculty, self.keyword_matcher, job)
+        return self.evaluate_context(context, rule_timings)
+    
+    def evaluate_context(self, context: AnalysisContext,
+                         rule_timings: Optional[Dict[str, float]] = None) -> ScoreCard:
+        """Run every rule against an already built context and score the result"""
+        issues = []
+        faculty = context.faculty
+        if rule_timings is None:
+            for rule in self.rules:
+                issues.extend(rule(context))
+        else:
+            for rule in self.rules:
+                start = time.perf_counter()
+                issues.extend(rule(context))
+                rule_timings[rule.__name__] = time.perf_counter() - start
+        
+        # Faculty keywords were already counted while building the context
+        faculty_adjustment = 0
+        if faculty in VALID_FACULTIES:
+            faculty_adjustment = faculty_adjustment_for(context.keywords.found(f'faculty:{faculty}'))
+        
+        scorecard = ScoreCard.from_issues(issues, faculty, faculty_adjustment)
+        scorecard.job_match = context.job_match
+        return scorecard
+    
+    def analyze_many(self, resume_texts: Iterable[str], faculty: Optional[str] = None,
+                     workers: Optional[int] = None, chunksize: int = 16) -> Iterator[List[Issue]]:
+        """
+        Analyze many resume texts, yielding issue lists in input order as they are ready.
         
-        # Check for common mistakes
-        issues.extend(self._check_common_mistakes(resume_text))
+        Args:
+            resume_texts: Iterable of extracted resume texts
+            faculty: Optional field of degree applied to every resume
+            workers: Number of worker processes (None = CPU count, 1 = run in this process)
+            chunksize: Number of resumes sent to a worker at a time
+        Returns:
+            Iterator of lists of Issue objects
+        """
+        if workers == 1:
+            for resume_text in resume_texts:
+                yield self.analyze(resume_text, faculty=faculty)
+            return
         
-        # Faculty-specific checks (adds issues if resume doesn't match field)
-        if faculty and faculty in VALID_FACULTIES:
-            issues.extend(self._check_faculty_fit(resume_text, faculty))
+        from multiprocessing import Pool
         
-        return issues
+        # Each worker receives a copy of this analyzer once, not once per resume
+        with Pool(workers, initializer=_init_worker, initargs=(self,)) as pool:
+            tasks = ((resume_text, faculty) for resume_text in resume_texts)
+            yield from pool.imap(_analyze_in_worker, tasks, chunksize)
     
-    def _check_faculty_fit(self, text: str, faculty: str) -> List[Issue]:
+    def _check_faculty_fit(self, context: AnalysisContext) -> List[Issue]:
         """Add suggestions when resume is missing faculty-relevant content."""
         issues = []
-        text_lower = text.lower()
-        keywords = self.faculty_keywords.get(faculty, [])
-        found = sum(1 for k in keywords if k in text_lower)
-        
-        if faculty == 'sciences' and found < 2:
-            issues.append(Issue(
-                severity='suggestion',
-                category='keywords',
-                message='Few science-specific terms for a Sciences profile',
-                suggestion='Highlight research, publications, lab work, methodology, or data analysis to strengthen your resume for science roles.'
-            ))
-        elif faculty == 'engineering' and found < 2:
-            issues.append(Issue(
-                severity='suggestion',
-                category='keywords',
-                message='Few engineering-specific terms for an Engineering profile',
-                suggestion='Highlight technical skills, projects, tools, and concrete outcomes to better match engineering expectations.'
-            ))
-        elif faculty == 'arts' and found < 2:
-            issues.append(Issue(
-                severity='suggestion',
-                category='keywords',
-                message='Few arts/creative terms for an Arts profile',
-                suggestion='Include portfolio work, exhibitions, creative projects, or collaborative work to align with arts and design roles.'
-            ))
-        elif faculty == 'business' and found < 2:
-            issues.append(Issue(
-                severity='suggestion',
-                category='keywords',
-                message='Few business-specific terms for a Business profile',
-                suggestion='Highlight leadership, strategy, revenue, growth, client work, or metrics (e.g. ROI, KPIs) to strengthen your resume for business roles.'
-            ))
+        faculty = context.faculty
+        if not faculty or faculty not in VALID_FACULTIES:
+            return issues
+        found = context.keywords.found(f'faculty:{faculty}')
+        
+        if found < 2:
+            issues.append(Issue(f'faculty_fit:{faculty}'))
         
         return issues
     
+    def _check_job_match(self, context: AnalysisContext) -> List[Issue]:
+        """Report job posting terms the resume does not cover"""
+        if context.job is None:
+            return []
+        context.job_match = context.job.match_text(context.text)
+        return context.job_match.issues()
+    
     def get_faculty_score_adjustment(self, resume_text: str, faculty: Optional[str]) -> int:
         """
         Returns a score adjustment (-2 to +5) based on how well the resume
@@ -137,226 +308,117 @@ class ResumeAnalyzer:
         """
         if not resume_text or not faculty or faculty not in VALID_FACULTIES:
             return 0
-        text_lower = resume_text.lower()
-        keywords = self.faculty_keywords.get(faculty, [])
-        found = sum(1 for k in keywords if k in text_lower)
-        if found >= 4:
-            return 5
-        if found >= 3:
-            return 3
-        if found >= 2:
-            return 1
-        if found >= 1:
-            return 0
-        return -2
+        found = self.keyword_matcher.match(resume_text.lower()).found(f'faculty:{faculty}')
+        return faculty_adjustment_for(found)
     
-    def _check_essential_sections(self, text: str) -> List[Issue]:
+    def _check_essential_sections(self, context: AnalysisContext) -> List[Issue]:
         """Check if essential sections are present"""
         issues = []
-        text_lower = text.lower()
         
         # Check for contact information
-        has_email = bool(re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text))
-        has_phone = bool(re.search(r'[\d\s\-\(\)\+]{10,}', text))
+        has_email = bool(EMAIL_PATTERN.search(context.text))
+        has_phone = bool(PHONE_PATTERN.search(context.text))
         
         if not has_email:
-            issues.append(Issue(
-                severity='critical',
-                category='content',
-                message='Email address not found',
-                suggestion='Add a professional email address in your contact section'
-            ))
+            issues.append(Issue('missing_email'))
         
         if not has_phone:
-            issues.append(Issue(
-                severity='warning',
-                category='content',
-                message='Phone number not found',
-                suggestion='Consider adding a phone number for better contact options'
-            ))
-        
-        # Check for experience section
-        if not re.search(r'\b(experience|work\s+history|employment|professional\s+experience)\b', text_lower):
-            issues.append(Issue(
-                severity='critical',
-                category='structure',
-                message='Experience section not clearly identified',
-                suggestion='Add a clear "Experience" or "Work History" section'
-            ))
+            issues.append(Issue('missing_phone'))
+        
+        # Check for experience section (a heading such as "Experience" or "Work History")
+        if not context.index.has('experience'):
+            issues.append(Issue('missing_experience'))
         
         # Check for education section
-        if not re.search(r'\b(education|academic|qualifications|degree)\b', text_lower):
-            issues.append(Issue(
-                severity='warning',
-                category='structure',
-                message='Education section not clearly identified',
-                suggestion='Add a clear "Education" section listing your degrees and institutions'
-            ))
+        if not context.index.has('education'):
+            issues.append(Issue('missing_education'))
         
         return issues
     
-    def _check_formatting(self, text: str) -> List[Issue]:
+    def _check_formatting(self, context: AnalysisContext) -> List[Issue]:
         """Check formatting issues"""
         issues = []
         
         # Check for consistent spacing
-        if re.search(r'\n{4,}', text):
-            issues.append(Issue(
-                severity='warning',
-                category='formatting',
-                message='Excessive blank lines detected',
-                suggestion='Remove extra blank lines to improve readability'
-            ))
+        if BLANK_LINES in context.text:
+            issues.append(Issue('excess_blank_lines'))
         
         # Check for very long lines (potential formatting issues)
-        lines = text.split('\n')
-        long_lines = [line for line in lines if len(line) > 100]
-        if len(long_lines) > len(lines) * 0.3:
-            issues.append(Issue(
-                severity='suggestion',
-                category='formatting',
-                message='Many lines are very long',
-                suggestion='Consider breaking long lines for better readability'
-            ))
+        if context.long_line_count > len(context.lines) * 0.3:
+            issues.append(Issue('long_lines'))
         
         # Check for inconsistent bullet points
-        bullet_patterns = [r'^[\-\•\*]\s', r'^\d+[\.\)]\s']
-        has_bullets = any(re.search(pattern, text, re.MULTILINE) for pattern in bullet_patterns)
-        if not has_bullets and len(text.split('\n')) > 10:
-            issues.append(Issue(
-                severity='suggestion',
-                category='formatting',
-                message='Consider using bullet points for better readability',
-                suggestion='Use bullet points (•, -, or *) to organize your experience and skills'
-            ))
+        if not context.index.bullet_lines and len(context.lines) > 10:
+            issues.append(Issue('no_bullets'))
         
         return issues
     
-    def _check_content_quality(self, text: str) -> List[Issue]:
+    def _check_content_quality(self, context: AnalysisContext) -> List[Issue]:
         """Check content quality issues"""
         issues = []
-        text_lower = text.lower()
         
-        # Check for action verbs
-        action_verb_count = sum(1 for verb in self.action_verbs if verb in text_lower)
+        # Check for action verbs, where achievements are described if the resume has such sections
+        if any(context.index.has(kind) for kind in ACHIEVEMENT_SECTIONS):
+            action_verb_count = context.found_in_sections(ACHIEVEMENT_SECTIONS, 'action_verbs')
+        else:
+            action_verb_count = context.keywords.found('action_verbs')
         if action_verb_count < 3:
-            issues.append(Issue(
-                severity='warning',
-                category='content',
-                message='Limited use of action verbs',
-                suggestion=f'Use more action verbs (found {action_verb_count}). Examples: achieved, managed, developed, implemented, created'
-            ))
+            issues.append(Issue('few_action_verbs', {'count': action_verb_count}))
         
         # Check for weak words
-        weak_word_count = sum(1 for word in self.weak_words if word in text_lower)
+        weak_word_count = context.keywords.found('weak_words')
         if weak_word_count > 0:
-            issues.append(Issue(
-                severity='suggestion',
-                category='content',
-                message='Weak or uncertain language detected',
-                suggestion='Replace weak words like "assisted", "helped", "tried" with stronger action verbs'
-            ))
+            issues.append(Issue('weak_language'))
         
         # Check for quantified achievements
-        has_numbers = bool(re.search(r'\d+%|\d+\s*(years?|months?)|[$]\d+|\d+\+', text))
+        has_numbers = bool(QUANTIFIED_PATTERN.search(context.text))
         if not has_numbers:
-            issues.append(Issue(
-                severity='warning',
-                category='content',
-                message='Limited quantified achievements',
-                suggestion='Add specific numbers, percentages, or metrics to demonstrate impact (e.g., "increased sales by 25%", "managed team of 5")'
-            ))
+            issues.append(Issue('not_quantified'))
         
         # Check resume length
-        word_count = len(text.split())
+        word_count = context.word_count
         if word_count < 200:
-            issues.append(Issue(
-                severity='warning',
-                category='content',
-                message='Resume may be too brief',
-                suggestion=f'Consider expanding your resume (currently ~{word_count} words). Aim for 300-500 words for most positions'
-            ))
+            issues.append(Issue('too_brief', {'word_count': word_count}))
         elif word_count > 800:
-            issues.append(Issue(
-                severity='suggestion',
-                category='content',
-                message='Resume may be too long',
-                suggestion=f'Consider condensing your resume (currently ~{word_count} words). Most resumes should be 1-2 pages'
-            ))
+            issues.append(Issue('too_long', {'word_count': word_count}))
         
         return issues
     
-    def _check_keywords(self, text: str) -> List[Issue]:
+    def _check_keywords(self, context: AnalysisContext) -> List[Issue]:
         """Check for keyword optimization"""
         issues = []
-        text_lower = text.lower()
         
         # Check for skills section
-        if not re.search(r'\b(skills?|technical\s+skills?|competencies?)\b', text_lower):
-            issues.append(Issue(
-                severity='warning',
-                category='keywords',
-                message='Skills section not clearly identified',
-                suggestion='Add a dedicated "Skills" section listing relevant technical and soft skills'
-            ))
+        if not context.index.has('skills'):
+            issues.append(Issue('missing_skills'))
         
         # Check for summary/objective
-        has_summary = bool(re.search(r'\b(summary|profile|objective|about)\b', text_lower))
-        if not has_summary:
-            issues.append(Issue(
-                severity='suggestion',
-                category='structure',
-                message='No summary or objective section found',
-                suggestion='Consider adding a brief professional summary at the top of your resume'
-            ))
+        if not context.index.has('summary'):
+            issues.append(Issue('missing_summary'))
         
         return issues
     
-    def _check_structure(self, text: str) -> List[Issue]:
+    def _check_structure(self, context: AnalysisContext) -> List[Issue]:
         """Check structural issues"""
         issues = []
         
-        # Check for proper section headers (all caps or title case)
-        lines = text.split('\n')
-        potential_headers = [line.strip() for line in lines if len(line.strip()) > 0 and len(line.strip()) < 50]
-        
-        # Check if resume has clear structure
-        if len(potential_headers) < 3:
-            issues.append(Issue(
-                severity='warning',
-                category='structure',
-                message='Resume structure may be unclear',
-                suggestion='Ensure your resume has clear section headers (e.g., EXPERIENCE, EDUCATION, SKILLS)'
-            ))
+        # Check if resume has clear structure (at least three section headings)
+        if len(context.index.header_lines) < 3:
+            issues.append(Issue('unclear_structure'))
         
         return issues
     
-    def _check_common_mistakes(self, text: str) -> List[Issue]:
+    def _check_common_mistakes(self, context: AnalysisContext) -> List[Issue]:
         """Check for common resume mistakes"""
         issues = []
-        text_lower = text.lower()
-        
-        # Check for typos/common errors
-        if 'resume' in text_lower and 'résumé' not in text_lower:
-            # This is fine, just checking
-            pass
+        text_lower = context.text_lower
         
         # Check for personal pronouns
-        if re.search(r'\b(i|me|my|we|our)\b', text_lower):
-            issues.append(Issue(
-                severity='suggestion',
-                category='content',
-                message='Personal pronouns detected',
-                suggestion='Avoid using "I", "me", "my" in resumes. Use action verbs instead (e.g., "Managed team" instead of "I managed a team")'
-            ))
+        if context.keywords.found('pronouns'):
+            issues.append(Issue('personal_pronouns'))
         
         # Check for references
         if 'references' in text_lower or 'references available' in text_lower:
-            issues.append(Issue(
-                severity='suggestion',
-                category='content',
-                message='References section found',
-                suggestion='Remove "References available upon request" - it\'s assumed and takes up valuable space'
-            ))
+            issues.append(Issue('references_section'))
         
         return issues
@@ -1,15 +1,53 @@
 """
 Resume Parser - Extracts text from various resume formats
 """
+import io
 import os
-from typing import Optional
+from typing import TYPE_CHECKING, BinaryIO, Iterator, Optional, Union
+
+if TYPE_CHECKING:
+    from parse_cache import ParseCache
+
+# Bump whenever extraction changes so cached text from older parsers is re-extracted
+PARSER_VERSION = '2'
+
+# First bytes of a zip package (.docx) and of an OLE2 compound file (legacy .doc)
+ZIP_MAGIC = b'PK\x03\x04'
+OLE2_MAGIC = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'
+
+# PDFs with more pages than this are split across a process pool; below it the
+# pool's start-up and transfer cost outweighs the gain
+PARALLEL_PAGE_THRESHOLD = 8
 
 
 class ResumeParser:
     """Handles parsing of resumes from different file formats"""
     
-    def __init__(self):
+    def __init__(self, cache: Optional['ParseCache'] = None,
+                 max_pages: Optional[int] = None, max_chars: Optional[int] = None,
+                 pdf_backend: Optional[str] = 'auto',
+                 parallel_pages: Optional[int] = PARALLEL_PAGE_THRESHOLD,
+                 pdf_workers: Optional[int] = None):
+        """
+        Args:
+            cache: Optional store of previously extracted text
+            max_pages: Stop PDF extraction after this many pages (None = no limit)
+            max_chars: Stop extraction once this many characters are collected (None = no limit)
+            pdf_backend: PDF text extractor (see pdf_backends.PDF_BACKENDS); 'auto'
+                         picks the fastest one installed, falling back to PyPDF2
+            parallel_pages: Extract PDFs with more pages than this on a process pool
+                            (None = always one page at a time in this process)
+            pdf_workers: Processes for parallel page extraction (None = CPU count)
+        """
         self.supported_formats = ['.pdf', '.docx', '.doc', '.txt']
+        self.cache = cache
+        self.max_pages = max_pages
+        self.max_chars = max_chars
+        # The format readers are imported on first use, so starting up for text-only work stays cheap
+        from pdf_backends import resolve_backend
+        self.pdf_backend = resolve_backend(pdf_backend)
+        self.parallel_pages = parallel_pages
+        self.pdf_workers = pdf_workers or os.cpu_count() or 1
     
     def parse(self, file_path: str) -> Optional[str]:
         """
@@ -24,50 +62,166 @@ class ResumeParser:
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"Resume file not found: {file_path}")
         
-        file_ext = os.path.splitext(file_path)[1].lower()
+        file_ext = self._normalize_ext(os.path.splitext(file_path)[1])
         
+        with open(file_path, 'rb') as file:
+            return self.parse_stream(file, file_ext)
+    
+    def parse_bytes(self, data: Union[bytes, bytearray, memoryview], file_ext: str) -> Optional[str]:
+        """
+        Extract text from resume content already held in memory
+        
+        Args:
+            data: Raw file content
+            file_ext: File extension such as '.pdf' or 'pdf'
+            
+        Returns:
+            Extracted text content or None if parsing fails
+        """
+        return self.parse_stream(io.BytesIO(data), file_ext)
+    
+    def parse_stream(self, fileobj: BinaryIO, file_ext: str) -> Optional[str]:
+        """
+        Extract text from a binary file object (e.g. an upload's stream) without touching disk
+        
+        Args:
+            fileobj: Readable binary stream positioned at the start of the file
+            file_ext: File extension such as '.pdf' or 'pdf'
+            
+        Returns:
+            Extracted text content or None if parsing fails
+        """
+        file_ext = self._normalize_ext(file_ext)
+        
+        # PDF and DOCX readers seek around the file, so make sure they can
+        if self.cache is not None or not fileobj.seekable():
+            data = fileobj.read()
+            fileobj = io.BytesIO(data)
+        
+        if self.cache is None:
+            return self._extract(fileobj, file_ext)
+        
+        # Extracted text is reused for identical files parsed by the same parser version
+        digest = self.cache.digest(data)
+        parser_version = f'{PARSER_VERSION}:{file_ext}'
+        if file_ext == '.pdf' and self.pdf_backend != 'pypdf2':
+            # Backends extract slightly different text, so cache each one's separately
+            parser_version += f':{self.pdf_backend}'
+        if self.max_pages is not None or self.max_chars is not None:
+            # Text extracted under a budget may be truncated, so keep it apart
+            parser_version += f':p{self.max_pages}:c{self.max_chars}'
+        text = self.cache.get(digest, parser_version)
+        if text is None:
+            text = self._extract(fileobj, file_ext)
+            if text is not None:
+                self.cache.set(digest, parser_version, text)
+        return text
+    
+    def _normalize_ext(self, file_ext: str) -> str:
+        """Lowercase, dot-prefixed extension; raises ValueError if unsupported"""
+        file_ext = file_ext.lower()
+        if not file_ext.startswith('.'):
+            file_ext = '.' + file_ext
+        if file_ext not in self.supported_formats:
+            raise ValueError(f"Unsupported file format: {file_ext}. Supported formats: {self.supported_formats}")
+        return file_ext
+    
+    def iter_text(self, fileobj: BinaryIO, file_ext: str) -> Iterator[str]:
+        """
+        Yield extracted text incrementally: page by page for PDF, paragraph by paragraph for DOCX
+        
+        Extraction stops as soon as max_pages or max_chars is reached, so memory
+        use and latency stay bounded however large the upload is. Joining the
+        chunks with newlines gives the same text parse() returns. These budgets
+        are the only early stop: the analyzer's rules count over the whole text
+        (word count, weak words, keywords), so it cannot end extraction sooner
+        without changing scores.
+        
+        Args:
+            fileobj: Readable, seekable binary stream
+            file_ext: File extension such as '.pdf' or 'pdf'
+        """
+        file_ext = self._normalize_ext(file_ext)
         if file_ext == '.pdf':
-            return self._parse_pdf(file_path)
-        elif file_ext in ['.docx', '.doc']:
-            return self._parse_docx(file_path)
-        elif file_ext == '.txt':
-            return self._parse_txt(file_path)
+            chunks = self._iter_pdf(fileobj)
+        elif file_ext == '.docx':
+            chunks = self._iter_docx(fileobj)
+        elif file_ext == '.doc':
+            chunks = self._iter_doc(fileobj)
         else:
-            raise ValueError(f"Unsupported file format: {file_ext}. Supported formats: {self.supported_formats}")
+            chunks = self._iter_txt(fileobj)
+        
+        if self.max_chars is None:
+            yield from chunks
+            return
+        
+        remaining = self.max_chars
+        for chunk in chunks:
+            if len(chunk) >= remaining:
+                yield chunk[:remaining]
+                break
+            yield chunk
+            remaining -= len(chunk) + 1  # newline separator
+            if remaining <= 0:
+                break
+    
+    def _extract(self, fileobj: BinaryIO, file_ext: str) -> Optional[str]:
+        """Join the incremental extractor's chunks into the full text"""
+        return '\n'.join(self.iter_text(fileobj, file_ext))
     
-    def _parse_pdf(self, file_path: str) -> str:
-        """Extract text from PDF file"""
+    def _iter_pdf(self, fileobj: BinaryIO) -> Iterator[str]:
+        """Extract text from PDF file, one page at a time, or on a process pool for long documents"""
+        from pdf_backends import iter_pdf_pages_parallel, missing_message, open_pdf
         try:
-            import PyPDF2
-            text_content = []
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                for page in pdf_reader.pages:
-                    text_content.append(page.extract_text())
-            return '\n'.join(text_content)
+            document = open_pdf(fileobj, self.pdf_backend)
+            try:
+                page_count = len(document)
+                if self.max_pages is not None:
+                    page_count = min(page_count, self.max_pages)
+                parallel = (self.parallel_pages is not None and page_count > self.parallel_pages
+                            and self.pdf_workers > 1)
+                if not parallel:
+                    for index in range(page_count):
+                        yield document.page_text(index)
+                    return
+            finally:
+                document.close()
+            
+            fileobj.seek(0)
+            yield from iter_pdf_pages_parallel(fileobj.read(), self.pdf_backend, page_count, self.pdf_workers)
         except ImportError:
-            raise ImportError("PyPDF2 is required for PDF parsing. Install it with: pip install PyPDF2")
+            raise ImportError(missing_message(self.pdf_backend))
         except Exception as e:
             raise Exception(f"Error parsing PDF: {str(e)}")
     
-    def _parse_docx(self, file_path: str) -> str:
-        """Extract text from DOCX file"""
+    def _iter_docx(self, fileobj: BinaryIO) -> Iterator[str]:
+        """Extract text from DOCX file, one paragraph at a time, including tables, headers and footers"""
+        from docx_reader import iter_docx_paragraphs
         try:
-            from docx import Document
-            doc = Document(file_path)
-            text_content = []
-            for paragraph in doc.paragraphs:
-                text_content.append(paragraph.text)
-            return '\n'.join(text_content)
-        except ImportError:
-            raise ImportError("python-docx is required for DOCX parsing. Install it with: pip install python-docx")
+            yield from iter_docx_paragraphs(fileobj)
         except Exception as e:
             raise Exception(f"Error parsing DOCX: {str(e)}")
     
-    def _parse_txt(self, file_path: str) -> str:
+    def _iter_doc(self, fileobj: BinaryIO) -> Iterator[str]:
+        """Extract text from a .doc file that is really a DOCX package; reject legacy binary Word files"""
+        head = fileobj.read(len(OLE2_MAGIC))
+        fileobj.seek(0)
+        if head.startswith(ZIP_MAGIC):
+            yield from self._iter_docx(fileobj)
+            return
+        if head.startswith(OLE2_MAGIC):
+            raise ValueError("Legacy Word .doc files are not supported. Save the resume as .docx or PDF and try again.")
+        raise ValueError("File is not a Word document. Save the resume as .docx or PDF and try again.")
+    
+    def _iter_txt(self, fileobj: BinaryIO) -> Iterator[str]:
         """Extract text from plain text file"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                return file.read()
+            # Text mode decoding, including universal newlines, as open(..., 'r') would do
+            reader = io.TextIOWrapper(fileobj, encoding='utf-8')
+            try:
+                text = reader.read(-1 if self.max_chars is None else self.max_chars)
+            finally:
+                reader.detach()  # otherwise collecting the wrapper closes the caller's stream
+            yield text
         except Exception as e:
             raise Exception(f"Error parsing TXT file: {str(e)}")
@@ -0,0 +1,113 @@
+"""
+Rule Catalogue - Severity, category and wording of every issue the analyzer can raise
+"""
+from typing import Dict, NamedTuple
+
+
+class RuleSpec(NamedTuple):
+    """Static description of one rule; message and suggestion may be str.format templates"""
+    severity: str  # 'critical', 'warning', 'suggestion'
+    category: str  # 'formatting', 'content', 'keywords', 'structure'
+    message: str
+    suggestion: str
+
+
+# Rule ids are stable and appear in API responses; change wording here, never the id
+RULE_CATALOGUE: Dict[str, RuleSpec] = {
+    'too_short': RuleSpec(
+        'critical', 'content',
+        'Resume appears to be too short or empty',
+        'Ensure your resume contains substantial content (at least 100 words)'),
+    'missing_email': RuleSpec(
+        'critical', 'content',
+        'Email address not found',
+        'Add a professional email address in your contact section'),
+    'missing_phone': RuleSpec(
+        'warning', 'content',
+        'Phone number not found',
+        'Consider adding a phone number for better contact options'),
+    'missing_experience': RuleSpec(
+        'critical', 'structure',
+        'Experience section not clearly identified',
+        'Add a clear "Experience" or "Work History" section'),
+    'missing_education': RuleSpec(
+        'warning', 'structure',
+        'Education section not clearly identified',
+        'Add a clear "Education" section listing your degrees and institutions'),
+    'excess_blank_lines': RuleSpec(
+        'warning', 'formatting',
+        'Excessive blank lines detected',
+        'Remove extra blank lines to improve readability'),
+    'long_lines': RuleSpec(
+        'suggestion', 'formatting',
+        'Many lines are very long',
+        'Consider breaking long lines for better readability'),
+    'no_bullets': RuleSpec(
+        'suggestion', 'formatting',
+        'Consider using bullet points for better readability',
+        'Use bullet points (•, -, or *) to organize your experience and skills'),
+    'few_action_verbs': RuleSpec(
+        'warning', 'content',
+        'Limited use of action verbs',
+        'Use more action verbs to describe your experience and projects (found {count}). Examples: achieved, managed, developed, implemented, created'),
+    'weak_language': RuleSpec(
+        'suggestion', 'content',
+        'Weak or uncertain language detected',
+        'Replace weak words like "assisted", "helped", "tried" with stronger action verbs'),
+    'not_quantified': RuleSpec(
+        'warning', 'content',
+        'Limited quantified achievements',
+        'Add specific numbers, percentages, or metrics to demonstrate impact (e.g., "increased sales by 25%", "managed team of 5")'),
+    'too_brief': RuleSpec(
+        'warning', 'content',
+        'Resume may be too brief',
+        'Consider expanding your resume (currently ~{word_count} words). Aim for 300-500 words for most positions'),
+    'too_long': RuleSpec(
+        'suggestion', 'content',
+        'Resume may be too long',
+        'Consider condensing your resume (currently ~{word_count} words). Most resumes should be 1-2 pages'),
+    'missing_skills': RuleSpec(
+        'warning', 'keywords',
+        'Skills section not clearly identified',
+        'Add a dedicated "Skills" section listing relevant technical and soft skills'),
+    'missing_summary': RuleSpec(
+        'suggestion', 'structure',
+        'No summary or objective section found',
+        'Consider adding a brief professional summary at the top of your resume'),
+    'unclear_structure': RuleSpec(
+        'warning', 'structure',
+        'Resume structure may be unclear',
+        'Ensure your resume has clear section headers (e.g., EXPERIENCE, EDUCATION, SKILLS)'),
+    'personal_pronouns': RuleSpec(
+        'suggestion', 'content',
+        'Personal pronouns detected',
+        'Avoid using "I", "me", "my" in resumes. Use action verbs instead (e.g., "Managed team" instead of "I managed a team")'),
+    'references_section': RuleSpec(
+        'suggestion', 'content',
+        'References section found',
+        'Remove "References available upon request" - it\'s assumed and takes up valuable space'),
+    'job_low_match': RuleSpec(
+        'warning', 'keywords',
+        'Low match with the job description ({coverage}% of its key terms)',
+        'Where they truthfully apply, add the posting\'s key terms: {missing}'),
+    'job_missing_terms': RuleSpec(
+        'suggestion', 'keywords',
+        'Some key terms from the job description are missing ({coverage}% covered)',
+        'Consider covering these terms from the posting: {missing}'),
+    'faculty_fit:sciences': RuleSpec(
+        'suggestion', 'keywords',
+        'Few science-specific terms for a Sciences profile',
+        'Highlight research, publications, lab work, methodology, or data analysis to strengthen your resume for science roles.'),
+    'faculty_fit:engineering': RuleSpec(
+        'suggestion', 'keywords',
+        'Few engineering-specific terms for an Engineering profile',
+        'Highlight technical skills, projects, tools, and concrete outcomes to better match engineering expectations.'),
+    'faculty_fit:arts': RuleSpec(
+        'suggestion', 'keywords',
+        'Few arts/creative terms for an Arts profile',
+        'Include portfolio work, exhibitions, creative projects, or collaborative work to align with arts and design roles.'),
+    'faculty_fit:business': RuleSpec(
+        'suggestion', 'keywords',
+        'Few business-specific terms for a Business profile',
+        'Highlight leadership, strategy, revenue, growth, client work, or metrics (e.g. ROI, KPIs) to strengthen your resume for business roles.'),
+}
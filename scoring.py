@@ -0,0 +1,96 @@
+"""
+Scoring - Single source of truth for the resume score
+"""
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+# Points deducted from 100 for each issue of a severity
+SEVERITY_DEDUCTIONS = {'critical': 10, 'warning': 5, 'suggestion': 2}
+
+
+def faculty_adjustment_for(found: int) -> int:
+    """
+    Score adjustment (-2 to +5) for the number of distinct faculty keywords found.
+    """
+    if found >= 4:
+        return 5
+    if found >= 3:
+        return 3
+    if found >= 2:
+        return 1
+    if found >= 1:
+        return 0
+    return -2
+
+
+@dataclass
+class ScoreCard:
+    """Issues of one analysis together with everything derived from them for scoring"""
+    issues: List = field(default_factory=list)  # List[Issue]
+    severity_counts: Dict[str, int] = field(default_factory=dict)
+    category_counts: Dict[str, int] = field(default_factory=dict)
+    deductions: Dict[str, int] = field(default_factory=dict)  # points lost per severity
+    faculty: Optional[str] = None
+    faculty_adjustment: int = 0
+    base_score: int = 100
+    score: int = 100
+    job_match: Optional[object] = None  # job_matcher.JobMatch when a posting was matched
+
+    @classmethod
+    def from_issues(cls, issues: List, faculty: Optional[str] = None,
+                    faculty_adjustment: int = 0) -> 'ScoreCard':
+        """Tally issues in one pass and compute the final score"""
+        severity_counts = {severity: 0 for severity in SEVERITY_DEDUCTIONS}
+        category_counts: Dict[str, int] = {}
+        for issue in issues:
+            severity_counts[issue.severity] = severity_counts.get(issue.severity, 0) + 1
+            category_counts[issue.category] = category_counts.get(issue.category, 0) + 1
+
+        deductions = {
+            severity: count * SEVERITY_DEDUCTIONS.get(severity, 0)
+            for severity, count in severity_counts.items()
+        }
+        base_score = 100 - sum(deductions.values())
+        # Base minus issues, then faculty adjustment for degree field
+        score = max(0, min(100, base_score + faculty_adjustment))
+        return cls(
+            issues=issues,
+            severity_counts=severity_counts,
+            category_counts=category_counts,
+            deductions=deductions,
+            faculty=faculty,
+            faculty_adjustment=faculty_adjustment,
+            base_score=base_score,
+            score=score,
+        )
+
+    @property
+    def critical(self) -> int:
+        return self.severity_counts.get('critical', 0)
+
+    @property
+    def warnings(self) -> int:
+        return self.severity_counts.get('warning', 0)
+
+    @property
+    def suggestions(self) -> int:
+        return self.severity_counts.get('suggestion', 0)
+
+    def summary(self) -> Dict:
+        """Issue counts in the shape of the /analyze 'summary' block"""
+        return {
+            'total_issues': len(self.issues),
+            'critical': self.critical,
+            'warnings': self.warnings,
+            'suggestions': self.suggestions
+        }
+
+    def breakdown(self) -> Dict:
+        """How the score was reached"""
+        return {
+            'base_score': self.base_score,
+            'deductions': dict(self.deductions),
+            'faculty_adjustment': self.faculty_adjustment,
+            'score': self.score,
+            'category_counts': dict(self.category_counts),
+        }
@@ -0,0 +1,216 @@
+"""
+Section Index - Segments a resume into headed sections once, for every rule to query
+"""
+import re
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Iterable, List, NamedTuple, Optional, Set, Tuple
+
+# Lines longer than this many characters count as long
+LONG_LINE = 100
+# Headings are short: under this many characters and at most HEADING_WORDS words
+HEADING_CHARS = 50
+HEADING_WORDS = 5
+
+# Kinds the rules ask about; a heading naming one of these opens a section of that kind
+CORE_KINDS = ('experience', 'education', 'skills', 'summary')
+
+# Heading titles, as whole words of the lowercased heading. When a heading names
+# several kinds ("Skills & Interests") the first core kind wins, then the leftmost title.
+SECTION_TITLE_PATTERN = re.compile(
+    r'\b(?:'
+    r'(?P<experience>experience|employment|work\s+history|career\s+history)'
+    r'|(?P<education>education|academics|academic\s+(?:background|history)|qualifications)'
+    r'|(?P<skills>skills?|competenc(?:y|ies)|expertise|technologies)'
+    r'|(?P<summary>summary|profile|objective|about(?:\s+me)?)'
+    r'|(?P<projects>projects?)'
+    r'|(?P<certifications>certifications?|licen[cs]es)'
+    r'|(?P<awards>awards|honou?rs|achievements)'
+    r'|(?P<publications>publications|presentations)'
+    r'|(?P<volunteering>volunteer(?:ing)?|community\s+service)'
+    r'|(?P<languages>languages)'
+    r'|(?P<interests>interests|hobbies|activities)'
+    r'|(?P<references>references)'
+    r'|(?P<contact>contact(?:\s+(?:details|information))?)'
+    r')\b'
+)
+
+# A bullet marker (or a "1." / "2)" number) at the start of a line, followed by a space or the line end
+BULLET_PATTERN = re.compile(r'\s*(?:[-*•‣▪●◦■–➢]|\d+[.)])(?:\s|$)')
+_BULLET_STARTS = frozenset('-*•‣▪●◦■–➢0123456789')
+
+# Decoration allowed around a heading, e.g. "== SKILLS ==" or "Experience:"
+_HEADING_DECORATION = ' \t:|#=*_~-–—'
+
+PREAMBLE = 'preamble'  # lines before the first heading
+OTHER = 'other'        # a heading that names no known section
+
+
+class LineInfo(NamedTuple):
+    """What the segmenter needs to know about one line"""
+    words: int
+    long: bool
+    bullet: bool
+    heading: Optional[str]  # section kind the line opens (OTHER if unrecognised); None for body lines
+
+
+class Section(NamedTuple):
+    """A heading and the lines under it, up to the next heading"""
+    kind: str
+    title: str
+    header_line: int  # -1 for the preamble
+    start_line: int   # first line after the heading
+    end_line: int     # line after the last line of the section
+
+
+def section_kind(label_lower: str) -> Optional[str]:
+    """Section kind named by a lowercased heading, or None"""
+    match = SECTION_TITLE_PATTERN.search(label_lower)
+    if match is None or match.lastgroup in CORE_KINDS:
+        return match and match.lastgroup
+    for later in SECTION_TITLE_PATTERN.finditer(label_lower, match.end()):
+        if later.lastgroup in CORE_KINDS:
+            return later.lastgroup
+    return match.lastgroup
+
+
+def classify_heading(line: str) -> Optional[str]:
+    """
+    Section kind a line opens when it is a heading, OTHER for an unrecognised heading, else None.
+
+    A heading is a short line that is not a bullet and is either all capitals,
+    ends with a colon, or names a known section in a capitalised label without
+    digits ("Work History", not "5 years of experience"). "Skills: Python, SQL"
+    opens a skills section with its content inline.
+    """
+    return _classify_heading(line.strip())
+
+
+def _classify_heading(stripped: str) -> Optional[str]:
+    if not stripped:
+        return None
+    label, colon, rest = stripped.partition(':')
+    inline = colon and rest.strip()
+    if not inline and len(stripped) >= HEADING_CHARS:
+        return None
+    label = label.strip(_HEADING_DECORATION)
+    word_count = len(label.split())
+    if not label or word_count > HEADING_WORDS:
+        return None
+    if inline:
+        # Inline "Label: content" only counts for known section titles
+        return section_kind(label.lower()) if word_count < HEADING_WORDS else None
+    if label.isupper() or colon:
+        return section_kind(label.lower()) or OTHER
+    if label[0].isupper() and not any(char.isdigit() for char in label):
+        return section_kind(label.lower())
+    return None
+
+
+_BLANK_LINE = LineInfo(0, False, False, None)
+
+
+def classify_line(line: str) -> LineInfo:
+    """Word count, length, bullet and heading facts for one line"""
+    stripped = line.strip()
+    if not stripped:
+        return _BLANK_LINE if len(line) <= LONG_LINE else LineInfo(0, True, False, None)
+    if stripped[0] in _BULLET_STARTS and BULLET_PATTERN.match(line) is not None:
+        return LineInfo(len(line.split()), len(line) > LONG_LINE, True, None)
+    return LineInfo(len(line.split()), len(line) > LONG_LINE, False, _classify_heading(stripped))
+
+
+class SectionIndex:
+    """
+    Header lines, section spans, bullet lines and line/word offsets of one resume.
+
+    Built once per analysis (from_text) and queried by every rule instead of
+    rescanning the text. An editing session builds it from stored per-line
+    facts instead (from_line_infos); both give the same index.
+    """
+
+    def __init__(self, lines: List[str], headings: List[Tuple[int, str]], bullet_lines: List[int],
+                 long_line_count: int, word_count: int):
+        self.lines = lines
+        self.header_lines = [line for line, _ in headings]
+        self.bullet_lines = bullet_lines
+        self.long_line_count = long_line_count
+        self.word_count = word_count
+
+        self.sections: List[Section] = []
+        if not self.header_lines or self.header_lines[0] > 0:
+            first_header = self.header_lines[0] if self.header_lines else len(lines)
+            self.sections.append(Section(PREAMBLE, '', -1, 0, first_header))
+        for position, (header, kind) in enumerate(headings):
+            end = self.header_lines[position + 1] if position + 1 < len(headings) else len(lines)
+            self.sections.append(Section(kind, lines[header].strip(), header, header + 1, end))
+        self.kinds: Set[str] = {section.kind for section in self.sections}
+
+        self._line_offsets: Optional[List[int]] = None
+        self._word_offsets: Optional[List[int]] = None
+
+    @classmethod
+    def from_text(cls, text: str, lines: Optional[List[str]] = None) -> 'SectionIndex':
+        """
+        Index a whole text. Cheap tests pick out bullets and heading candidates
+        (short lines, or lines holding a colon); only candidates are classified.
+        """
+        if lines is None:
+            lines = text.split('\n')
+        match_bullet = BULLET_PATTERN.match
+        bullet_lines = [index for index, line in enumerate(lines) if match_bullet(line)]
+        bullets = set(bullet_lines)
+        headings = []
+        for index, line in enumerate(lines):
+            stripped = line.strip()
+            if (':' in stripped or 0 < len(stripped) < HEADING_CHARS) and index not in bullets:
+                kind = _classify_heading(stripped)
+                if kind is not None:
+                    headings.append((index, kind))
+        long_line_count = sum(map(LONG_LINE.__lt__, map(len, lines)))
+        return cls(lines, headings, bullet_lines, long_line_count, len(text.split()))
+
+    @classmethod
+    def from_line_infos(cls, lines: List[str], infos: List[LineInfo]) -> 'SectionIndex':
+        """Index from per-line facts (see classify_line)"""
+        headings = [(index, info.heading) for index, info in enumerate(infos) if info.heading is not None]
+        bullet_lines = [index for index, info in enumerate(infos) if info.bullet]
+        return cls(lines, headings, bullet_lines,
+                   sum(info.long for info in infos), sum(info.words for info in infos))
+
+    @property
+    def line_offsets(self) -> List[int]:
+        """Character offset at which each line starts, plus the text length + 1 at the end"""
+        if self._line_offsets is None:
+            self._line_offsets = [0] + list(accumulate(len(line) + 1 for line in self.lines))
+        return self._line_offsets
+
+    @property
+    def word_offsets(self) -> List[int]:
+        """Number of words before each line, plus the total at the end"""
+        if self._word_offsets is None:
+            self._word_offsets = [0] + list(accumulate(len(line.split()) for line in self.lines))
+        return self._word_offsets
+
+    def has(self, kind: str) -> bool:
+        return kind in self.kinds
+
+    def sections_of(self, kinds: Iterable[str]) -> List[Section]:
+        """Sections of any of the given kinds, in document order"""
+        kinds = {kinds} if isinstance(kinds, str) else set(kinds)
+        return [section for section in self.sections if section.kind in kinds]
+
+    def line_at(self, offset: int) -> int:
+        """Index of the line containing a character offset"""
+        return bisect_right(self.line_offsets, offset) - 1
+
+    def section_at(self, line: int) -> Section:
+        """Section a line belongs to (a heading belongs to the section it opens)"""
+        starts = [section.header_line if section.header_line >= 0 else 0 for section in self.sections]
+        return self.sections[bisect_right(starts, line) - 1]
+
+    def span(self, section: Section) -> Tuple[int, int]:
+        """Character offsets of a section, heading included"""
+        first = max(section.header_line, 0)
+        offsets = self.line_offsets
+        return offsets[first], offsets[section.end_line] - 1
@@ -70,7 +70,7 @@ export default function App() {
     formData.append('file', selectedFile);
     if (selectedDegree) formData.append('faculty', selectedDegree);
     try {
-      const res = await fetch(`${API_BASE}/analyze`, { method: 'POST', body: formData });
+      const res = await fetch(`${API_BASE}/analyze?fields=statistics,summary,issues`, { method: 'POST', body: formData });
       const data = await res.json();
       if (!res.ok) {
         setAnalysisError(data.error || 'Analysis failed');